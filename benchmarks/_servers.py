@@ -0,0 +1,154 @@
+'''
+Local stand-in servers for benchmarks.
+'''
+
+import asyncio
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+from pathlib import Path
+
+import h11
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:
+    h2 = None
+
+
+def self_signed_certificate(directory: Path) -> tuple[Path, Path]:
+    cert, key = directory / 'cert.pem', directory / 'key.pem'
+    subprocess.run(
+        [
+            'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+            '-subj', '/CN=localhost', '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1',
+            '-keyout', str(key), '-out', str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )  # fmt: skip
+    return cert, key
+
+
+class StandInServer:
+    '''
+    Asyncio server answering every request with ``body`` after ``latency`` seconds.
+
+    Speaks HTTP/1.1 and, when TLS is enabled and h2 is installed, HTTP/2 negotiated through ALPN.
+    Counts accepted connections and served requests per protocol.
+    '''
+
+    def __init__(self, body: dict, latency: float = 0.0, tls: bool = False, http2: bool = True):
+        self.body = json.dumps(body).encode()
+        self.latency = latency
+        self.tls = tls
+        self.http2 = http2 and h2 is not None
+        self.connections = 0
+        self.requests = {'HTTP/1.1': 0, 'HTTP/2': 0}
+        self._server = None
+        self._tmpdir = None
+
+    @property
+    def url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f'{"https" if self.tls else "http"}://127.0.0.1:{port}'
+
+    async def __aenter__(self):
+        ssl_context = None
+        if self.tls:
+            self._tmpdir = tempfile.TemporaryDirectory()
+            cert, key = self_signed_certificate(Path(self._tmpdir.name))
+            ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            ssl_context.load_cert_chain(cert, key)
+            ssl_context.set_alpn_protocols(['h2', 'http/1.1'] if self.http2 else ['http/1.1'])
+            # let clients of this process trust the certificate
+            os.environ['SSL_CERT_FILE'] = str(cert)
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0, ssl=ssl_context)
+        return self
+
+    async def __aexit__(self, *args):
+        self._server.close()
+        await self._server.wait_closed()
+        if self._tmpdir is not None:
+            os.environ.pop('SSL_CERT_FILE', None)
+            self._tmpdir.cleanup()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        ssl_object = writer.get_extra_info('ssl_object')
+        try:
+            if ssl_object is not None and ssl_object.selected_alpn_protocol() == 'h2':
+                await self._handle_h2(reader, writer)
+            else:
+                await self._handle_h11(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_h11(self, reader, writer):
+        connection = h11.Connection(h11.SERVER)
+        while True:
+            event = connection.next_event()
+            if event is h11.NEED_DATA:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                connection.receive_data(data)
+            elif isinstance(event, h11.EndOfMessage):
+                await asyncio.sleep(self.latency)
+                headers = [('content-type', 'application/json'), ('content-length', str(len(self.body)))]
+                writer.write(connection.send(h11.Response(status_code=200, headers=headers)))
+                writer.write(connection.send(h11.Data(data=self.body)))
+                writer.write(connection.send(h11.EndOfMessage()))
+                await writer.drain()
+                self.requests['HTTP/1.1'] += 1
+                connection.start_next_cycle()
+            elif isinstance(event, h11.ConnectionClosed):
+                return
+
+    async def _handle_h2(self, reader, writer):
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        writer.write(connection.data_to_send())
+        lock = asyncio.Lock()
+
+        async def respond(stream_id):
+            await asyncio.sleep(self.latency)
+            async with lock:
+                headers = [(':status', '200'), ('content-type', 'application/json')]
+                connection.send_headers(stream_id, headers + [('content-length', str(len(self.body)))])
+                offset = 0
+                while offset < len(self.body):
+                    # respect flow control window of the client
+                    window = min(connection.local_flow_control_window(stream_id), connection.max_outbound_frame_size)
+                    if window <= 0:
+                        writer.write(connection.data_to_send())
+                        await writer.drain()
+                        await asyncio.sleep(0.001)
+                        continue
+                    connection.send_data(stream_id, self.body[offset : offset + window])
+                    offset += window
+                connection.end_stream(stream_id)
+                writer.write(connection.data_to_send())
+                await writer.drain()
+            self.requests['HTTP/2'] += 1
+
+        tasks = set()
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.DataReceived):
+                    connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    task = asyncio.create_task(respond(event.stream_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            writer.write(connection.data_to_send())
+            await writer.drain()
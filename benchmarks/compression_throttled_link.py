@@ -0,0 +1,99 @@
+'''
+Upload time against compression CPU cost on a throttled link.
+
+A local HTTP/1.1 server reads request bodies at 10 Mbit/s, roughly the uplink of an edge device on LTE, and answers
+with an identification. Identifications of five 1500 px photos (~2 MB of base64 JSON) are sent uncompressed and with
+the available ``RequestCompression`` encodings.
+
+    python -m benchmarks.compression_throttled_link
+'''
+
+import gzip
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+from kindwise import PlantApi, RequestCompression
+from kindwise.compression import zstandard
+from kindwise.image_encoding import encode_image
+from kindwise.mock_transport import identification_response
+from kindwise.tests.conftest import IMAGE_DIR
+
+LINK_BYTES_PER_SECOND = 10_000_000 // 8
+CHUNK = 16 * 1024
+IDENTIFICATIONS = 3
+PHOTOS = ['aloe-vera.jpg', 'amanita_muscaria.jpg', 'potato.late_blight.jpg', 'wheat.jpg', 'bee.jpeg']
+
+
+class ThrottledHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    received = 0
+
+    def do_POST(self):
+        remaining = int(self.headers['Content-Length'])
+        ThrottledHandler.received += remaining
+        while remaining:
+            started = time.perf_counter()
+            remaining -= len(self.rfile.read(min(CHUNK, remaining)))
+            time.sleep(max(0.0, CHUNK / LINK_BYTES_PER_SECOND - (time.perf_counter() - started)))
+        body = json.dumps(identification_response()).encode()
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def photos() -> list[bytes]:
+    result = []
+    for name in PHOTOS:
+        buffer = io.BytesIO()
+        Image.open(IMAGE_DIR / name).convert('RGB').resize((1500, 1125)).save(buffer, format='JPEG', quality=90)
+        result.append(buffer.getvalue())
+    return result
+
+
+def run(label: str, host: str, images: list[bytes], compression: RequestCompression | None):
+    ThrottledHandler.received = 0
+    with PlantApi(api_key='benchmark', compression=compression) as api:
+        api.host = host
+        started = time.perf_counter()
+        for _ in range(IDENTIFICATIONS):
+            api.identify(images, max_image_size=None)
+        elapsed = (time.perf_counter() - started) / IDENTIFICATIONS
+    sent = ThrottledHandler.received / IDENTIFICATIONS
+    ratio = '' if compression is None else f', ratio {compression.ratio:.3f}'
+    print(f'{label:>10}: {elapsed * 1000:6.0f} ms per identification, {sent / 1e6:.2f} MB sent{ratio}')
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottledHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f'http://127.0.0.1:{server.server_address[1]}'
+    images = photos()
+
+    body = json.dumps({'images': [encode_image(image, None) for image in images]}).encode()
+    print(f'{len(body) / 1e6:.2f} MB body, {LINK_BYTES_PER_SECOND * 8 / 1e6:.0f} Mbit/s link')
+    for level in (1, 6):
+        started = time.process_time()
+        gzip.compress(body, compresslevel=level, mtime=0)
+        print(f'gzip level {level} CPU: {(time.process_time() - started) * 1000:.0f} ms')
+
+    run('identity', host, images, None)
+    run('gzip 1', host, images, RequestCompression('gzip', level=1))
+    run('gzip 6', host, images, RequestCompression('gzip', level=6))
+    if zstandard is not None:
+        run('zstd 3', host, images, RequestCompression('zstd', level=3))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+'''
+Event loop latency while the async api encodes a bulk of photos.
+
+A ticker coroutine sleeps 5 ms in a loop and records how late it wakes up while 40 4000x3000 px photos are encoded
+(concurrency 8). Encoding inline, the behaviour before encoding was moved off the loop, is simulated by calling the
+encoder directly in the coroutine.
+
+    python -m benchmarks.event_loop_latency
+'''
+
+import asyncio
+import io
+import statistics
+import time
+
+from PIL import Image
+
+from kindwise import AsyncPlantApi, EncodingExecutor
+from kindwise.image_encoding import encode_image
+
+PHOTOS = 40
+CONCURRENCY = 8
+TICK = 0.005
+
+
+def photo() -> bytes:
+    buffer = io.BytesIO()
+    Image.effect_noise((4000, 3000), 64).convert('RGB').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+async def run(label: str, encode):
+    lags = []
+    running = True
+
+    async def ticker():
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - started - TICK)
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def job():
+        async with semaphore:
+            await encode()
+
+    ticker_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(job() for _ in range(PHOTOS)))
+    elapsed = time.perf_counter() - started
+    running = False
+    await ticker_task
+    lags.sort()
+    print(
+        f'{label:>14}: {PHOTOS / elapsed:5.1f} photos/s, loop lag median {statistics.median(lags) * 1000:6.1f} ms, '
+        f'p99 {lags[int(len(lags) * 0.99)] * 1000:6.1f} ms, max {lags[-1] * 1000:6.1f} ms'
+    )
+
+
+async def main():
+    image = photo()
+
+    async def inline():
+        encode_image(image, 1500)
+
+    await run('inline', inline)
+    for label, executor in [
+        ('anyio threads', None),
+        ('thread pool', EncodingExecutor('thread')),
+        ('process pool', EncodingExecutor('process')),
+    ]:
+        api = AsyncPlantApi(api_key='benchmark', encoding_executor=executor)
+        await run(label, lambda: api._encode_image(image, 1500))
+        if executor is not None:
+            executor.shutdown()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
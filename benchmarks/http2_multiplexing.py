@@ -0,0 +1,42 @@
+'''
+Compares throughput of concurrent identifications over HTTP/1.1 and HTTP/2.
+
+An h2-capable TLS stand-in server with 50 ms latency answers 500 concurrent identifications with ~200 kB base64
+bodies, the api is run once with ``http2=False`` and once with ``http2=True``.
+
+    python -m benchmarks.http2_multiplexing
+'''
+
+import asyncio
+import os
+import time
+
+from kindwise import AsyncPlantApi
+from kindwise.mock_transport import identification_response
+from benchmarks._servers import StandInServer
+
+CONCURRENCY = 500
+IMAGE = os.urandom(150_000)
+
+
+async def run(http2: bool):
+    async with StandInServer(identification_response(), latency=0.05, tls=True) as server:
+        async with AsyncPlantApi(api_key='benchmark', http2=http2) as api:
+            api.host = server.url
+            start = time.perf_counter()
+            await asyncio.gather(*(api.identify(IMAGE, max_image_size=None) for _ in range(CONCURRENCY)))
+            elapsed = time.perf_counter() - start
+        protocol = 'HTTP/2' if server.requests['HTTP/2'] else 'HTTP/1.1'
+        print(
+            f'{"http2=" + str(http2):>11}: {CONCURRENCY / elapsed:6.0f} identifications/s, '
+            f'{server.connections} connections, served over {protocol}'
+        )
+
+
+def main():
+    asyncio.run(run(http2=False))
+    asyncio.run(run(http2=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+'''
+Downscaling of phone camera JPEGs to the default 1500 px with full decode and with draft (DCT domain) decode.
+
+"full" decodes every pixel and resizes with bicubic, the behaviour before draft decoding. "draft" is the current
+``encode_image``. Decoded size is the bitmap Pillow holds before the resize, PSNR compares the resized image with a
+full decode resized with Lanczos.
+
+    python -m benchmarks.jpeg_draft_downscale
+'''
+
+import io
+import math
+import time
+
+from PIL import Image, ImageChops, ImageFilter, ImageStat
+
+from kindwise.image_encoding import encode_image
+from kindwise.tests.conftest import IMAGE_DIR
+
+RESOLUTIONS = {
+    '8 MP': (3264, 2448),
+    '12 MP': (4032, 3024),
+    '24 MP': (6000, 4000),
+    '48 MP': (8000, 6000),
+}
+MAX_IMAGE_SIZE = 1500
+REPEAT = 3
+
+
+def phone_photo(size: tuple[int, int]) -> bytes:
+    img = Image.open(IMAGE_DIR / 'potato.late_blight.jpg').convert('RGB').resize(size, Image.Resampling.BICUBIC)
+    # sensor-like fine detail, upscaling alone leaves nothing for the downscale to lose
+    noise = Image.effect_noise(size, 24).convert('RGB').filter(ImageFilter.GaussianBlur(0.6))
+    buffer = io.BytesIO()
+    ImageChops.overlay(img, noise).save(buffer, format='JPEG', quality=92)
+    return buffer.getvalue()
+
+
+def target(size: tuple[int, int]) -> tuple[int, int]:
+    aspect_ratio = size[0] / size[1]
+    width = MAX_IMAGE_SIZE if aspect_ratio >= 1 else int(MAX_IMAGE_SIZE * aspect_ratio)
+    return width, int(width / aspect_ratio)
+
+
+def full_decode(data: bytes) -> tuple[Image.Image, int]:
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    return img.resize(target(img.size)), img.width * img.height
+
+
+def draft_decode(data: bytes) -> tuple[Image.Image, int]:
+    img = Image.open(io.BytesIO(data))
+    size = target(img.size)
+    img.draft(img.mode, size)
+    img.load()
+    return img.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0), img.width * img.height
+
+
+def psnr(img: Image.Image, reference: Image.Image) -> float:
+    mse = sum(value**2 for value in ImageStat.Stat(ImageChops.difference(img, reference)).rms) / 3
+    return 10 * math.log10(255**2 / mse) if mse else math.inf
+
+
+def timed(call, *args) -> tuple[float, object]:
+    best, result = math.inf, None
+    for _ in range(REPEAT):
+        started = time.process_time()
+        result = call(*args)
+        best = min(best, time.process_time() - started)
+    return best, result
+
+
+def main():
+    print(f'{"":>6}  {"full decode":>24}  {"draft decode":>24}  {"encode_image":>12}')
+    for label, size in RESOLUTIONS.items():
+        data = phone_photo(size)
+        reference = Image.open(io.BytesIO(data)).resize(target(size), Image.Resampling.LANCZOS)
+        full_time, (full, full_pixels) = timed(full_decode, data)
+        draft_time, (draft, draft_pixels) = timed(draft_decode, data)
+        encode_time, _ = timed(encode_image, data, MAX_IMAGE_SIZE)
+        print(
+            f'{label:>6}  {full_time * 1000:5.0f} ms {full_pixels * 4 / 1e6:5.0f} MB {psnr(full, reference):4.1f} dB  '
+            f'{draft_time * 1000:5.0f} ms {draft_pixels * 4 / 1e6:5.0f} MB {psnr(draft, reference):4.1f} dB  '
+            f'{encode_time * 1000:9.0f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
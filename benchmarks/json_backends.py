@@ -0,0 +1,93 @@
+'''
+Serialization of identification payloads and parsing of identification responses with each JSON backend.
+
+"document" serializes the whole payload in one call like httpx json= does, "streamed" is the request body the api
+sends. Responses have 10 suggestions with similar images and plant details. Backends which are not installed are
+skipped.
+
+    python -m benchmarks.json_backends
+'''
+
+import base64
+import math
+import os
+import time
+
+from kindwise.json_backend import BACKENDS, JSONBackend
+from kindwise.mock_transport import identification_response
+from kindwise.request_body import JSONBody
+
+REPEAT = 20
+
+
+def payload() -> dict:
+    images = [base64.b64encode(os.urandom(1_100_000)).decode('ascii') for _ in range(3)]
+    return {
+        'images': images,
+        'similar_images': True,
+        'latitude': 49.207,
+        'longitude': 16.608,
+        'datetime': '2024-01-01T00:00:00+00:00',
+        'classification_level': 'all',
+        'health': 'all',
+    }
+
+
+def response() -> dict:
+    data = identification_response(similar_images=4)
+    for suggestion in data['result']['classification']['suggestions']:
+        suggestion['details'] |= {
+            'common_names': ['Aloe vera', 'Barbados aloe', 'Chinese aloe', 'Indian aloe', 'burn aloe', 'first aid'],
+            'taxonomy': {
+                'class': 'Liliopsida',
+                'genus': 'Aloe',
+                'order': 'Asparagales',
+                'family': 'Asphodelaceae',
+                'phylum': 'Tracheophyta',
+                'kingdom': 'Plantae',
+            },
+            'url': 'https://en.wikipedia.org/wiki/Aloe_vera',
+            'description': {
+                'value': 'Aloe vera is a succulent plant species of the genus Aloe. ' * 20,
+                'citation': 'https://en.wikipedia.org/wiki/Aloe_vera',
+                'license_name': 'CC BY-SA 3.0',
+                'license_url': 'https://creativecommons.org/licenses/by-sa/3.0/',
+            },
+            'synonyms': [f'Aloe synonym {i}' for i in range(25)],
+            'edible_parts': ['leaves'],
+            'watering': {'max': 2, 'min': 1},
+            'propagation_methods': ['division', 'cuttings', 'seeds'],
+            'gbif_id': 2777724,
+            'inaturalist_id': 78829,
+            'rank': 'species',
+        }
+    return data
+
+
+def timed(call, *args) -> float:
+    best = math.inf
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        call(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    request, identification = payload(), response()
+    body = JSONBackend().dumps(identification)
+    print(f'payload {len(JSONBackend().dumps(request)) / 1e6:.1f} MB, response {len(body) / 1e3:.0f} kB')
+    print(f'{"":>8}  {"document":>10}  {"streamed":>10}  {"response":>10}')
+    for name in BACKENDS:
+        if not JSONBackend.available(name):
+            print(f'{name:>8}  not installed')
+            continue
+        backend = JSONBackend(name)
+        document = timed(backend.dumps, request)
+        streamed = timed(lambda: b''.join(JSONBody(request, json_backend=backend)))
+        parsed = timed(backend.loads, body)
+        print(f'{name:>8}  {document:7.2f} ms  {streamed:7.2f} ms  {parsed:7.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
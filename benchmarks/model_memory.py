@@ -0,0 +1,74 @@
+'''
+Memory held by 100k parsed plant identifications: response dicts, models, models parsed in lean mode and models
+parsed with a shared string table.
+
+Each identification is parsed from its own JSON document like responses of separate API calls, so no strings are
+shared between them. Responses have 3 suggestions with 2 similar images each and details.
+
+    python -m benchmarks.model_memory [count]
+'''
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from kindwise.interning import StringTable
+from kindwise.mock_transport import identification_response
+from kindwise.models import strip_heavy_fields
+from kindwise.plant import PlantIdentification
+
+COUNT = 100_000
+STRINGS = StringTable()
+
+
+def response(i: int) -> bytes:
+    data = identification_response(f'token-{i}', images=2, suggestions=3, similar_images=2)
+    del data['result']['crop']
+    for suggestion in data['result']['classification']['suggestions']:
+        suggestion['details'] |= {'common_names': ['Aloe vera', 'Barbados aloe'], 'url': f'https://kindwise.com/{i}'}
+    return json.dumps(data).encode()
+
+
+def parse_dict(body: bytes):
+    return json.loads(body)
+
+
+def parse_model(body: bytes):
+    return PlantIdentification.from_dict(json.loads(body))
+
+
+def parse_lean(body: bytes):
+    return PlantIdentification.from_dict(strip_heavy_fields(json.loads(body)))
+
+
+def parse_interned(body: bytes):
+    return PlantIdentification.from_dict(STRINGS.intern_tree(json.loads(body)))
+
+
+def measure(parse, bodies: list[bytes]) -> tuple[float, float]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept = [parse(body) for body in bodies]
+    duration = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / 1e6, duration
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    bodies = [response(i) for i in range(count)]
+    print(f'{count} identifications, {sum(map(len, bodies)) / count:.0f} bytes of JSON each')
+    cases = (('dicts', parse_dict), ('models', parse_model), ('lean models', parse_lean), ('interned', parse_interned))
+    for label, parse in cases:
+        size, duration = measure(parse, bodies)
+        print(f'{label:>12}  {size:7.1f} MB  {size * 1e6 / count:6.0f} B each  parsed in {duration:5.1f} s')
+
+
+if __name__ == '__main__':
+    main()
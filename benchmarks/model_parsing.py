@@ -0,0 +1,121 @@
+'''
+Parse time of a plant identification with 10 suggestions and similar images.
+
+"handwritten" builds the models with the hand-written constructors they had before ``from_dict`` was compiled from
+the field annotations, "compiled" is the current ``from_dict``. "lazy" only wraps the dict, "lazy + top" also reads
+name and probability of the top suggestion like most hot paths do.
+
+    python -m benchmarks.model_parsing
+'''
+
+import copy
+import timeit
+from datetime import datetime
+
+from kindwise.mock_transport import identification_response
+from kindwise.model_parsing import parse_lazy
+from kindwise.models import Classification, Feedback, IdentificationStatus, ResultEvaluation, SimilarImage, Suggestion
+from kindwise.plant import ClassificationLevel, PlantIdentification, PlantInput, PlantResult
+
+NUMBER = 2000
+
+
+def response() -> dict:
+    data = identification_response(suggestions=10, similar_images=4)
+    del data['result']['crop']
+    return data
+
+
+def handwritten_similar_image(data: dict) -> SimilarImage:
+    return SimilarImage(
+        id=data['id'],
+        url=data['url'],
+        similarity=data['similarity'],
+        url_small=data['url_small'],
+        license_name=data.get('license_name'),
+        license_url=data.get('license_url'),
+        citation=data.get('citation'),
+    )
+
+
+def handwritten_classification(data: dict) -> Classification:
+    return Classification(
+        suggestions=[
+            Suggestion(
+                id=suggestion['id'],
+                name=suggestion['name'],
+                probability=suggestion['probability'],
+                similar_images=None
+                if suggestion.get('similar_images') is None
+                else [handwritten_similar_image(similar_image) for similar_image in suggestion['similar_images']],
+                details=suggestion.get('details'),
+            )
+            for suggestion in data['suggestions']
+        ]
+    )
+
+
+def handwritten_evaluation(data: dict) -> ResultEvaluation:
+    return ResultEvaluation(probability=data['probability'], binary=data['binary'], threshold=data['threshold'])
+
+
+def handwritten(data: dict) -> PlantIdentification:
+    input, result = data['input'], data.get('result')
+    return PlantIdentification(
+        access_token=data['access_token'],
+        model_version=data['model_version'],
+        custom_id=data['custom_id'],
+        input=PlantInput(
+            images=input['images'],
+            datetime=datetime.fromisoformat(input['datetime']),
+            latitude=input['latitude'],
+            longitude=input['longitude'],
+            similar_images=input['similar_images'],
+            classification_level=(
+                ClassificationLevel(input['classification_level']) if 'classification_level' in input else None
+            ),
+            classification_raw=input.get('classification_raw', False),
+        ),
+        result=None
+        if result is None
+        else PlantResult(
+            is_plant=handwritten_evaluation(result['is_plant']),
+            is_healthy=handwritten_evaluation(result['is_healthy']) if 'is_healthy' in result else None,
+            classification=handwritten_classification(result['classification']),
+            disease=handwritten_classification(result['disease']) if 'disease' in result else None,
+        ),
+        status=IdentificationStatus(data['status']),
+        sla_compliant_client=data['sla_compliant_client'],
+        sla_compliant_system=data['sla_compliant_system'],
+        created=datetime.fromtimestamp(data['created']),
+        completed=None if data['completed'] is None else datetime.fromtimestamp(data['completed']),
+        feedback=Feedback(rating=data['feedback'].get('rating'), comment=data['feedback'].get('comment'))
+        if 'feedback' in data
+        else None,
+    )
+
+
+def top_suggestion(data: dict) -> tuple[str, float]:
+    suggestion = parse_lazy(PlantIdentification, data).result.classification.suggestions[0]
+    return suggestion.name, suggestion.probability
+
+
+def main():
+    data = response()
+    assert handwritten(data) == PlantIdentification.from_dict(data)
+    assert PlantIdentification.from_dict(copy.deepcopy(data)) == parse_lazy(PlantIdentification, data)
+    cases = {
+        'handwritten': lambda: handwritten(data),
+        'compiled': lambda: PlantIdentification.from_dict(data),
+        'lazy': lambda: parse_lazy(PlantIdentification, data),
+        'lazy + top': lambda: top_suggestion(data),
+    }
+    baseline = None
+    for label, call in cases.items():
+        duration = min(timeit.repeat(call, number=NUMBER, repeat=5)) / NUMBER
+        baseline = duration if baseline is None else baseline
+        print(f'{label:>12}  {duration * 1e6:7.2f} us  {baseline / duration:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+'''
+Payload build time of identifications with 1, 5 and 10 images.
+
+Photos are 3000x2000 px JPEGs downsized to 1500 px, url images are served by ``KindwiseMockTransport`` with 100 ms
+latency. Images of a payload are encoded one after another (the behaviour before concurrent encoding) and
+concurrently, with anyio worker threads and with a process pool.
+
+    python -m benchmarks.multi_image_payload
+'''
+
+import asyncio
+import io
+import os
+import time
+
+from PIL import Image
+
+from kindwise import AsyncPlantApi, EncodingExecutor, KindwiseMockTransport
+
+SIZES = (1, 5, 10)
+
+
+def photo() -> bytes:
+    buffer = io.BytesIO()
+    Image.effect_noise((3000, 2000), 64).convert('RGB').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+async def sequential(api: AsyncPlantApi, images: list) -> list[str]:
+    return [await api._encode_image(image, 1500) for image in images]
+
+
+async def concurrent(api: AsyncPlantApi, images: list) -> list[str]:
+    return (await api._build_payload(images, max_image_size=1500))['images']
+
+
+async def run(label: str, api: AsyncPlantApi, images: list):
+    await concurrent(api, images[:1])  # warm up pools and the client
+    timings = []
+    for size in SIZES:
+        for build in (sequential, concurrent):
+            started = time.perf_counter()
+            await build(api, images[:size])
+            timings.append(f'{(time.perf_counter() - started) * 1000:6.0f}')
+    print(f'{label:>24}: ' + '  '.join(f'{timings[i]} / {timings[i + 1]} ms' for i in range(0, len(timings), 2)))
+
+
+async def main():
+    photos = [photo() for _ in range(max(SIZES))]
+    urls = [f'https://example.com/{i}.jpg' for i in range(max(SIZES))]
+    transport = KindwiseMockTransport(latency=0.1, image_size=(3000, 2000))
+    print(f'{os.cpu_count()} CPUs, sequential / concurrent for ' + ', '.join(f'{size} images' for size in SIZES))
+    await run('local photos, threads', AsyncPlantApi(api_key='benchmark'), photos)
+    executor = EncodingExecutor('process')
+    await run('local photos, processes', AsyncPlantApi(api_key='benchmark', encoding_executor=executor), photos)
+    executor.shutdown()
+    await run('url photos, threads', AsyncPlantApi(api_key='benchmark', transport=transport), urls)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+'''
+Offline load test of the async api against the in-process mock transport.
+
+Identifications of a 2000x1500 px photo run with growing concurrency against ``KindwiseMockTransport`` with 50 ms
+latency, no network or API key is needed. Throughput levels off where the client itself (image encoding, JSON) is the
+bottleneck.
+
+    python -m benchmarks.offline_load
+'''
+
+import asyncio
+import io
+import time
+
+from PIL import Image
+
+from kindwise import AsyncPlantApi, KindwiseMockTransport
+
+LATENCY = 0.05
+
+
+def photo() -> bytes:
+    buffer = io.BytesIO()
+    Image.effect_noise((2000, 1500), 64).convert('RGB').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+async def run(concurrency: int, requests: int, image: bytes) -> float:
+    transport = KindwiseMockTransport(latency=LATENCY)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncPlantApi(api_key='offline', transport=transport) as api:
+
+        async def identify():
+            async with semaphore:
+                await api.identify(image)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(identify() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+    assert transport.requests == requests
+    return elapsed
+
+
+async def main():
+    image = photo()
+    print(f'{LATENCY * 1000:.0f} ms mock latency')
+    for concurrency, requests in ((1, 20), (10, 50), (100, 100)):
+        elapsed = await run(concurrency, requests, image)
+        print(f'concurrency {concurrency:>3}: {requests / elapsed:7.1f} identifications/s')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
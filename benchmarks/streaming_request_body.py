@@ -0,0 +1,100 @@
+'''
+Peak memory of sending identification payloads with the body serialized by httpx (``json=``) and streamed.
+
+The payloads (base64 images) are allocated before tracing starts, so the peak is the memory the request body adds
+on top of the images. The transport drains the body in chunks like a socket would, the concurrent run interleaves
+64 uploads on one event loop.
+
+    python -m benchmarks.streaming_request_body
+'''
+
+import base64
+import os
+import time
+import tracemalloc
+
+import anyio
+import httpx
+
+from kindwise.request_body import AsyncJSONBody, JSONBody
+
+IMAGE_BYTES = 1_200_000
+IMAGES = 3
+CONCURRENCY = 64
+
+
+def payload() -> dict:
+    images = [base64.b64encode(os.urandom(IMAGE_BYTES)).decode('ascii') for _ in range(IMAGES)]
+    return {'images': images, 'similar_images': True, 'latitude': 49.2, 'longitude': 16.6}
+
+
+class DrainTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for _ in request.stream:
+            pass
+        return httpx.Response(201)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async for _ in request.stream:
+            await anyio.sleep(0)  # other uploads progress meanwhile
+        return httpx.Response(201)
+
+
+def send(client: httpx.Client, data: dict, streamed: bool):
+    if streamed:
+        body = JSONBody(data)
+        client.post('http://kindwise.test/', content=body, headers=body.headers)
+    else:
+        client.post('http://kindwise.test/', json=data)
+
+
+async def send_async(client: httpx.AsyncClient, data: dict, streamed: bool):
+    if streamed:
+        body = AsyncJSONBody(data)
+        await client.post('http://kindwise.test/', content=body, headers=body.headers)
+    else:
+        await client.post('http://kindwise.test/', json=data)
+
+
+def traced(call) -> tuple[float, float]:
+    "Returns peak of memory allocated by call in MB and its duration"
+    tracemalloc.start()
+    started = time.perf_counter()
+    call()
+    duration = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6, duration
+
+
+def sequential(streamed: bool) -> tuple[float, float]:
+    data = payload()
+    with httpx.Client(transport=DrainTransport()) as client:
+        send(client, data, streamed)  # warm up
+        return traced(lambda: send(client, data, streamed))
+
+
+def concurrent(streamed: bool) -> tuple[float, float]:
+    payloads = [payload() for _ in range(CONCURRENCY)]
+
+    async def upload_all():
+        async with httpx.AsyncClient(transport=DrainTransport()) as client:
+            async with anyio.create_task_group() as tg:
+                for data in payloads:
+                    tg.start_soon(send_async, client, data, streamed)
+
+    return traced(lambda: anyio.run(upload_all))
+
+
+def main():
+    image_mb = IMAGES * len(payload()['images'][0]) / 1e6
+    print(f'{IMAGES} images of {IMAGE_BYTES / 1e6:.1f} MB, {image_mb:.1f} MB base64 per payload')
+    for label, run in (('1 upload', sequential), (f'{CONCURRENCY} concurrent', concurrent)):
+        for streamed in (False, True):
+            peak, duration = run(streamed)
+            mode = 'streamed' if streamed else 'json='
+            print(f'{label:>14}  {mode:>8}  peak {peak:7.1f} MB  {duration * 1000:6.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
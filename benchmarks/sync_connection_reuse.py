@@ -0,0 +1,86 @@
+'''
+Counts TCP connections opened by the sync api when 32 threads share one instance.
+
+A local HTTP/1.1 keep-alive server stands in for the Kindwise API and counts accepted connections. The same workload
+is run once with a fresh ``httpx.Client`` per call (the behaviour before pooling) and once with the pooled client.
+
+    python -m benchmarks.sync_connection_reuse
+'''
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from kindwise import PlantApi
+
+THREADS = 32
+REQUESTS_PER_THREAD = 50
+USAGE_INFO = {
+    'active': True,
+    'credit_limits': {'day': None, 'week': None, 'month': None, 'total': 100},
+    'used': {'day': 1, 'week': 1, 'month': 1, 'total': 2},
+    'can_use_credits': {'value': True, 'reason': None},
+    'remaining': {'day': None, 'week': None, 'month': None, 'total': 98},
+}
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with CountingHandler.lock:
+            CountingHandler.connections += 1
+
+    def do_GET(self):
+        body = json.dumps(USAGE_INFO).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, call):
+    CountingHandler.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(lambda _: call(), range(THREADS * REQUESTS_PER_THREAD)))
+    elapsed = time.perf_counter() - start
+    requests = THREADS * REQUESTS_PER_THREAD
+    connections = CountingHandler.connections
+    print(
+        f'{label:>16}: {requests} requests, {connections} connections, '
+        f'{requests - connections} reused ({(requests - connections) / requests:.1%}), {requests / elapsed:.0f} req/s'
+    )
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f'http://127.0.0.1:{server.server_address[1]}'
+
+    def per_call_client():
+        with httpx.Client() as client:
+            client.get(f'{host}/api/v3/usage_info', headers={'Api-Key': 'benchmark'}).json()
+
+    api = PlantApi(api_key='benchmark')
+    api.host = host
+    with api:
+        run('client per call', per_call_client)
+        run('pooled client', api.usage_info)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -30,7 +30,12 @@ def main():
             todir="/kindwise",
             additional_replacements={
                 "AsyncClient": "Client",
+                "AsyncBaseTransport": "BaseTransport",
+                "AsyncJSONBody": "JSONBody",
+                "aclose": "close",
+                "aiter_bytes": "iter_bytes",
                 "AsyncKindwiseApi": "KindwiseApi",
+                "AsyncAdaptiveConcurrencyLimiter": "AdaptiveConcurrencyLimiter",
                 "anyio": "pathlib",
                 "AsyncInsectApi": "InsectApi",
                 "AsyncMushroomApi": "MushroomApi",
@@ -1,5 +1,16 @@
+from kindwise.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from kindwise.compression import RequestCompression
+from kindwise.concurrency import AdaptiveConcurrencyLimiter
 from kindwise.crop_health import CropHealthApi
+from kindwise.downloads import DownloadPolicy, ImageDownloadError
+from kindwise.hedging import HedgingPolicy
+from kindwise.image_cache import EncodedImageCache
+from kindwise.image_encoding import EncoderSettings, EncodingExecutor, EncodingQueueFull, EncodingReport
+from kindwise.image_input import ImageBase64, ImageBytes, ImagePath, ImageUrl
 from kindwise.insect import InsectApi, InsectKBType
+from kindwise.interning import StringTable
+from kindwise.json_backend import JSONBackend
+from kindwise.mock_transport import KindwiseMockTransport
 from kindwise.models import (
     ClassificationLevel,
     Conversation,
@@ -12,6 +23,8 @@ from kindwise.models import (
 )
 from kindwise.mushroom import MushroomApi, MushroomKBType
 from kindwise.plant import HealthAssessment, PlantApi, PlantIdentification, PlantKBType, RawPlantIdentification
+from kindwise.rate_limit import RateLimiter
+from kindwise.retry import RetryPolicy
 from kindwise.router import Router, RouterSize
 from kindwise.async_api.crop_health import AsyncCropHealthApi
 from kindwise.async_api.insect import AsyncInsectApi
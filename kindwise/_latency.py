@@ -0,0 +1,28 @@
+import collections
+import math
+
+
+class LatencyWindow:
+    '''
+    Sliding window of the most recent latencies (in seconds).
+    '''
+
+    def __init__(self, size: int = 100):
+        self._samples = collections.deque(maxlen=size)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, latency: float):
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float) -> float | None:
+        return self.percentiles((percentile,))[percentile]
+
+    def percentiles(self, percentiles=(50, 90, 99)) -> dict[float, float | None]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {percentile: None for percentile in percentiles}
+        return {
+            percentile: samples[max(0, math.ceil(percentile / 100 * len(samples)) - 1)] for percentile in percentiles
+        }
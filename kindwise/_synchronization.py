@@ -0,0 +1,235 @@
+'''
+Synchronization primitives shared by the async api and the generated sync api.
+
+Ground truth code in ``kindwise.async_api`` uses the ``Async*`` classes, unasync renames them to their ``Sync*``
+counterparts when generating the sync api, so both variants must keep the same interface.
+'''
+
+import concurrent.futures
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+import anyio
+import anyio.from_thread
+import anyio.lowlevel
+import anyio.to_thread
+
+# threads of the sync hedge pool, each in flight hedgeable request of caller threads takes one or two of them
+HEDGE_WORKERS = 128
+
+
+class AsyncSemaphore:
+    def __init__(self, value: int):
+        self.value = value
+        self._semaphore: anyio.Semaphore | None = None
+
+    async def __aenter__(self):
+        # created lazily, anyio primitives have to be created inside a running event loop
+        if self._semaphore is None:
+            self._semaphore = anyio.Semaphore(self.value)
+        await self._semaphore.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._semaphore.release()
+
+
+class SyncSemaphore:
+    def __init__(self, value: int):
+        self.value = value
+        self._semaphore = threading.Semaphore(value)
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._semaphore.release()
+
+
+class AsyncBackend:
+    @staticmethod
+    async def sleep(seconds: float):
+        await anyio.sleep(seconds)
+
+    @staticmethod
+    async def hedge(
+        call: Callable[[], Awaitable[Any]], delay: float, allow_hedge: Callable[[], bool]
+    ) -> tuple[int, Any]:
+        '''
+        Awaits ``call()``, when it is not finished within ``delay`` seconds and ``allow_hedge()`` agrees, a second
+        ``call()`` is started. Returns index of the attempt which succeeded first with its result, the other attempt is
+        cancelled. Raises the first error when all attempts fail.
+        '''
+        winner = None
+        errors = []
+        finished = anyio.Event()
+
+        async def attempt(index: int, task_group: anyio.abc.TaskGroup):
+            nonlocal winner
+            try:
+                result = await call()
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                if winner is None:
+                    winner = (index, result)
+                    task_group.cancel_scope.cancel()
+            finally:
+                finished.set()
+
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(attempt, 0, task_group)
+            with anyio.move_on_after(delay):
+                await finished.wait()
+            if winner is None and not errors and allow_hedge():
+                task_group.start_soon(attempt, 1, task_group)
+        if winner is None:
+            raise errors[0]
+        return winner
+
+    @staticmethod
+    async def gather(calls: list[Callable[[], Awaitable[Any]]]) -> list[Any]:
+        "Awaits all ``calls`` concurrently and returns their results in order, the first error cancels the rest"
+        if len(calls) == 1:
+            return [await calls[0]()]
+        results = [None] * len(calls)
+        errors = []
+
+        async def run(index: int, task_group: anyio.abc.TaskGroup):
+            try:
+                results[index] = await calls[index]()
+            except Exception as exc:
+                errors.append(exc)
+                task_group.cancel_scope.cancel()
+
+        async with anyio.create_task_group() as task_group:
+            for index in range(len(calls)):
+                task_group.start_soon(run, index, task_group)
+        if errors:
+            raise errors[0]
+        return results
+
+    @staticmethod
+    async def run_in_executor(executor: concurrent.futures.Executor | None, func: Callable[..., Any], *args) -> Any:
+        "Runs CPU bound ``func`` off the event loop, in anyio worker threads when no executor is given"
+        if executor is None:
+            return await anyio.to_thread.run_sync(func, *args)
+        future = executor.submit(func, *args)
+        done = anyio.Event()
+        token = anyio.lowlevel.current_token()
+        loop_thread = threading.get_ident()
+
+        def wake(_):
+            if threading.get_ident() == loop_thread:  # the future finished before the callback was added
+                done.set()
+                return
+            try:
+                anyio.from_thread.run_sync(done.set, token=token)
+            except RuntimeError:  # the event loop is gone
+                pass
+
+        future.add_done_callback(wake)
+        try:
+            await done.wait()
+        except BaseException:
+            future.cancel()
+            raise
+        return future.result()
+
+
+class SyncBackend:
+    _executor: concurrent.futures.ThreadPoolExecutor | None = None
+    _hedge_executor: concurrent.futures.ThreadPoolExecutor | None = None
+    _executor_lock = threading.Lock()
+
+    @staticmethod
+    def sleep(seconds: float):
+        time.sleep(seconds)
+
+    @classmethod
+    def executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix='kindwise')
+            return cls._executor
+
+    @classmethod
+    def hedge_executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        '''
+        Pool of hedged requests, separate from the ``gather`` pool and sized for many caller threads so that it does
+        not limit how many requests they send at once.
+        '''
+        with cls._executor_lock:
+            if cls._hedge_executor is None:
+                cls._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                    HEDGE_WORKERS, thread_name_prefix='kindwise-hedge'
+                )
+            return cls._hedge_executor
+
+    @classmethod
+    def hedge(cls, call: Callable[[], Any], delay: float, allow_hedge: Callable[[], bool]) -> tuple[int, Any]:
+        '''
+        Sync variant of ``AsyncBackend.hedge``, attempts run in the hedge thread pool and the calling thread returns on
+        the first success. The losing attempt is left to finish in the background because threads cannot be cancelled.
+        '''
+        executor = cls.hedge_executor()
+        futures = [executor.submit(call)]
+        done, _ = concurrent.futures.wait(futures, timeout=delay)
+        if not done and allow_hedge():
+            futures.append(executor.submit(call))
+        errors = []
+        pending = set(futures)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in sorted(done, key=futures.index):
+                if future.exception() is None:
+                    return futures.index(future), future.result()
+                errors.append(future.exception())
+        raise errors[0]
+
+    @classmethod
+    def gather(cls, calls: list[Callable[[], Any]]) -> list[Any]:
+        "Runs all ``calls`` in the shared thread pool and returns their results in order, raises the first error"
+        if len(calls) == 1:
+            return [calls[0]()]
+        futures = [cls.executor().submit(call) for call in calls]
+        concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+        for future in futures:
+            if future.done() and future.exception() is not None:
+                for other in futures:
+                    other.cancel()
+                raise future.exception()
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def run_in_executor(executor: concurrent.futures.Executor | None, func: Callable[..., Any], *args) -> Any:
+        "Runs ``func`` in the executor, in the calling thread when no executor is given"
+        if executor is None:
+            return func(*args)
+        return executor.submit(func, *args).result()
+
+
+class AsyncEvent:
+    "Has to be created inside a running event loop"
+
+    def __init__(self):
+        self._event = anyio.Event()
+
+    def set(self):
+        self._event.set()
+
+    async def wait(self):
+        await self._event.wait()
+
+
+class SyncEvent:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def set(self):
+        self._event.set()
+
+    def wait(self):
+        self._event.wait()
@@ -0,0 +1 @@
+from kindwise.async_api.concurrency import AsyncAdaptiveConcurrencyLimiter
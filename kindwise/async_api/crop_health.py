@@ -4,32 +4,21 @@ from pathlib import Path
 
 from kindwise import settings
 from kindwise.async_api.core import AsyncKindwiseApi
+from kindwise.model_parsing import Model
 from kindwise.models import Identification, ResultEvaluation, ClassificationWithScientificName, Conversation
 
 
-@dataclass
-class CropResult:
+@dataclass(slots=True)
+class CropResult(Model):
     is_plant: ResultEvaluation
     crop: ClassificationWithScientificName
     disease: ClassificationWithScientificName | None
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            is_plant=ResultEvaluation.from_dict(data['is_plant']),
-            crop=ClassificationWithScientificName.from_dict(data['crop']),
-            disease=ClassificationWithScientificName.from_dict(data['disease']) if 'disease' in data else None,
-        )
 
-
-@dataclass
+@dataclass(slots=True)
 class CropIdentification(Identification):
     result: CropResult | None
 
-    @classmethod
-    def get_result_class(cls):
-        return CropResult
-
 
 class CropHealthKBType(str, enum.Enum):
     CROP = 'crop'
@@ -40,13 +29,13 @@ class AsyncCropHealthApi(AsyncKindwiseApi[CropIdentification, CropHealthKBType])
     default_kb_type = CropHealthKBType.CROP
     identification_class = CropIdentification
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, **kwargs):
         api_key = settings.CROP_HEALTH_API_KEY if api_key is None else api_key
         if api_key is None:
             raise ValueError(
                 'API key is required, set it in init method of class or in .env file under "CROP_HEALTH_API_KEY" key'
             )
-        super().__init__(api_key)
+        super().__init__(api_key, **kwargs)
 
     @property
     def identification_url(self):
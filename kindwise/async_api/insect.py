@@ -8,14 +8,15 @@ from PIL import Image
 
 from kindwise import settings
 from kindwise.async_api.core import AsyncKindwiseApi
+from kindwise.image_encoding import EncoderSettings
+from kindwise.image_input import ImageInput
+from kindwise.model_parsing import Model
 from kindwise.models import (
     Identification,
     Conversation,
     ResultEvaluation,
     Classification,
     Input,
-    IdentificationStatus,
-    Feedback,
 )
 
 
@@ -23,52 +24,29 @@ class InsectKBType(str, enum.Enum):
     INSECT = 'insect'
 
 
-@dataclass
-class InsectResult:
+@dataclass(slots=True)
+class InsectResult(Model):
     is_insect: ResultEvaluation
     classification: Classification
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            is_insect=ResultEvaluation.from_dict(data['is_insect']),
-            classification=Classification.from_dict(data['classification']),
-        )
-
 
-@dataclass
+@dataclass(slots=True)
 class InsectIdentification(Identification):
     result: InsectResult | None
     input: Input
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'InsectIdentification':
-        return cls(
-            access_token=data['access_token'],
-            model_version=data['model_version'],
-            custom_id=data['custom_id'],
-            input=Input.from_dict(data['input']),
-            result=None if 'result' not in data else InsectResult.from_dict(data['result']),
-            status=IdentificationStatus(data['status']),
-            sla_compliant_client=data['sla_compliant_client'],
-            sla_compliant_system=data['sla_compliant_system'],
-            created=datetime.fromtimestamp(data['created']),
-            completed=None if data['completed'] is None else datetime.fromtimestamp(data['completed']),
-            feedback=Feedback.from_dict(data['feedback']) if 'feedback' in data else None,
-        )
-
 
 class AsyncInsectApi(AsyncKindwiseApi[InsectIdentification, InsectKBType]):
     host = 'https://insect.kindwise.com'
     default_kb_type = InsectKBType.INSECT
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, **kwargs):
         api_key = settings.INSECT_API_KEY if api_key is None else api_key
         if api_key is None:
             raise ValueError(
                 'API key is required, set it in init method of class or in .env file under "INSECT_API_KEY" key'
             )
-        super().__init__(api_key)
+        super().__init__(api_key, **kwargs)
 
     @property
     def identification_url(self):
@@ -84,7 +62,15 @@ class AsyncInsectApi(AsyncKindwiseApi[InsectIdentification, InsectKBType]):
 
     async def identify(
         self,
-        image: PurePath | str | bytes | BinaryIO | Image.Image | list[str | PurePath | bytes | BinaryIO | Image.Image],
+        image: (
+            PurePath
+            | str
+            | bytes
+            | BinaryIO
+            | Image.Image
+            | ImageInput
+            | list[str | PurePath | bytes | BinaryIO | Image.Image | ImageInput]
+        ),
         details: str | list[str] = None,
         disease_details: str | list[str] = None,
         language: str | list[str] = None,
@@ -94,6 +80,7 @@ class AsyncInsectApi(AsyncKindwiseApi[InsectIdentification, InsectKBType]):
         custom_id: int | None = None,
         date_time: datetime | str | float | None = None,
         max_image_size: int | None = 1500,
+        encoder_settings: EncoderSettings | None = None,
         as_dict: bool = False,
         extra_get_params: str | dict[str, str] = None,
         extra_post_params: str | dict[str, dict[str, str]] | dict[str, str] = None,
@@ -109,6 +96,7 @@ class AsyncInsectApi(AsyncKindwiseApi[InsectIdentification, InsectKBType]):
             custom_id=custom_id,
             date_time=date_time,
             max_image_size=max_image_size,
+            encoder_settings=encoder_settings,
             as_dict=True,
             extra_get_params=extra_get_params,
             extra_post_params=extra_post_params,
@@ -116,7 +104,7 @@ class AsyncInsectApi(AsyncKindwiseApi[InsectIdentification, InsectKBType]):
         )
         if as_dict:
             return identification
-        return InsectIdentification.from_dict(identification)
+        return self._parse(InsectIdentification, identification)
 
     async def get_identification(
         self,
@@ -136,7 +124,7 @@ class AsyncInsectApi(AsyncKindwiseApi[InsectIdentification, InsectKBType]):
             extra_get_params=extra_get_params,
             timeout=timeout,
         )
-        return identification if as_dict else InsectIdentification.from_dict(identification)
+        return identification if as_dict else self._parse(InsectIdentification, identification)
 
     @property
     def views_path(self) -> Path:
@@ -8,14 +8,15 @@ from PIL import Image
 
 from kindwise import settings
 from kindwise.async_api.core import AsyncKindwiseApi
+from kindwise.image_encoding import EncoderSettings
+from kindwise.image_input import ImageInput
+from kindwise.model_parsing import Model
 from kindwise.models import (
     Identification,
     Conversation,
     ResultEvaluation,
     Classification,
     Input,
-    IdentificationStatus,
-    Feedback,
 )
 
 
@@ -23,52 +24,29 @@ class MushroomKBType(str, enum.Enum):
     MUSHROOM = 'mushroom'
 
 
-@dataclass
-class MushroomResult:
+@dataclass(slots=True)
+class MushroomResult(Model):
     is_mushroom: ResultEvaluation
     classification: Classification
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            is_mushroom=ResultEvaluation.from_dict(data['is_mushroom']),
-            classification=Classification.from_dict(data['classification']),
-        )
-
 
-@dataclass
+@dataclass(slots=True)
 class MushroomIdentification(Identification):
     result: MushroomResult | None
     input: Input
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'MushroomIdentification':
-        return cls(
-            access_token=data['access_token'],
-            model_version=data['model_version'],
-            custom_id=data['custom_id'],
-            input=Input.from_dict(data['input']),
-            result=None if 'result' not in data else MushroomResult.from_dict(data['result']),
-            status=IdentificationStatus(data['status']),
-            sla_compliant_client=data['sla_compliant_client'],
-            sla_compliant_system=data['sla_compliant_system'],
-            created=datetime.fromtimestamp(data['created']),
-            completed=None if data['completed'] is None else datetime.fromtimestamp(data['completed']),
-            feedback=Feedback.from_dict(data['feedback']) if 'feedback' in data else None,
-        )
-
 
 class AsyncMushroomApi(AsyncKindwiseApi[Identification, MushroomKBType]):
     host = 'https://mushroom.kindwise.com'
     default_kb_type = MushroomKBType.MUSHROOM
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, **kwargs):
         api_key = settings.MUSHROOM_API_KEY if api_key is None else api_key
         if api_key is None:
             raise ValueError(
                 'API key is required, set it in init method of class or in .env file under "MUSHROOM_API_KEY" key'
             )
-        super().__init__(api_key)
+        super().__init__(api_key, **kwargs)
 
     @property
     def identification_url(self):
@@ -88,7 +66,15 @@ class AsyncMushroomApi(AsyncKindwiseApi[Identification, MushroomKBType]):
 
     async def identify(
         self,
-        image: PurePath | str | bytes | BinaryIO | Image.Image | list[str | PurePath | bytes | BinaryIO | Image.Image],
+        image: (
+            PurePath
+            | str
+            | bytes
+            | BinaryIO
+            | Image.Image
+            | ImageInput
+            | list[str | PurePath | bytes | BinaryIO | Image.Image | ImageInput]
+        ),
         details: str | list[str] = None,
         disease_details: str | list[str] = None,
         language: str | list[str] = None,
@@ -98,6 +84,7 @@ class AsyncMushroomApi(AsyncKindwiseApi[Identification, MushroomKBType]):
         custom_id: int | None = None,
         date_time: datetime | str | float | None = None,
         max_image_size: int | None = 1500,
+        encoder_settings: EncoderSettings | None = None,
         as_dict: bool = False,
         extra_get_params: str | dict[str, str] = None,
         extra_post_params: str | dict[str, dict[str, str]] | dict[str, str] = None,
@@ -113,6 +100,7 @@ class AsyncMushroomApi(AsyncKindwiseApi[Identification, MushroomKBType]):
             custom_id=custom_id,
             date_time=date_time,
             max_image_size=max_image_size,
+            encoder_settings=encoder_settings,
             as_dict=True,
             extra_get_params=extra_get_params,
             extra_post_params=extra_post_params,
@@ -120,7 +108,7 @@ class AsyncMushroomApi(AsyncKindwiseApi[Identification, MushroomKBType]):
         )
         if as_dict:
             return identification
-        return MushroomIdentification.from_dict(identification)
+        return self._parse(MushroomIdentification, identification)
 
     async def get_identification(
         self,
@@ -140,7 +128,7 @@ class AsyncMushroomApi(AsyncKindwiseApi[Identification, MushroomKBType]):
             extra_get_params=extra_get_params,
             timeout=timeout,
         )
-        return identification if as_dict else MushroomIdentification.from_dict(identification)
+        return identification if as_dict else self._parse(MushroomIdentification, identification)
 
     async def ask_question(
         self,
@@ -9,12 +9,13 @@ from PIL import Image
 
 from kindwise import settings
 from kindwise.async_api.core import AsyncKindwiseApi
+from kindwise.image_encoding import EncoderSettings
+from kindwise.image_input import ImageInput
+from kindwise.model_parsing import Model
 from kindwise.models import (
     ClassificationLevel,
     Identification,
     Input,
-    IdentificationStatus,
-    Feedback,
     ResultEvaluation,
     Classification,
     Suggestion,
@@ -26,180 +27,74 @@ class PlantKBType(str, enum.Enum):
     DISEASES = 'diseases'
 
 
-@dataclass
-class PlantResult:
+@dataclass(slots=True)
+class PlantResult(Model):
     is_plant: ResultEvaluation
     is_healthy: ResultEvaluation | None
     classification: Classification
     disease: Classification | None
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            is_plant=ResultEvaluation.from_dict(data['is_plant']),
-            is_healthy=ResultEvaluation.from_dict(data['is_healthy']) if 'is_healthy' in data else None,
-            classification=Classification.from_dict(data['classification']),
-            disease=Classification.from_dict(data['disease']) if 'disease' in data else None,
-        )
 
-
-@dataclass
+@dataclass(slots=True)
 class PlantInput(Input):
     classification_level: ClassificationLevel | None
-    classification_raw: bool
-
-    @classmethod
-    def from_dict(cls, data: dict) -> 'PlantInput':
-        return cls(
-            images=data['images'],
-            datetime=datetime.fromisoformat(data['datetime']),
-            latitude=data['latitude'],
-            longitude=data['longitude'],
-            similar_images=data['similar_images'],
-            classification_level=(
-                ClassificationLevel(data['classification_level']) if 'classification_level' in data else None
-            ),
-            classification_raw=data.get('classification_raw', False),
-        )
+    classification_raw: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class PlantIdentification(Identification):
     result: PlantResult | None
     input: PlantInput
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'PlantIdentification':
-        return cls(
-            access_token=data['access_token'],
-            model_version=data['model_version'],
-            custom_id=data['custom_id'],
-            input=PlantInput.from_dict(data['input']),
-            result=None if 'result' not in data else PlantResult.from_dict(data['result']),
-            status=IdentificationStatus(data['status']),
-            sla_compliant_client=data['sla_compliant_client'],
-            sla_compliant_system=data['sla_compliant_system'],
-            created=datetime.fromtimestamp(data['created']),
-            completed=None if data['completed'] is None else datetime.fromtimestamp(data['completed']),
-            feedback=Feedback.from_dict(data['feedback']) if 'feedback' in data else None,
-        )
-
 
-@dataclass
-class TaxaSpecificSuggestion:
+@dataclass(slots=True)
+class TaxaSpecificSuggestion(Model):
     genus: list[Suggestion]
     species: list[Suggestion]
     infraspecies: list[Suggestion] | None
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            genus=[Suggestion.from_dict(suggestion) for suggestion in data['genus']],
-            species=[Suggestion.from_dict(suggestion) for suggestion in data['species']],
-            infraspecies=(
-                None
-                if 'infraspecies' not in data
-                else [Suggestion.from_dict(suggestion) for suggestion in data['infraspecies']]
-            ),
-        )
 
-
-@dataclass
-class RawClassification:
+@dataclass(slots=True)
+class RawClassification(Model):
     suggestions: TaxaSpecificSuggestion
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            suggestions=TaxaSpecificSuggestion.from_dict(data['suggestions']),
-        )
 
-
-@dataclass
-class RawPlantResult:
+@dataclass(slots=True)
+class RawPlantResult(Model):
     is_plant: ResultEvaluation
     is_healthy: ResultEvaluation | None
     classification: RawClassification
     disease: Classification | None
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            is_plant=ResultEvaluation.from_dict(data['is_plant']),
-            is_healthy=ResultEvaluation.from_dict(data['is_healthy']) if 'is_healthy' in data else None,
-            classification=RawClassification.from_dict(data['classification']),
-            disease=Classification.from_dict(data['disease']) if 'disease' in data else None,
-        )
-
 
-@dataclass
+@dataclass(slots=True)
 class RawPlantIdentification(Identification):
     result: RawPlantResult | None
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'RawPlantIdentification':
-        return cls(
-            access_token=data['access_token'],
-            model_version=data['model_version'],
-            custom_id=data['custom_id'],
-            input=Input.from_dict(data['input']),
-            result=None if 'result' not in data else RawPlantResult.from_dict(data['result']),
-            status=IdentificationStatus(data['status']),
-            sla_compliant_client=data['sla_compliant_client'],
-            sla_compliant_system=data['sla_compliant_system'],
-            created=datetime.fromtimestamp(data['created']),
-            completed=None if data['completed'] is None else datetime.fromtimestamp(data['completed']),
-            feedback=Feedback.from_dict(data['feedback']) if 'feedback' in data else None,
-        )
-
 
-@dataclass
-class HealthAssessmentResult:
+@dataclass(slots=True)
+class HealthAssessmentResult(Model):
     is_plant: ResultEvaluation
     is_healthy: ResultEvaluation
     disease: Classification
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            is_plant=ResultEvaluation.from_dict(data['is_plant']),
-            is_healthy=ResultEvaluation.from_dict(data['is_healthy']),
-            disease=Classification.from_dict(data['disease']),
-        )
-
 
-@dataclass
+@dataclass(slots=True)
 class HealthAssessment(Identification):
     result: HealthAssessmentResult | None
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'HealthAssessment':
-        return cls(
-            access_token=data['access_token'],
-            model_version=data['model_version'],
-            custom_id=data['custom_id'],
-            input=Input.from_dict(data['input']),
-            result=None if 'result' not in data else HealthAssessmentResult.from_dict(data['result']),
-            status=data['status'],
-            sla_compliant_client=data['sla_compliant_client'],
-            sla_compliant_system=data['sla_compliant_system'],
-            created=datetime.fromtimestamp(data['created']),
-            completed=None if data['completed'] is None else datetime.fromtimestamp(data['completed']),
-            feedback=Feedback.from_dict(data['feedback']) if 'feedback' in data else None,
-        )
-
 
 class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
     host = 'https://plant.id'
     default_kb_type = PlantKBType.PLANTS
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, **kwargs):
         api_key = settings.PLANT_API_KEY if api_key is None else api_key
         if api_key is None:
             raise ValueError(
                 'API key is required, set it in init method of class or in .env file under "PLANT_API_KEY" key'
             )
-        super().__init__(api_key)
+        super().__init__(api_key, **kwargs)
 
     @property
     def identification_url(self):
@@ -248,7 +143,15 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
 
     async def identify(
         self,
-        image: PurePath | str | bytes | BinaryIO | Image.Image | list[str | PurePath | bytes | BinaryIO | Image.Image],
+        image: (
+            PurePath
+            | str
+            | bytes
+            | BinaryIO
+            | Image.Image
+            | ImageInput
+            | list[str | PurePath | bytes | BinaryIO | Image.Image | ImageInput]
+        ),
         details: str | list[str] = None,
         disease_details: str | list[str] = None,
         language: str | list[str] = None,
@@ -261,6 +164,7 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
         custom_id: int | None = None,
         date_time: datetime | str | float | None = None,
         max_image_size: int | None = 1500,
+        encoder_settings: EncoderSettings | None = None,
         as_dict: bool = False,
         extra_get_params: str | dict[str, str] = None,
         extra_post_params: str | dict[str, dict[str, str]] | dict[str, str] = None,
@@ -277,6 +181,7 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
             custom_id=custom_id,
             date_time=date_time,
             max_image_size=max_image_size,
+            encoder_settings=encoder_settings,
             classification_level=classification_level,
             classification_raw=classification_raw,
             as_dict=True,
@@ -287,10 +192,10 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
         if as_dict:
             return identification
         if classification_raw:
-            return RawPlantIdentification.from_dict(identification)
+            return self._parse(RawPlantIdentification, identification)
         if health == 'only':
-            return HealthAssessment.from_dict(identification)
-        return PlantIdentification.from_dict(identification)
+            return self._parse(HealthAssessment, identification)
+        return self._parse(PlantIdentification, identification)
 
     async def get_identification(
         self,
@@ -310,7 +215,7 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
             extra_get_params=extra_get_params,
             timeout=timeout,
         )  # todo might be RawPlantIdentification
-        return identification if as_dict else PlantIdentification.from_dict(identification)
+        return identification if as_dict else self._parse(PlantIdentification, identification)
 
     def _build_query(
         self,
@@ -328,7 +233,15 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
 
     async def health_assessment(
         self,
-        image: PurePath | str | bytes | BinaryIO | Image.Image | list[str | PurePath | bytes | BinaryIO | Image.Image],
+        image: (
+            PurePath
+            | str
+            | bytes
+            | BinaryIO
+            | Image.Image
+            | ImageInput
+            | list[str | PurePath | bytes | BinaryIO | Image.Image | ImageInput]
+        ),
         details: str | list[str] = None,
         language: str | list[str] = None,
         asynchronous: bool = False,
@@ -338,6 +251,7 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
         custom_id: int | None = None,
         date_time: datetime | str | float | None = None,
         max_image_size: int | None = 1500,
+        encoder_settings: EncoderSettings | None = None,
         as_dict: bool = False,
         extra_get_params: str | dict[str, str] = None,
         extra_post_params: str = None,
@@ -358,13 +272,14 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
             custom_id=custom_id,
             date_time=date_time,
             max_image_size=max_image_size,
+            encoder_settings=encoder_settings,
             extra_post_params=extra_post_params,
         )
-        response = await self._make_api_call(url, 'POST', payload, timeout=timeout)
+        response = await self._make_api_call(url, 'POST', payload, timeout=timeout, credits=1)
         if not response.is_success:
             raise ValueError(f'Error while creating a health assessment: {response.status_code=} {response.text=}')
-        health_assessment = response.json()
-        return health_assessment if as_dict else HealthAssessment.from_dict(health_assessment)
+        health_assessment = self._decode_identification(response)
+        return health_assessment if as_dict else self._parse(HealthAssessment, health_assessment)
 
     async def get_health_assessment(
         self,
@@ -383,8 +298,8 @@ class AsyncPlantApi(AsyncKindwiseApi[PlantIdentification, PlantKBType]):
         response = await self._make_api_call(url, 'GET', timeout=timeout)
         if not response.is_success:
             raise ValueError(f'Error while getting a health assessment: {response.status_code=} {response.text=}')
-        health_assessment = response.json()
-        return health_assessment if as_dict else HealthAssessment.from_dict(health_assessment)
+        health_assessment = self._decode_identification(response)
+        return health_assessment if as_dict else self._parse(HealthAssessment, health_assessment)
 
     async def delete_health_assessment(
         self,
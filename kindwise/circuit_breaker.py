@@ -0,0 +1,174 @@
+import collections
+import enum
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    "Raised instead of sending a request to a host whose circuit is open"
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f'Circuit for {host} is open, next probe request in {retry_in:.1f}s')
+
+
+@dataclass
+class Circuit:
+    state: CircuitState = CircuitState.CLOSED
+    outcomes: collections.deque = field(default_factory=collections.deque)
+    opened_at: float = 0.0
+    probes_in_flight: int = 0
+    probe_successes: int = 0
+    # bumped on every transition, outcomes of calls admitted in an earlier state are ignored
+    generation: int = 0
+
+
+@dataclass
+class CircuitCall:
+    "Handle of one admitted call, set ``response`` to let the breaker see its status code"
+
+    response: httpx.Response | None = None
+
+
+class CircuitBreaker:
+    '''
+    Circuit breaker keyed by host.
+
+    While a circuit is closed, outcomes of the last ``window`` calls are kept. A call fails when it raises an exception,
+    gets a 5xx response or takes longer than ``slow_call_duration`` seconds. Once at least ``min_calls`` outcomes are
+    known and the failure rate reaches ``failure_rate_threshold``, the circuit opens and calls fail immediately with
+    ``CircuitOpenError``. After ``open_duration`` seconds the circuit is half-open and lets ``probe_calls`` calls through,
+    it closes when all of them succeed and opens again on the first failure.
+
+    ``on_state_change(host, old_state, new_state)`` is called on every transition.
+    '''
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float | None = None,
+        window: int = 20,
+        min_calls: int = 10,
+        open_duration: float = 30.0,
+        probe_calls: int = 1,
+        on_state_change: Callable[[str, CircuitState, CircuitState], None] | None = None,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.window = window
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.probe_calls = probe_calls
+        self.on_state_change = on_state_change
+        self._circuits: dict[str, Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, host: str) -> Circuit:
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits.setdefault(host, Circuit(outcomes=collections.deque(maxlen=self.window)))
+        return circuit
+
+    def state(self, host: str) -> CircuitState:
+        circuit = self._circuit(host)
+        with self._lock:
+            if circuit.state == CircuitState.OPEN and time.monotonic() - circuit.opened_at >= self.open_duration:
+                return CircuitState.HALF_OPEN
+            return circuit.state
+
+    def failure_rate(self, host: str) -> float | None:
+        outcomes = list(self._circuit(host).outcomes)
+        return sum(outcomes) / len(outcomes) if outcomes else None
+
+    def _transition(self, host: str, circuit: Circuit, state: CircuitState, changes: list):
+        changes.append((host, circuit.state, state))
+        circuit.state = state
+        circuit.generation += 1
+        circuit.probes_in_flight = circuit.probe_successes = 0
+        if state == CircuitState.OPEN:
+            circuit.opened_at = time.monotonic()
+        elif state == CircuitState.CLOSED:
+            circuit.outcomes.clear()
+
+    def _notify(self, changes: list):
+        if self.on_state_change is not None:
+            for host, old, new in changes:
+                self.on_state_change(host, old, new)
+
+    def before_call(self, host: str) -> int:
+        '''
+        Admits a call to ``host`` or raises ``CircuitOpenError``, admitted calls have to be finished by ``after_call``
+        with the returned generation of the circuit.
+        '''
+        circuit = self._circuit(host)
+        changes = []
+        with self._lock:
+            if circuit.state == CircuitState.OPEN:
+                retry_in = self.open_duration - (time.monotonic() - circuit.opened_at)
+                if retry_in > 0:
+                    raise CircuitOpenError(host, retry_in)
+                self._transition(host, circuit, CircuitState.HALF_OPEN, changes)
+            if circuit.state == CircuitState.HALF_OPEN:
+                if circuit.probes_in_flight + circuit.probe_successes >= self.probe_calls:
+                    raise CircuitOpenError(host, 0.0)
+                circuit.probes_in_flight += 1
+            generation = circuit.generation
+        self._notify(changes)
+        return generation
+
+    def after_call(self, host: str, failed: bool | None, generation: int | None = None):
+        '''
+        Records the outcome of an admitted call, ``failed=None`` releases a call which was cancelled. A call admitted
+        before the circuit changed state (e.g. a slow call let through while closed and finishing during half-open) is
+        not counted, ``generation=None`` takes the call as admitted in the current state.
+        '''
+        circuit = self._circuit(host)
+        changes = []
+        with self._lock:
+            if generation is not None and generation != circuit.generation:
+                pass
+            elif circuit.state == CircuitState.HALF_OPEN:
+                circuit.probes_in_flight -= 1
+                if failed:
+                    self._transition(host, circuit, CircuitState.OPEN, changes)
+                elif failed is not None:
+                    circuit.probe_successes += 1
+                    if circuit.probe_successes >= self.probe_calls:
+                        self._transition(host, circuit, CircuitState.CLOSED, changes)
+            elif circuit.state == CircuitState.CLOSED and failed is not None:
+                circuit.outcomes.append(failed)
+                if (
+                    len(circuit.outcomes) >= self.min_calls
+                    and sum(circuit.outcomes) / len(circuit.outcomes) >= self.failure_rate_threshold
+                ):
+                    self._transition(host, circuit, CircuitState.OPEN, changes)
+        self._notify(changes)
+
+    @contextmanager
+    def call(self, host: str):
+        generation = self.before_call(host)
+        call = CircuitCall()
+        started = time.monotonic()
+        failed = None
+        try:
+            yield call
+            failed = call.response is not None and call.response.status_code >= 500
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if not failed and failed is not None and self.slow_call_duration is not None:
+                failed = time.monotonic() - started > self.slow_call_duration
+            self.after_call(host, failed, generation)
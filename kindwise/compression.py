@@ -0,0 +1,92 @@
+import gzip
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# base64 encoded JPEGs compress to ~77 % with any level, higher gzip levels only cost CPU
+DEFAULT_LEVELS = {'gzip': 1, 'zstd': 3}
+UNSUPPORTED_MEDIA_TYPE = 415
+# larger bodies are compressed off the event loop of the async api, smaller ones take less than a thread hop
+OFFLOAD_SIZE = 64 * 1024
+
+
+class RequestCompression:
+    '''
+    Compression of request bodies.
+
+    Bodies smaller than ``min_size`` bytes are sent uncompressed. A host which answers 415 Unsupported Media Type to
+    a compressed body gets the request again with an encoding from the ``Accept-Encoding`` header of its response
+    (RFC 7694) or uncompressed, and later bodies for the host use the same encoding.
+
+    Attributes:
+        requests: Number of bodies passed for compression.
+        compressed: Number of bodies sent compressed.
+        bytes_in: Size of the compressed bodies before compression.
+        bytes_out: Size of the compressed bodies after compression.
+    '''
+
+    def __init__(self, encoding: str = 'gzip', min_size: int = 16 * 1024, level: int | None = None):
+        if encoding not in DEFAULT_LEVELS:
+            raise ValueError(f'Unsupported encoding {encoding=}, expected one of {", ".join(DEFAULT_LEVELS)}')
+        if encoding == 'zstd' and zstandard is None:
+            raise ValueError('zstd compression requires the "zstandard" package (pip install zstandard)')
+        self.encoding = encoding
+        self.min_size = min_size
+        self.level = DEFAULT_LEVELS[encoding] if level is None else level
+        self.requests = 0
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._host_encodings: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ratio(self) -> float | None:
+        "Compressed size of all compressed bodies relative to their original size"
+        return self.bytes_out / self.bytes_in if self.bytes_in else None
+
+    def encoding_for(self, host: str) -> str | None:
+        return self._host_encodings.get(host, self.encoding)
+
+    def compress(self, host: str, body: bytes) -> tuple[bytes, str | None]:
+        "Returns the body to send and its content encoding, None when it is not compressed"
+        with self._lock:
+            self.requests += 1
+        encoding = self.encoding_for(host)
+        if encoding is None or len(body) < self.min_size:
+            return body, None
+        level = self.level if encoding == self.encoding else DEFAULT_LEVELS[encoding]
+        if encoding == 'zstd':
+            compressed = zstandard.ZstdCompressor(level=level).compress(body)
+        else:
+            compressed = gzip.compress(body, compresslevel=level, mtime=0)
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += len(body)
+            self.bytes_out += len(compressed)
+        return compressed, encoding
+
+    def reject(self, host: str, encoding: str, accept_encoding: str | None = None) -> str | None:
+        "Records that host does not accept encoding and returns the encoding to retry with, None for uncompressed"
+        accepted = (
+            [] if accept_encoding is None else [value.split(';')[0].strip() for value in accept_encoding.split(',')]
+        )
+        fallback = None
+        for candidate in accepted:
+            if candidate != encoding and candidate in DEFAULT_LEVELS and (candidate != 'zstd' or zstandard is not None):
+                fallback = candidate
+                break
+        self._host_encodings[host] = fallback
+        return fallback
+
+    def stats(self) -> dict[str, int | float | None]:
+        return {
+            'requests': self.requests,
+            'compressed': self.compressed,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': self.ratio,
+        }
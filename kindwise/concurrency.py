@@ -0,0 +1,145 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+
+from kindwise._latency import LatencyWindow
+from kindwise._synchronization import SyncEvent
+
+
+@dataclass
+class HostConcurrency:
+    limit: float
+    in_flight: int = 0
+    latencies: LatencyWindow = field(default_factory=LatencyWindow)
+    smoothed_latency: float | None = None
+    last_decrease: float = 0.0
+    waiters: list = field(default_factory=list)
+
+
+@dataclass
+class Slot:
+    "Handle of one request admitted by the limiter, set ``response`` to let the limiter see its status code"
+
+    response: httpx.Response | None = None
+
+
+class AdaptiveConcurrencyLimiter:
+    '''
+    AIMD limiter of requests in flight, tracked separately for each host.
+
+    The limit of a host grows additively (by ``increase`` per ``limit`` completed requests) while the smoothed latency
+    stays within ``latency_tolerance`` times the baseline latency (10th percentile of recent requests), increases
+    smaller than ``min_latency_increase`` seconds are considered noise. The limit is multiplied by ``decrease_factor``
+    when a request fails with 429/5xx, raises an exception or latency spikes, at most once per smoothed latency so one
+    burst of failures counts as one congestion event. Latencies are measured with ``clock``.
+    '''
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_latency_increase: float = 0.005,
+        window: int = 100,
+        min_samples: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_latency_increase = min_latency_increase
+        self.window = window
+        self.min_samples = min_samples
+        self.clock = clock
+        self._hosts: dict[str, HostConcurrency] = {}
+        # guards only short state updates, it is never held while waiting
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> HostConcurrency:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts.setdefault(
+                host, HostConcurrency(self.initial_limit, latencies=LatencyWindow(self.window))
+            )
+        return state
+
+    def limit(self, host: str) -> int:
+        return int(self._host(host).limit)
+
+    def in_flight(self, host: str) -> int:
+        return self._host(host).in_flight
+
+    def latency_percentiles(self, host: str, percentiles=(50, 90, 99)) -> dict[float, float | None]:
+        return self._host(host).latencies.percentiles(percentiles)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            host: {'limit': int(state.limit), 'in_flight': state.in_flight, 'latency': state.latencies.percentiles()}
+            for host, state in list(self._hosts.items())
+        }
+
+    @contextmanager
+    def slot(self, host: str):
+        state = self._host(host)
+        while True:
+            with self._lock:
+                if state.in_flight < int(state.limit):
+                    state.in_flight += 1
+                    break
+                waiter = SyncEvent()
+                state.waiters.append(waiter)
+            waiter.wait()
+        slot = Slot()
+        started = self.clock()
+        # None marks cancelled requests, they say nothing about the server
+        failed = None
+        try:
+            yield slot
+            failed = slot.response is not None and (
+                slot.response.status_code == 429 or slot.response.status_code >= 500
+            )
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(state, self.clock() - started, failed)
+
+    def _release(self, state: HostConcurrency, latency: float, failed: bool | None):
+        with self._lock:
+            state.in_flight -= 1
+            if failed is not None:
+                self._update(state, latency, failed)
+            waiters, state.waiters = state.waiters, []
+        for waiter in waiters:
+            waiter.set()
+
+    def _update(self, state: HostConcurrency, latency: float, failed: bool):
+        now = self.clock()
+        if not failed:
+            state.latencies.add(latency)
+            state.smoothed_latency = (
+                latency if state.smoothed_latency is None else 0.8 * state.smoothed_latency + 0.2 * latency
+            )
+        congested = failed
+        if not failed and len(state.latencies) >= self.min_samples:
+            baseline = state.latencies.percentile(10)
+            congested = state.smoothed_latency > max(
+                baseline * self.latency_tolerance, baseline + self.min_latency_increase
+            )
+        if congested:
+            if now - state.last_decrease >= (state.smoothed_latency or 0.0):
+                state.limit = max(self.min_limit, state.limit * self.decrease_factor)
+                state.last_decrease = now
+        elif state.in_flight + 1 >= state.limit / 2:
+            # grow only when the limit is actually used
+            state.limit = min(self.max_limit, state.limit + self.increase / state.limit)
@@ -0,0 +1,683 @@
+import abc
+import base64
+import binascii
+import contextlib
+import dataclasses
+import enum
+import functools
+import io
+import json
+import mmap
+import threading
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path, PurePath
+from typing import Any, BinaryIO, Callable, Generic, TypeVar
+
+import pathlib
+import httpx
+from PIL import Image
+
+from kindwise._synchronization import SyncBackend, SyncSemaphore
+from kindwise.concurrency import AdaptiveConcurrencyLimiter
+from kindwise.circuit_breaker import CircuitBreaker
+from kindwise.compression import OFFLOAD_SIZE, UNSUPPORTED_MEDIA_TYPE, RequestCompression
+from kindwise.downloads import DEFAULT_DOWNLOAD_POLICY, DownloadPolicy, ImageDownloadError
+from kindwise.hedging import HedgingPolicy
+from kindwise.image_cache import EncodedImageCache
+from kindwise.image_encoding import (
+    EncoderSettings,
+    EncodingExecutor,
+    base64_passthrough,
+    encode_image_with_report,
+    map_file,
+)
+from kindwise.image_input import ImageBase64, ImageBytes, ImageInput, ImagePath, ImageUrl
+from kindwise.interning import StringTable
+from kindwise.json_backend import DEFAULT_JSON_BACKEND, JSONBackend
+from kindwise.model_parsing import ModelType, parse_lazy
+from kindwise.models import Conversation, Identification, SearchResult, UsageInfo, strip_heavy_fields
+from kindwise.rate_limit import RateLimiter
+from kindwise.request_body import JSONBody
+from kindwise.retry import RetryPolicy
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+IdentificationType = TypeVar('IdentificationType')
+KBType = TypeVar('KBType')
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100, keepalive_expiry=30.0)
+# RFC 9113 recommends servers to allow at least 100 concurrent streams per connection
+HTTP2_MAX_CONCURRENT_STREAMS = 100
+URL_SCHEMES = ('http://', 'https://')
+
+
+class KindwiseApi(abc.ABC, Generic[IdentificationType, KBType]):
+    identification_class = Identification
+    default_kb_type = None
+
+    def __init__(
+        self,
+        api_key: str,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        max_concurrent_requests: int | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedging: HedgingPolicy | None = None,
+        transport: httpx.BaseTransport | None = None,
+        client_factory: Callable[[], httpx.Client] | None = None,
+        compression: RequestCompression | None = None,
+        encoding_executor: EncodingExecutor | None = None,
+        image_cache: EncodedImageCache | None = None,
+        downloads: DownloadPolicy | None = None,
+        memory_map: bool = False,
+        json_backend: JSONBackend | None = None,
+        lean: bool = False,
+        lazy: bool = False,
+        string_table: StringTable | None = None,
+    ):
+        if transport is not None and client_factory is not None:
+            raise ValueError('Pass either transport or client_factory, the factory configures its own transport')
+        self.api_key = api_key
+        self.transport = transport
+        self.client_factory = client_factory
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.compression = compression
+        self.encoding_executor = encoding_executor
+        self.image_cache = image_cache
+        self.downloads = DownloadPolicy() if downloads is None else downloads
+        self._download_slots: dict[str, SyncSemaphore] = {}
+        self.memory_map = memory_map
+        self.json_backend = DEFAULT_JSON_BACKEND if json_backend is None else json_backend
+        # reporting jobs keeping many identifications do not need the echoed images and similar images
+        self.lean = lean
+        # hot paths often read only the top suggestion, lazy identifications parse fields on first access
+        self.lazy = lazy
+        # jobs keeping many identifications share repeated strings of responses
+        self.string_table = string_table
+        if encoding_executor is not None:
+            # a passed executor may be shared with other work, only max_workers images are submitted at once
+            self._encode_slots = SyncSemaphore(encoding_executor.max_workers)
+        self.limits = DEFAULT_LIMITS if limits is None else limits
+        if http2 and h2 is None:
+            warnings.warn('HTTP/2 requires the "h2" package (pip install httpx[http2]), falling back to HTTP/1.1')
+            http2 = False
+        # with HTTP/2 the pool negotiates protocol via ALPN and uses HTTP/1.1 for hosts which do not support HTTP/2
+        self.http2 = http2
+        if max_concurrent_requests is None and http2:
+            max_concurrent_requests = HTTP2_MAX_CONCURRENT_STREAMS
+        self.max_concurrent_requests = max_concurrent_requests
+        self._concurrency = (
+            contextlib.nullcontext() if max_concurrent_requests is None else SyncSemaphore(max_concurrent_requests)
+        )
+        self._client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        "Pooled http client shared by all calls (and threads) of this instance, created on first use"
+        client = self._client
+        if client is None or client.is_closed:
+            with self._client_lock:
+                if self._client is None or self._client.is_closed:
+                    self._client = self._create_client()
+                client = self._client
+        return client
+
+    def _create_client(self) -> httpx.Client:
+        if self.client_factory is not None:
+            return self.client_factory()
+        return httpx.Client(limits=self.limits, http2=self.http2, transport=self.transport)
+
+    def close(self):
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    @abc.abstractmethod
+    def identification_url(self):
+        "Url for identification endpoint"
+        ...
+
+    @property
+    @abc.abstractmethod
+    def usage_info_url(self):
+        "Url for usage info endpoint"
+        ...
+
+    @property
+    @abc.abstractmethod
+    def kb_api_url(self):
+        "Url for knowledge base endpoint"
+        ...
+
+    def feedback_url(self, token: str):
+        return f'{self.identification_url}/{token}/feedback'
+
+    def conversation_url(self, token: str):
+        return f'{self.identification_url}/{token}/conversation'
+
+    def conversation_feedback_url(self, token: str):
+        return f'{self.identification_url}/{token}/conversation/feedback'
+
+    def _make_api_call(self, url, method: str, data: dict | None = None, timeout: float = 60.0, credits: int = 0):
+        if self.rate_limiter is not None and credits:
+            delay = self.rate_limiter.reserve(credits)
+            if delay > 0:
+                SyncBackend.sleep(delay)
+        headers = {
+            'Content-Type': 'application/json',
+            'Api-Key': self.api_key,
+        }
+        # the body is serialized once and the same request is sent again by retries
+        body = None if data is None else JSONBody(data, json_backend=self.json_backend)
+        request, encoding = self._build_request(method, url, body, headers, timeout)
+        if method == 'GET' and self.hedging is not None:
+            response = self._send_hedged(request)
+        else:
+            response = self._send(request)
+        if encoding is not None and response.status_code == UNSUPPORTED_MEDIA_TYPE:
+            # the host does not accept the encoding, it is not used for the host anymore
+            self.compression.reject(request.url.host, encoding, response.headers.get('Accept-Encoding'))
+            request, encoding = self._build_request(method, url, body, headers, timeout)
+            response = self._send(request)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_from_headers(response.headers, response.status_code)
+        if response.is_error:
+            raise ValueError(f'Error while making an API call: {response.status_code=} {response.text=}')
+        return response
+
+    def _decode(self, response: httpx.Response) -> Any:
+        return self.json_backend.loads(response.content)
+
+    def _decode_identification(self, response: httpx.Response) -> dict:
+        data = self._decode(response)
+        if self.lean:
+            strip_heavy_fields(data)
+        return data if self.string_table is None else self.string_table.intern_tree(data)
+
+    def _parse(self, model: type[ModelType], data: dict) -> ModelType:
+        return parse_lazy(model, data) if self.lazy else model.from_dict(data)
+
+    def _build_request(
+        self, method: str, url: str, body: JSONBody | None, headers: dict, timeout: float
+    ) -> tuple[httpx.Request, str | None]:
+        "Returns the request and content encoding of its body, the body is streamed unless it is compressed"
+        if body is None:
+            return self.client.build_request(method, url, headers=headers, timeout=timeout), None
+        if self.compression is not None:
+            content, host = body.getvalue(), httpx.URL(url).host
+            # large bodies are compressed off the event loop, run_in_executor(None, ...) runs inline in the sync api
+            if len(content) >= OFFLOAD_SIZE:
+                content, encoding = SyncBackend.run_in_executor(None, self.compression.compress, host, content)
+            else:
+                content, encoding = self.compression.compress(host, content)
+            if encoding is not None:
+                headers = {**headers, 'Content-Encoding': encoding}
+            return self.client.build_request(method, url, content=content, headers=headers, timeout=timeout), encoding
+        headers = {**headers, **body.headers}  # known length, the body is not sent chunked
+        return self.client.build_request(method, url, content=body, headers=headers, timeout=timeout), None
+
+    def _send_hedged(self, request: httpx.Request) -> httpx.Response:
+        "Only for idempotent requests, they may be sent twice"
+        host = request.url.host
+        delay = self.hedging.hedge_delay(host)
+        started = time.monotonic()
+        if delay is None:
+            response, winner = self._send(request), 0
+        else:
+            winner, response = SyncBackend.hedge(lambda: self._send(request), delay, self.hedging.allow_hedge)
+        self.hedging.record(host, time.monotonic() - started, hedge_won=winner == 1)
+        return response
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            response = error = None
+            try:
+                with self._concurrency:
+                    response = self._send_once(request)
+            except Exception as exc:
+                error = exc
+            delay = None
+            if self.retry is not None:
+                delay = self.retry.next_delay(attempt, time.monotonic() - started, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            SyncBackend.sleep(delay)
+
+    def _send_once(self, request: httpx.Request) -> httpx.Response:
+        if self.circuit_breaker is None:
+            return self._send_limited(request)
+        with self.circuit_breaker.call(request.url.host) as call:
+            call.response = self._send_limited(request)
+        return call.response
+
+    def _send_limited(self, request: httpx.Request) -> httpx.Response:
+        if self.concurrency_limiter is None:
+            return self.client.send(request)
+        with self.concurrency_limiter.slot(request.url.host) as slot:
+            slot.response = self.client.send(request)
+        return slot.response
+
+    @staticmethod
+    def _download(client: httpx.Client, url: str, policy: DownloadPolicy) -> io.BytesIO:
+        buffer = io.BytesIO()
+        try:
+            with client.stream('GET', url, timeout=policy.timeout) as response:
+                if not response.is_success:
+                    raise ImageDownloadError(url, f'status code {response.status_code}')
+                if (content_length := response.headers.get('Content-Length')) is not None:
+                    policy.check_size(url, int(content_length))
+                for chunk in response.iter_bytes():
+                    policy.check_size(url, buffer.tell() + len(chunk))
+                    buffer.write(chunk)
+        except httpx.HTTPError as exc:
+            policy.record(None)
+            raise ImageDownloadError(url, f'{type(exc).__name__} {exc}') from exc
+        except ImageDownloadError:
+            policy.record(None)
+            raise
+        policy.record(buffer.tell())
+        buffer.seek(0)
+        return buffer
+
+    def _download_image(self, url: str) -> io.BytesIO:
+        "Downloads through the pooled client, at most max_per_host downloads from one host at once"
+        host = httpx.URL(url).host
+        slot = self._download_slots.get(host)
+        if slot is None:
+            with self._client_lock:
+                slot = self._download_slots.setdefault(host, SyncSemaphore(self.downloads.max_per_host))
+        with slot:
+            return self._download(self.client, url, self.downloads)
+
+    @staticmethod
+    def _load_image_buffer(
+        image: PurePath | str | bytes | BinaryIO | Image.Image | ImageInput, memory_map: bool = False
+    ) -> io.BytesIO | mmap.mmap:
+        if isinstance(image, ImagePath):
+            image = Path(image.path)
+        elif isinstance(image, ImageBytes):
+            return io.BytesIO(image.data)
+        elif isinstance(image, ImageBase64):
+            return io.BytesIO(base64.b64decode(image.data))
+        elif isinstance(image, ImageUrl):
+            image = image.url
+        if isinstance(image, str) and image.startswith(URL_SCHEMES):
+            with httpx.Client() as client:
+                return KindwiseApi._download(client, image, DEFAULT_DOWNLOAD_POLICY)
+        if isinstance(image, str) and len(image) <= 250:  # first try str as a path to a file
+            image = Path(image)
+        if isinstance(image, PurePath):  # Path
+            if memory_map:
+                return SyncBackend.run_in_executor(None, map_file, image)
+            return io.BytesIO(pathlib.Path(image).read_bytes())
+        if hasattr(image, 'read') and hasattr(image, 'seek') and hasattr(image, 'mode'):  # BinaryIO
+            if 'rb' not in image.mode:  # what will it do if this is not there
+                raise ValueError(f'Invalid file mode {image.mode=}, expected "rb"(binary mode)')
+            image.seek(0)
+            return io.BytesIO(image.read())
+        if isinstance(image, Image.Image):
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG')
+            return buffer
+        # str | bytes, base64 or raw bytes of the image
+        if len(image) % 4 == 0:
+            try:
+                # a single pass, raw image bytes fail on the first byte outside of the base64 alphabet
+                return io.BytesIO(base64.b64decode(image, validate=True))
+            except (binascii.Error, ValueError):
+                pass
+        sb_bytes = bytes(image, 'ascii') if isinstance(image, str) else image
+        return io.BytesIO(sb_bytes)
+
+    def _encode_image(
+        self,
+        image: PurePath | str | bytes | BinaryIO | Image.Image | ImageInput,
+        max_image_size: int | None,
+        encoder_settings: EncoderSettings | None = None,
+    ) -> str:
+        if isinstance(image, ImageBase64):
+            report = base64_passthrough(image.data, max_image_size, encoder_settings)
+            if report is not None:  # sent without decoding
+                if encoder_settings is not None and encoder_settings.on_encoded is not None:
+                    encoder_settings.on_encoded(report)
+                return image.data
+        if isinstance(image, ImageUrl):
+            image = image.url
+        if isinstance(image, str) and image.startswith(URL_SCHEMES):
+            buffer = self._download_image(image)
+        else:
+            buffer = self._load_image_buffer(image, self.memory_map)
+        if isinstance(buffer, mmap.mmap):
+            with buffer:  # unmapped once the image is encoded
+                return self._encode_data(buffer, max_image_size, encoder_settings)
+        data = buffer.getvalue()
+        buffer.close()
+        return self._encode_data(data, max_image_size, encoder_settings)
+
+    def _encode_data(
+        self, data: bytes | mmap.mmap, max_image_size: int | None, encoder_settings: EncoderSettings | None
+    ) -> str:
+        cache = self.image_cache
+        if cache is not None:
+            # hashing a large source image would block the event loop
+            key = SyncBackend.run_in_executor(None, cache.key, data, max_image_size, encoder_settings)
+            if (encoded := self._run_cache(cache.get, key)) is not None:
+                return encoded
+        on_encoded = None if encoder_settings is None else encoder_settings.on_encoded
+        if on_encoded is not None:  # the callback stays in this process
+            encoder_settings = dataclasses.replace(encoder_settings, on_encoded=None)
+        executor = self.encoding_executor
+        if executor is not None and executor.kind == 'process' and isinstance(data, mmap.mmap):
+            data = data[:]  # sent to the worker process as bytes
+        args = (encode_image_with_report, data, max_image_size, encoder_settings)
+        if executor is None:
+            encoded, report = SyncBackend.run_in_executor(None, *args)
+        else:
+            with executor.admit():
+                with self._encode_slots:
+                    encoded, report = SyncBackend.run_in_executor(executor.executor, *args)
+        if on_encoded is not None:
+            on_encoded(report)
+        if cache is not None:
+            self._run_cache(cache.put, key, encoded)
+        return encoded
+
+    def _run_cache(self, func, *args):
+        if self.image_cache.directory is None:
+            return func(*args)
+        # the disk tier does blocking file io
+        return SyncBackend.run_in_executor(None, func, *args)
+
+    def _build_payload(
+        self,
+        image: (
+            PurePath
+            | str
+            | bytes
+            | BinaryIO
+            | Image.Image
+            | ImageInput
+            | list[str | PurePath | bytes | BinaryIO | Image.Image | ImageInput]
+        ),
+        similar_images: bool = True,
+        latitude_longitude: tuple[float, float] = None,
+        custom_id: int | None = None,
+        date_time: datetime | str | float | None = None,
+        max_image_size: int | None = 1500,
+        encoder_settings: EncoderSettings | None = None,
+        extra_post_params: dict[str, Any] = None,
+        **kwargs,
+    ):
+        if not isinstance(image, list):
+            image = [image]
+
+        # images are loaded and encoded concurrently, the order is kept
+        images = SyncBackend.gather(
+            [functools.partial(self._encode_image, img, max_image_size, encoder_settings) for img in image]
+        )
+        payload = {
+            'images': images,
+            'similar_images': similar_images,
+        }
+        if latitude_longitude is not None:
+            payload['latitude'], payload['longitude'] = latitude_longitude
+        if custom_id is not None:
+            payload['custom_id'] = custom_id
+        if date_time is not None:
+            if isinstance(date_time, datetime):
+                payload['datetime'] = date_time.isoformat()
+            elif isinstance(date_time, str):
+                # check if ISO format is valid
+                payload['datetime'] = datetime.fromisoformat(date_time).isoformat()
+            elif isinstance(date_time, float):
+                payload['datetime'] = datetime.fromtimestamp(date_time).isoformat()
+            else:
+                raise ValueError(f'Invalid date_time format {date_time=} {type(date_time)=}')
+        if extra_post_params is not None:
+            if 'suggestion_filter' in extra_post_params and isinstance(extra_post_params['suggestion_filter'], str):
+                extra_post_params['suggestion_filter'] = {'classification': extra_post_params['suggestion_filter']}
+            payload.update(extra_post_params)
+        return payload
+
+    def identify(
+        self,
+        image: (
+            PurePath
+            | str
+            | bytes
+            | BinaryIO
+            | Image.Image
+            | ImageInput
+            | list[str | PurePath | bytes | BinaryIO | Image.Image | ImageInput]
+        ),
+        details: str | list[str] = None,
+        language: str | list[str] = None,
+        asynchronous: bool = False,
+        as_dict: bool = False,
+        similar_images: bool = True,
+        latitude_longitude: tuple[float, float] = None,
+        custom_id: int | None = None,
+        date_time: datetime | str | float | None = None,
+        max_image_size: int | None = 1500,
+        encoder_settings: EncoderSettings | None = None,
+        extra_get_params: str | dict[str | Any] = None,
+        extra_post_params: dict[str, Any] = None,
+        timeout: float = 60.0,
+        **kwargs,
+    ) -> IdentificationType | dict:
+        payload = self._build_payload(
+            image,
+            similar_images=similar_images,
+            latitude_longitude=latitude_longitude,
+            custom_id=custom_id,
+            date_time=date_time,
+            max_image_size=max_image_size,
+            encoder_settings=encoder_settings,
+            extra_post_params=extra_post_params,
+            **kwargs,
+        )
+        query = self._build_query(
+            details=details, language=language, asynchronous=asynchronous, extra_get_params=extra_get_params, **kwargs
+        )
+        url = f'{self.identification_url}{query}'
+        response = self._make_api_call(url, 'POST', payload, timeout=timeout, credits=1)
+        data = self._decode_identification(response)
+        return data if as_dict else self._parse(self.identification_class, data)
+
+    def _build_query(
+        self,
+        details: str | list[str] = None,
+        language: str | list[str] = None,
+        asynchronous: bool = False,
+        extra_get_params: str | dict[str, str] = None,
+        limit: int = None,
+        query: str = None,
+        **kwargs,
+    ):
+        if isinstance(details, str):
+            details = [details]
+        details_query = '' if details is None else f'details={",".join(details)}&'
+        if isinstance(language, str):
+            language = [language]
+        language_query = '' if language is None else f'language={",".join(language)}&'
+        if extra_get_params is None:
+            extra_get_params = ''
+        else:
+            if isinstance(extra_get_params, dict):
+                extra_get_params = '&'.join(f'{k}={v}' for k, v in extra_get_params.items())
+            if extra_get_params.startswith('?'):
+                extra_get_params = extra_get_params[1:] + '&'
+        async_query = 'async=true&' if asynchronous else ''
+        query = '' if query is None else f'q={query}&'
+        limit = '' if limit is None else f'limit={limit}&'
+        query = f'?{query}{limit}{details_query}{language_query}{async_query}{extra_get_params}'
+        if query.endswith('&'):
+            query = query[:-1]
+        return '' if query == '?' else query
+
+    def get_identification(
+        self,
+        token: str | int,
+        details: str | list[str] = None,
+        language: str | list[str] = None,
+        extra_get_params: str | dict[str, str] = None,
+        as_dict: bool = False,
+        timeout: float = 60.0,
+    ) -> IdentificationType | dict:
+        query = self._build_query(details=details, language=language, extra_get_params=extra_get_params)
+        url = f'{self.identification_url}/{token}{query}'
+        response = self._make_api_call(url, 'GET', timeout=timeout)
+        data = self._decode_identification(response)
+        return data if as_dict else self._parse(self.identification_class, data)
+
+    def delete_identification(
+        self,
+        identification: IdentificationType | str | int,
+        timeout: float = 60.0,
+    ) -> bool:
+        token = identification.access_token if isinstance(identification, Identification) else identification
+        url = f'{self.identification_url}/{token}'
+        self._make_api_call(url, 'DELETE', timeout=timeout)
+        return True
+
+    def usage_info(self, as_dict: bool = False, timeout: float = 60.0) -> UsageInfo | dict:
+        response = self._make_api_call(self.usage_info_url, 'GET', timeout=timeout)
+        data = self._decode(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_from_usage_info(UsageInfo.from_dict(data))
+        return data if as_dict else UsageInfo.from_dict(data)
+
+    def feedback(
+        self,
+        identification: IdentificationType | str | int,
+        comment: str | None = None,
+        rating: int | None = None,
+        timeout: float = 60.0,
+    ) -> bool:
+        token = identification.access_token if isinstance(identification, Identification) else identification
+        if comment is None and rating is None:
+            raise ValueError('Either comment or rating must be provided')
+        data = {}
+        if comment is not None:
+            data['comment'] = comment
+        if rating is not None:
+            data['rating'] = rating
+        self._make_api_call(self.feedback_url(token), 'POST', data, timeout=timeout)
+        return True
+
+    @property
+    @abc.abstractmethod
+    def views_path(self) -> Path:
+        ...
+
+    def available_details(self) -> list[dict[str, any]]:
+        with open(self.views_path) as f:
+            return json.load(f)
+
+    def search(
+        self,
+        query: str,
+        limit: int = None,
+        language: str = None,
+        kb_type: KBType | str = None,
+        as_dict=False,
+        timeout: float = 60.0,
+    ) -> SearchResult | dict:
+        if not query:
+            raise ValueError('Query parameter q must be provided')
+        if isinstance(limit, int) and limit < 1:
+            raise ValueError('Limit must be positive integer.')
+        if kb_type is None:
+            kb_type = self.default_kb_type
+        if isinstance(kb_type, enum.Enum):
+            kb_type = kb_type.value
+        url = f'{self.kb_api_url}/{kb_type}/name_search{self._build_query(query=query, limit=limit, language=language)}'
+        response = self._make_api_call(url, 'GET', timeout=timeout)
+        if not response.is_success:
+            raise ValueError(f'Error while searching knowledge base: {response.status_code=} {response.text=}')
+        return self._decode(response) if as_dict else SearchResult.from_dict(self._decode(response))
+
+    def get_kb_detail(
+        self,
+        access_token: str,
+        details: str | list[str],
+        language: str = None,
+        kb_type: KBType | str = None,
+        timeout: float = 60.0,
+    ) -> dict:
+        if kb_type is None:
+            kb_type = self.default_kb_type
+        if isinstance(kb_type, enum.Enum):
+            kb_type = kb_type.value
+        url = f'{self.kb_api_url}/{kb_type}/{access_token}{self._build_query(language=language, details=details)}'
+        response = self._make_api_call(url, 'GET', timeout=timeout)
+        if not response.is_success:
+            raise ValueError(f'Error while getting knowledge base detail: {response.status_code=} {response.text=}')
+        return self._decode(response)
+
+    def ask_question(
+        self,
+        identification: IdentificationType | str | int,
+        question: str,
+        model: str = None,
+        app_name: str = None,
+        prompt: str = None,
+        temperature: float = None,
+        as_dict: bool = False,
+        timeout: float = 60.0,
+    ) -> Conversation:
+        token = identification.access_token if isinstance(identification, Identification) else identification
+        data = {'question': question}
+        for key, value in [('model', model), ('app_name', app_name), ('prompt', prompt), ('temperature', temperature)]:
+            if value is not None:
+                data[key] = value
+        response = self._make_api_call(self.conversation_url(token), 'POST', data, timeout=timeout)
+        data = self._decode(response)
+        return data if as_dict else Conversation.from_dict(data)
+
+    def get_conversation(
+        self, identification: IdentificationType | str | int, timeout: float = 60.0
+    ) -> Conversation:
+        token = identification.access_token if isinstance(identification, Identification) else identification
+        response = self._make_api_call(self.conversation_url(token), 'GET', timeout=timeout)
+        return Conversation.from_dict(self._decode(response))
+
+    def delete_conversation(self, identification: IdentificationType | str | int, timeout: float = 60.0) -> bool:
+        token = identification.access_token if isinstance(identification, Identification) else identification
+        self._make_api_call(self.conversation_url(token), 'DELETE', timeout=timeout)
+        return True
+
+    def conversation_feedback(
+        self, identification: IdentificationType | str | int, feedback: str | int | dict, timeout: float = 60.0
+    ) -> bool:
+        token = identification.access_token if isinstance(identification, Identification) else identification
+        self._make_api_call(
+            self.conversation_feedback_url(token), 'POST', {'feedback': feedback}, timeout=timeout
+        )
+        return True
@@ -0,0 +1,51 @@
+import threading
+
+
+class ImageDownloadError(ValueError):
+    def __init__(self, url: str, reason: str):
+        self.url = url
+        self.reason = reason
+        super().__init__(f'Image download from {url} failed: {reason}')
+
+
+class DownloadPolicy:
+    '''
+    Limits of image downloads from urls passed as images.
+
+    Downloads go through the pooled client of the api, at most ``max_per_host`` at once to one host, and are streamed
+    so that a response over ``max_bytes`` is cut off as soon as it is known. ``timeout`` is the httpx timeout of a
+    download. Any failure raises ``ImageDownloadError``.
+
+    Attributes:
+        downloads: Number of successful downloads.
+        failures: Number of failed downloads.
+        bytes_downloaded: Size of the successfully downloaded images.
+    '''
+
+    def __init__(self, max_bytes: int = 50 * 1024 * 1024, timeout: float = 30.0, max_per_host: int = 8):
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.downloads = 0
+        self.failures = 0
+        self.bytes_downloaded = 0
+        self._lock = threading.Lock()
+
+    def check_size(self, url: str, size: int):
+        if size > self.max_bytes:
+            raise ImageDownloadError(url, f'image is larger than {self.max_bytes} bytes')
+
+    def record(self, size: int | None):
+        "Records a download, None for a failed one"
+        with self._lock:
+            if size is None:
+                self.failures += 1
+            else:
+                self.downloads += 1
+                self.bytes_downloaded += size
+
+    def stats(self) -> dict[str, int]:
+        return {'downloads': self.downloads, 'failures': self.failures, 'bytes_downloaded': self.bytes_downloaded}
+
+
+DEFAULT_DOWNLOAD_POLICY = DownloadPolicy()
@@ -0,0 +1,69 @@
+import threading
+
+from kindwise._latency import LatencyWindow
+
+
+class HedgingPolicy:
+    '''
+    Configuration and bookkeeping of hedged requests.
+
+    An idempotent request which has not been answered within the ``percentile`` of recent latencies of its host gets
+    a second, hedged, request and the first response wins. Hedges are limited to ``max_hedge_ratio`` of all hedgeable
+    requests and are not sent before ``min_samples`` latencies of the host are known.
+
+    Attributes:
+        requests: Number of requests which could be hedged.
+        hedges_sent: Number of hedged requests sent.
+        hedges_won: Number of hedged requests which answered before the original one.
+    '''
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_ratio: float = 0.05,
+        min_samples: int = 20,
+        min_delay: float = 0.0,
+        window: int = 100,
+    ):
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._latencies: dict[str, LatencyWindow] = {}
+        self._lock = threading.Lock()
+
+    def _window(self, host: str) -> LatencyWindow:
+        window = self._latencies.get(host)
+        if window is None:
+            window = self._latencies.setdefault(host, LatencyWindow(self.window))
+        return window
+
+    def hedge_delay(self, host: str) -> float | None:
+        "Counts a new hedgeable request and returns after how many seconds it should be hedged, None for never"
+        with self._lock:
+            self.requests += 1
+        window = self._window(host)
+        if len(window) < self.min_samples:
+            return None
+        return max(self.min_delay, window.percentile(self.percentile))
+
+    def allow_hedge(self) -> bool:
+        "Takes one hedge from the budget, returns False when the budget is exhausted"
+        with self._lock:
+            if self.hedges_sent + 1 > self.max_hedge_ratio * self.requests:
+                return False
+            self.hedges_sent += 1
+            return True
+
+    def record(self, host: str, latency: float, hedge_won: bool = False):
+        self._window(host).add(latency)
+        if hedge_won:
+            with self._lock:
+                self.hedges_won += 1
+
+    def stats(self) -> dict[str, int]:
+        return {'requests': self.requests, 'hedges_sent': self.hedges_sent, 'hedges_won': self.hedges_won}
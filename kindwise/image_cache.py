@@ -0,0 +1,157 @@
+import collections
+import dataclasses
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from kindwise.image_encoding import DEFAULT_ENCODER_SETTINGS, EncoderSettings
+
+# bump when encoding changes so that disk caches do not serve stale images
+CACHE_VERSION = 1
+
+
+class EncodedImageCache:
+    '''
+    LRU cache of base64 encoded images keyed by a hash of the source bytes and encoding parameters.
+
+    The memory tier holds at most ``max_bytes`` of encoded images. With ``directory`` evicted and new images are also
+    kept on disk, limited to ``max_disk_bytes`` when given, and survive restarts. ``on_encoded`` callbacks of encoder
+    settings are not called for images served from the cache.
+
+    Attributes:
+        hits: Lookups served from memory.
+        disk_hits: Lookups served from disk.
+        misses: Lookups which had to encode the image.
+        evictions: Images evicted from memory.
+        disk_size_bytes: Size of the images kept on disk.
+    '''
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        directory: Path | str | None = None,
+        max_disk_bytes: int | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else Path(directory)
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        self.disk_size_bytes = 0
+        self._entries: collections.OrderedDict[str, str] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.disk_size_bytes = sum(stat.st_size for stat, _ in self._scan_disk())
+
+    @staticmethod
+    def key(data: bytes, max_image_size: int | None, settings: EncoderSettings | None = None) -> str:
+        settings = DEFAULT_ENCODER_SETTINGS if settings is None else settings
+        params = [getattr(settings, f.name) for f in dataclasses.fields(settings) if f.compare]
+        digest = hashlib.blake2b(data, digest_size=16)
+        digest.update(repr((CACHE_VERSION, max_image_size, params)).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}.b64'
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return encoded
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                encoded = path.read_text('ascii')
+                os.utime(path)  # disk tier is LRU by modification time
+            except FileNotFoundError:
+                pass
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, encoded)
+                return encoded
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, encoded: str):
+        self._remember(key, encoded)
+        if self.directory is not None:
+            path = self._path(key)
+            path.parent.mkdir(exist_ok=True)
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            tmp = path.with_suffix(f'.{threading.get_ident()}.tmp')
+            tmp.write_text(encoded, 'ascii')
+            tmp.replace(path)  # readers never see partially written files
+            with self._lock:
+                self.disk_size_bytes += len(encoded) - replaced
+                over_budget = self.max_disk_bytes is not None and self.disk_size_bytes > self.max_disk_bytes
+            if over_budget:
+                self._trim_disk()
+
+    def _remember(self, key: str, encoded: str):
+        size = len(encoded)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = encoded
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+                self.evictions += 1
+
+    def _scan_disk(self) -> list[tuple[os.stat_result, Path]]:
+        files = []
+        for path in self.directory.glob('*/*.b64'):
+            try:
+                files.append((path.stat(), path))
+            except FileNotFoundError:  # trimmed by another thread
+                pass
+        return files
+
+    def _trim_disk(self):
+        # the running total is only an estimate when several caches share the directory, so it is resynced here
+        files = self._scan_disk()
+        total = sum(stat.st_size for stat, _ in files)
+        for stat, path in sorted(files, key=lambda item: item[0].st_mtime):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+        with self._lock:
+            self.disk_size_bytes = total
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+        if self.directory is not None:
+            for path in self.directory.glob('*/*.b64'):
+                path.unlink(missing_ok=True)
+            with self._lock:
+                self.disk_size_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size_bytes': self.size_bytes,
+            'entries': len(self._entries),
+        }
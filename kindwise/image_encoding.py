@@ -0,0 +1,327 @@
+'''
+CPU bound part of image encoding and the executor it runs in.
+'''
+
+import base64
+import binascii
+import concurrent.futures
+import contextlib
+import io
+import math
+import mmap
+import os
+from pathlib import PurePath
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# the API does not accept larger images
+MAX_PIXELS = 25_000_000
+EXIF_ORIENTATION = 0x0112
+# image headers, including EXIF, nearly always fit into the first 64 KiB
+HEADER_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ImageHeader:
+    "What is known about an image from its header, without decoding any pixels"
+
+    format: str | None
+    mode: str
+    width: int
+    height: int
+    orientation: int = 1
+
+    @classmethod
+    def from_image(cls, img: Image.Image) -> 'ImageHeader':
+        orientation = 1
+        if exif_bytes := img.info.get('exif'):  # getexif() would decode whole PNGs
+            exif = Image.Exif()
+            exif.load(exif_bytes)
+            orientation = exif.get(EXIF_ORIENTATION, 1)
+        return cls(format=img.format, mode=img.mode, width=img.width, height=img.height, orientation=orientation)
+
+    def is_compliant(self, max_image_size: int) -> bool:
+        "Upright RGB JPEG which fits into max_image_size can be sent as it is"
+        return (
+            self.format == 'JPEG'
+            and self.mode == 'RGB'
+            and self.orientation == 1
+            and max(self.width, self.height) <= max_image_size
+        )
+
+
+def target_size(width: int, height: int, max_image_size: int | None) -> tuple[int, int]:
+    if max_image_size is None or max(width, height) <= max_image_size:
+        return width, height
+    aspect_ratio = width / height
+    new_width = max_image_size if aspect_ratio >= 1 else int(max_image_size * aspect_ratio)
+    return new_width, int(new_width / aspect_ratio)
+
+
+@dataclass(frozen=True)
+class EncoderSettings:
+    '''
+    JPEG encoder parameters, ``subsampling`` takes Pillow values (0 for 4:4:4, 1 for 4:2:2, 2 for 4:2:0), None keeps
+    Pillow's default.
+
+    With ``max_payload_bytes`` the base64 encoded image has to fit into the budget: the highest quality between
+    ``min_quality`` and ``quality`` which fits is found by binary search, the image is downsized when even
+    ``min_quality`` does not fit. ``on_encoded`` is called with an ``EncodingReport`` of each image.
+    '''
+
+    quality: int = 75
+    progressive: bool = False
+    optimize: bool = False
+    subsampling: int | str | None = None
+    max_payload_bytes: int | None = None
+    min_quality: int = 30
+    on_encoded: Callable[['EncodingReport'], None] | None = field(default=None, compare=False, repr=False)
+
+    def save_params(self, quality: int) -> dict:
+        params = {'quality': quality, 'progressive': self.progressive, 'optimize': self.optimize}
+        if self.subsampling is not None:
+            params['subsampling'] = self.subsampling
+        return params
+
+    def fits(self, size: int) -> bool:
+        return self.max_payload_bytes is None or base64_size(size) <= self.max_payload_bytes
+
+    @property
+    def keeps_compliant_images(self) -> bool:
+        "Compliant images are sent as they are only with the default JPEG parameters, other ones re-encode them"
+        default = DEFAULT_ENCODER_SETTINGS
+        return self.save_params(self.quality) == default.save_params(default.quality)
+
+
+DEFAULT_ENCODER_SETTINGS = EncoderSettings()
+
+
+@dataclass(frozen=True)
+class EncodingReport:
+    "How an image was encoded, ``quality`` is None for images sent as they were"
+
+    attempts: int
+    quality: int | None
+    width: int
+    height: int
+    source_bytes: int
+    payload_bytes: int
+
+    @property
+    def passthrough(self) -> bool:
+        return self.attempts == 0
+
+
+def base64_size(size: int) -> int:
+    return 4 * ((size + 2) // 3)
+
+
+def base64_passthrough(
+    encoded: str, max_image_size: int | None, settings: EncoderSettings | None = None
+) -> EncodingReport | None:
+    '''
+    Report of a base64 encoded image which can be sent as it is, None when it has to be decoded and encoded. Only
+    the header is decoded.
+    '''
+    settings = DEFAULT_ENCODER_SETTINGS if settings is None else settings
+    if settings.max_payload_bytes is not None and len(encoded) > settings.max_payload_bytes:
+        return None
+    source_bytes = len(encoded) // 4 * 3 - encoded[-2:].count('=')
+    try:
+        header = ImageHeader.from_image(Image.open(io.BytesIO(base64.b64decode(encoded[: HEADER_BYTES // 3 * 4]))))
+    except (binascii.Error, OSError, SyntaxError):  # the header is not in the prefix or it is not an image
+        header = None
+    if header is None:
+        return EncodingReport(0, None, 0, 0, source_bytes, len(encoded)) if max_image_size is None else None
+    if header.width * header.height > MAX_PIXELS:  # encode_image raises
+        return None
+    if (max_image_size is None or header.is_compliant(max_image_size)) and settings.keeps_compliant_images:
+        return EncodingReport(0, None, header.width, header.height, source_bytes, len(encoded))
+    return None
+
+
+def _save_jpeg(img: Image.Image, settings: EncoderSettings, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', **settings.save_params(quality))
+    return buffer.getvalue()
+
+
+def _encode_within_budget(img: Image.Image, settings: EncoderSettings) -> tuple[bytes, int, int, Image.Image]:
+    "Returns the JPEG, its quality, number of encode attempts and the encoded (possibly downsized) image"
+    attempts = 0
+
+    def attempt(quality: int) -> bytes:
+        nonlocal attempts
+        attempts += 1
+        return _save_jpeg(img, settings, quality)
+
+    jpeg = attempt(settings.quality)  # most images fit with the configured quality
+    if settings.fits(len(jpeg)):
+        return jpeg, settings.quality, attempts, img
+    best, best_quality = attempt(settings.min_quality), settings.min_quality
+    if not settings.fits(len(best)):
+        # size is roughly proportional to the number of pixels, the image is downsized to just fit with min_quality
+        while not settings.fits(len(best)):
+            scale = math.sqrt(settings.max_payload_bytes * 3 / 4 / len(best)) * 0.95
+            size = (int(img.width * scale), int(img.height * scale))
+            if min(size) < 16:
+                raise ValueError(f'Image cannot be encoded into {settings.max_payload_bytes} bytes')
+            img = img.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            best = attempt(settings.min_quality)
+        return best, best_quality, attempts, img
+    # binary search of the highest quality which fits
+    low, high = settings.min_quality + 1, settings.quality - 1
+    while low <= high:
+        quality = (low + high) // 2
+        jpeg = attempt(quality)
+        if settings.fits(len(jpeg)):
+            best, best_quality, low = jpeg, quality, quality + 1
+        else:
+            high = quality - 1
+    return best, best_quality, attempts, img
+
+
+def map_file(path: PurePath) -> mmap.mmap | io.BytesIO:
+    "Read-only memory map of a file, pages are read from disk as they are accessed"
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:  # empty files cannot be mapped
+            return io.BytesIO()
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def encode_image(data: bytes | mmap.mmap, max_image_size: int | None, settings: EncoderSettings | None = None) -> str:
+    return encode_image_with_report(data, max_image_size, settings)[0]
+
+
+def encode_image_with_report(
+    data: bytes | mmap.mmap, max_image_size: int | None, settings: EncoderSettings | None = None
+) -> tuple[str, EncodingReport]:
+    '''
+    Downsizes the image to fit into max_image_size, converts it to upright RGB JPEG and returns it base64 encoded.
+    Images which already comply are returned byte for byte unless ``settings`` change the JPEG parameters or the image
+    does not fit into their payload budget. ``data`` may be a memory mapped file, it is then
+    decoded and base64 encoded without being copied into memory.
+    '''
+    settings = DEFAULT_ENCODER_SETTINGS if settings is None else settings
+
+    def passthrough(width: int = 0, height: int = 0) -> tuple[str, EncodingReport]:
+        encoded = base64.b64encode(data).decode('ascii')
+        return encoded, EncodingReport(0, None, width, height, len(data), len(encoded))
+
+    try:
+        if isinstance(data, mmap.mmap):
+            data.seek(0)
+        img = Image.open(data if isinstance(data, mmap.mmap) else io.BytesIO(data))  # reads only the header
+    except UnidentifiedImageError:
+        if max_image_size is None:  # sent as it is, the API validates it
+            return passthrough()
+        raise
+    header = ImageHeader.from_image(img)
+    width, height = target_size(header.width, header.height, max_image_size)
+    if width * height > MAX_PIXELS:
+        raise ValueError(
+            f'Image of {width}x{height} px exceeds the limit of {MAX_PIXELS // 1_000_000} Mpx, '
+            f'use max_image_size to downsize it'
+        )
+    compliant = max_image_size is None or header.is_compliant(max_image_size)
+    if compliant and settings.keeps_compliant_images and settings.fits(len(data)):
+        return passthrough(header.width, header.height)
+    if (width, height) == img.size:
+        resized_image = img
+    else:
+        # JPEGs are decoded in DCT domain at the smallest 1/2, 1/4 or 1/8 scale which is still not below the target
+        img.draft(img.mode, (width, height))
+        resized_image = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    if header.orientation != 1:  # the re-encoded JPEG has no EXIF to carry the orientation
+        resized_image = ImageOps.exif_transpose(resized_image)
+    if resized_image.mode != 'RGB':
+        resized_image = resized_image.convert('RGB')
+    if settings.max_payload_bytes is None:
+        jpeg, quality, attempts = _save_jpeg(resized_image, settings, settings.quality), settings.quality, 1
+    else:
+        jpeg, quality, attempts, resized_image = _encode_within_budget(resized_image, settings)
+    encoded = base64.b64encode(jpeg).decode('ascii')
+    report = EncodingReport(attempts, quality, resized_image.width, resized_image.height, len(data), len(encoded))
+    return encoded, report
+
+
+class EncodingQueueFull(RuntimeError):
+    def __init__(self, max_queued: int):
+        self.max_queued = max_queued
+        super().__init__(f'Image encoding queue is full, {max_queued} images are already waiting')
+
+
+class EncodingExecutor:
+    '''
+    Executor running decode, resize and JPEG encode of images.
+
+    At most ``max_workers`` images are encoded at once, defaults to the number of CPUs. Images over the limit wait,
+    when ``max_queued`` images are already waiting, encoding fails fast with ``EncodingQueueFull``. ``kind`` is
+    ``'thread'`` or ``'process'``, a process pool sidesteps the GIL for the parts of Pillow which hold it. An existing
+    ``concurrent.futures`` executor can be passed instead.
+
+    Attributes:
+        encoded: Number of images encoded.
+        rejected: Number of images rejected because the queue was full.
+    '''
+
+    def __init__(
+        self,
+        kind: str = 'thread',
+        max_workers: int | None = None,
+        max_queued: int | None = None,
+        executor: concurrent.futures.Executor | None = None,
+    ):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f'Invalid executor {kind=}, expected "thread" or "process"')
+        self.kind = kind
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_queued = max_queued
+        self.encoded = 0
+        self.rejected = 0
+        self._executor = executor
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> concurrent.futures.Executor:
+        "Pool created on first use unless an executor was passed"
+        with self._lock:
+            if self._executor is None:
+                if self.kind == 'process':
+                    self._executor = concurrent.futures.ProcessPoolExecutor(self.max_workers)
+                else:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        self.max_workers, thread_name_prefix='kindwise-encode'
+                    )
+            return self._executor
+
+    @property
+    def pending(self) -> int:
+        "Images being encoded or waiting for a worker"
+        return self._pending
+
+    @contextlib.contextmanager
+    def admit(self):
+        "Counts one image in for the duration of its encoding, raises EncodingQueueFull when the queue is full"
+        with self._lock:
+            if self.max_queued is not None and self._pending >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                raise EncodingQueueFull(self.max_queued)
+            self._pending += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pending -= 1
+        with self._lock:
+            self.encoded += 1
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
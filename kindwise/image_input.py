@@ -0,0 +1,33 @@
+'''
+Image inputs of a known kind, they skip guessing whether a str or bytes is a url, a path, base64 or raw bytes.
+'''
+
+from dataclasses import dataclass
+from pathlib import PurePath
+
+
+@dataclass(frozen=True)
+class ImagePath:
+    path: PurePath | str
+
+
+@dataclass(frozen=True)
+class ImageBytes:
+    "Raw bytes of an image file"
+
+    data: bytes
+
+
+@dataclass(frozen=True)
+class ImageBase64:
+    "Base64 encoded image file, sent without decoding when it needs no resizing"
+
+    data: str
+
+
+@dataclass(frozen=True)
+class ImageUrl:
+    url: str
+
+
+ImageInput = ImagePath | ImageBytes | ImageBase64 | ImageUrl
@@ -0,0 +1,78 @@
+import threading
+from typing import Any
+
+# values unique to each identification, interning them would only fill the table
+SKIP_KEYS = frozenset({'access_token', 'custom_id', 'images', 'datetime'})
+
+
+class StringTable:
+    '''
+    Bounded table of interned strings shared by parsed responses, equal strings of separate identifications (suggestion
+    ids and names, licenses, urls of similar images, model versions, details) then reference a single object.
+
+    Strings longer than ``max_length`` and values under ``skip_keys`` are kept as they are. Once the table holds
+    ``max_size`` strings new ones are not added until ``clear``.
+
+    Attributes:
+        hits: Strings replaced by an interned one.
+        misses: Strings added to the table.
+    '''
+
+    def __init__(self, max_size: int = 100_000, max_length: int = 256, skip_keys: frozenset[str] = SKIP_KEYS):
+        self.max_size = max_size
+        self.max_length = max_length
+        self.skip_keys = skip_keys
+        self.hits = 0
+        self.misses = 0
+        self._strings: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, value: str) -> str:
+        interned = self._strings.get(value)
+        if interned is not None:
+            with self._lock:
+                self.hits += 1
+            return interned
+        if len(value) > self.max_length or len(self._strings) >= self.max_size:
+            return value
+        with self._lock:
+            self.misses += 1
+            return self._strings.setdefault(value, value)
+
+    def intern_tree(self, data: Any) -> Any:
+        "Replaces strings in nested dicts and lists of a decoded response by interned ones, in place"
+        strings, skip_keys, max_length = self._strings, self.skip_keys, self.max_length
+        hits = misses = 0
+        stack = [data]
+        while stack:
+            container = stack.pop()
+            items = container.items() if isinstance(container, dict) else enumerate(container)
+            for key, value in items:
+                if key in skip_keys:
+                    continue
+                if type(value) is str:
+                    interned = strings.get(value)
+                    if interned is None:
+                        if len(value) > max_length or len(strings) >= self.max_size:
+                            continue
+                        misses += 1
+                        interned = strings.setdefault(value, value)
+                    else:
+                        hits += 1
+                    container[key] = interned
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._strings.clear()
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'strings': len(self._strings)}
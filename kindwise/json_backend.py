@@ -0,0 +1,48 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKENDS = ('json', 'orjson', 'msgspec')
+
+
+class JSONBackend:
+    '''
+    JSON library used for request bodies and responses, ``'json'`` (the standard library), ``'orjson'`` or
+    ``'msgspec'``. All of them serialize to compact UTF-8 bytes.
+    '''
+
+    def __init__(self, name: str = 'json'):
+        if name not in BACKENDS:
+            raise ValueError(f'Unsupported JSON backend {name=}, expected one of {", ".join(BACKENDS)}')
+        if not self.available(name):
+            raise ValueError(f'{name} JSON backend requires the "{name}" package (pip install {name})')
+        self.name = name
+        if name == 'orjson':
+            self.dumps, self.loads = orjson.dumps, orjson.loads
+        elif name == 'msgspec':
+            self.dumps, self.loads = msgspec.json.Encoder().encode, msgspec.json.Decoder().decode
+
+    @staticmethod
+    def available(name: str) -> bool:
+        return {'json': json, 'orjson': orjson, 'msgspec': msgspec}.get(name) is not None
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def __repr__(self):
+        return f'JSONBackend({self.name!r})'
+
+
+DEFAULT_JSON_BACKEND = JSONBackend()
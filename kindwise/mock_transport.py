@@ -0,0 +1,207 @@
+'''
+In-process transport serving canned Kindwise responses, usable with both sync and async clients.
+'''
+
+import io
+import itertools
+import re
+import threading
+import time
+from typing import Callable
+
+import anyio
+import httpx
+from PIL import Image
+
+API_PATH = re.compile(r'^/api/v\d+/')
+
+
+def identification_response(
+    access_token: str = 'mock', images: int = 1, suggestions: int = 10, similar_images: int = 2
+) -> dict:
+    "Identification which parses as plant, health assessment, crop health, insect and mushroom identification"
+
+    def classification(prefix: str) -> dict:
+        return {
+            'suggestions': [
+                {
+                    'id': f'{prefix}-{i}',
+                    'name': f'{prefix.capitalize()}us number{i}',
+                    'scientific_name': f'{prefix.capitalize()}us number{i}',
+                    'probability': 1 / (i + 2),
+                    'similar_images': [
+                        {
+                            'id': f'image-{i}-{j}',
+                            'url': f'https://plant.id/media/images/{i}-{j}.jpg',
+                            'url_small': f'https://plant.id/media/images/{i}-{j}.small.jpg',
+                            'similarity': 0.5,
+                            'license_name': 'CC BY-SA 4.0',
+                            'license_url': 'https://creativecommons.org/licenses/by-sa/4.0/',
+                            'citation': 'Kindwise',
+                        }
+                        for j in range(similar_images)
+                    ],
+                    'details': {'language': 'en', 'entity_id': f'{prefix}-{i}'},
+                }
+                for i in range(suggestions)
+            ]
+        }
+
+    return {
+        'access_token': access_token,
+        'model_version': 'mock:1.0.0',
+        'custom_id': None,
+        'input': {
+            'images': [f'https://plant.id/media/imgs/{i}.jpg' for i in range(images)],
+            'datetime': '2024-01-01T00:00:00+00:00',
+            'latitude': None,
+            'longitude': None,
+            'similar_images': True,
+        },
+        'result': {
+            'is_plant': {'probability': 0.99, 'binary': True, 'threshold': 0.5},
+            'is_healthy': {'probability': 0.2, 'binary': False, 'threshold': 0.525},
+            'is_insect': {'probability': 0.99, 'binary': True, 'threshold': 0.5},
+            'is_mushroom': {'probability': 0.99, 'binary': True, 'threshold': 0.5},
+            'classification': classification('plant'),
+            'crop': classification('crop'),
+            'disease': classification('disease'),
+        },
+        'status': 'COMPLETED',
+        'sla_compliant_client': True,
+        'sla_compliant_system': True,
+        'created': 1704067200.0,
+        'completed': 1704067200.5,
+    }
+
+
+def usage_info_response() -> dict:
+    return {
+        'active': True,
+        'credit_limits': {'day': None, 'week': None, 'month': None, 'total': 1000000},
+        'used': {'day': 0, 'week': 0, 'month': 0, 'total': 0},
+        'can_use_credits': {'value': True, 'reason': None},
+        'remaining': {'day': None, 'week': None, 'month': None, 'total': 1000000},
+    }
+
+
+def search_response(query: str, limit: int = 10) -> dict:
+    return {
+        'entities': [
+            {
+                'matched_in': query,
+                'matched_in_type': 'entity_name',
+                'access_token': f'entity-{i}',
+                'match_position': 0,
+                'match_length': len(query),
+                'entity_name': query,
+            }
+            for i in range(limit)
+        ],
+        'entities_trimmed': False,
+        'limit': limit,
+    }
+
+
+def conversation_response(access_token: str) -> dict:
+    return {
+        'messages': [
+            {'content': 'Is it edible?', 'type': 'question', 'created': '2024-01-01T00:00:00+00:00'},
+            {'content': 'Yes', 'type': 'answer', 'created': '2024-01-01T00:00:01+00:00'},
+        ],
+        'identification': access_token,
+        'remaining_calls': 19,
+        'model_parameters': {'model': 'mock'},
+        'feedback': {},
+    }
+
+
+def jpeg_image(size: tuple[int, int] = (800, 600)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (34, 139, 34)).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+class KindwiseMockTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    '''
+    Answers every Kindwise API endpoint with a canned response after a simulated latency, any other url is served as
+    an image download. `latency` is either seconds or a callable returning them (e.g. random.expovariate).
+    '''
+
+    def __init__(
+        self,
+        latency: float | Callable[[], float] = 0.0,
+        suggestions: int = 10,
+        similar_images: int = 2,
+        image_size: tuple[int, int] = (800, 600),
+    ):
+        self.latency = latency
+        self.suggestions = suggestions
+        self.similar_images = similar_images
+        self.image_size = image_size
+        self._image = None
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _latency(self) -> float:
+        return self.latency() if callable(self.latency) else self.latency
+
+    @property
+    def image(self) -> bytes:
+        "JPEG served for non-API urls"
+        if self._image is None:
+            self._image = jpeg_image(self.image_size)
+        return self._image
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests += 1
+        path, method = request.url.path, request.method
+        if not API_PATH.match(path):
+            if method != 'GET':
+                return httpx.Response(405)
+            return httpx.Response(200, content=self.image, headers={'Content-Type': 'image/jpeg'})
+        parts = API_PATH.sub('', path).strip('/').split('/')
+        endpoint, rest = parts[0], parts[1:]
+        if endpoint == 'usage_info' and method == 'GET':
+            return httpx.Response(200, json=usage_info_response())
+        if endpoint == 'kb' and method == 'GET' and len(rest) == 2:
+            if rest[1] == 'name_search':
+                limit = int(request.url.params.get('limit', 10))
+                return httpx.Response(200, json=search_response(request.url.params.get('q', ''), limit))
+            return httpx.Response(200, json={'access_token': rest[1], 'name': 'Mockus mockus', 'language': 'en'})
+        if endpoint not in ('identification', 'health_assessment'):
+            return httpx.Response(404, json={'detail': 'Not found'})
+        if not rest:
+            if method != 'POST':
+                return httpx.Response(405)
+            token = f'mock-{next(self._tokens)}'
+            return httpx.Response(201, json=self._identification(token))
+        token, action = rest[0], '/'.join(rest[1:])
+        if method == 'DELETE':
+            return httpx.Response(200, json=True)
+        if action == 'feedback' or action == 'conversation/feedback':
+            return httpx.Response(200, json=True)
+        if action == 'conversation':
+            return httpx.Response(200, json=conversation_response(token))
+        if action == '' and method == 'GET':
+            return httpx.Response(200, json=self._identification(token))
+        return httpx.Response(404, json={'detail': 'Not found'})
+
+    def _identification(self, token: str) -> dict:
+        return identification_response(token, suggestions=self.suggestions, similar_images=self.similar_images)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        delay = self._latency()
+        if delay > 0:
+            time.sleep(delay)
+        return self.respond(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        delay = self._latency()
+        if delay > 0:
+            await anyio.sleep(delay)
+        return self.respond(request)
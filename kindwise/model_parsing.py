@@ -0,0 +1,298 @@
+'''
+Parsing of result models driven by their dataclass field annotations.
+
+A field is read from the key of the same name and converted according to its annotation: nested models, lists of
+them, enums and datetimes (timestamps or ISO strings) are built, other values are taken as they are. A converter under
+the ``convert`` key of the field metadata replaces the one of the annotation. A missing key gives the field default,
+None for optional fields and KeyError otherwise.
+
+Models derive from ``Model`` whose ``from_dict`` is compiled from this schema per class on first use, ``parse_lazy``
+defers the same conversions to the first access of each field.
+'''
+
+import dataclasses
+import enum
+import threading
+import types
+import typing
+from datetime import datetime
+from typing import Any, Callable, TypeVar
+
+ModelType = TypeVar('ModelType')
+MISSING = dataclasses.MISSING
+_lock = threading.Lock()
+
+
+def parse_datetime(value: int | float | str) -> datetime:
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def parse_naive_datetime(value: str) -> datetime:
+    "ISO string with the UTC designator dropped"
+    return datetime.fromisoformat(value.replace('Z', ''))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FieldSpec:
+    name: str
+    convert: Callable[[Any], Any] | None
+    optional: bool
+    default: Any = MISSING
+    default_factory: Callable[[], Any] | None = None
+
+    def missing(self) -> Any:
+        if self.default is not MISSING:
+            return self.default
+        if self.default_factory is not None:
+            return self.default_factory()
+        if self.optional:
+            return None
+        raise KeyError(self.name)
+
+
+def _is_optional(annotation) -> bool:
+    union = typing.get_origin(annotation) in (types.UnionType, typing.Union)
+    return union and type(None) in typing.get_args(annotation)
+
+
+def _unwrap_optional(annotation):
+    if _is_optional(annotation):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _skip_none(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else convert(value)
+
+
+def _is_model(annotation) -> bool:
+    return isinstance(annotation, type) and dataclasses.is_dataclass(annotation) and hasattr(annotation, 'from_dict')
+
+
+def converter(annotation, model: Callable[[type], Callable[[dict], Any]]) -> Callable[[Any], Any] | None:
+    "Conversion of a raw value to annotation, None when the value is taken as it is, ``model`` gives parsers of models"
+    origin = typing.get_origin(annotation)
+    if origin in (types.UnionType, typing.Union):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        convert = converter(args[0], model) if len(args) == 1 else None
+        return None if convert is None else _skip_none(convert)
+    if origin is list:
+        (item,) = typing.get_args(annotation) or (Any,)
+        convert = converter(item, model)
+        return None if convert is None else (lambda values: [convert(value) for value in values])
+    if _is_model(annotation):
+        return model(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return annotation
+    if annotation is datetime:
+        return parse_datetime
+    return None
+
+
+def field_specs(cls: type, model: Callable[[type], Callable[[dict], Any]]) -> list[FieldSpec]:
+    hints = typing.get_type_hints(cls)
+    specs = []
+    for field in dataclasses.fields(cls):
+        annotation = hints[field.name]
+        default_factory = None if field.default_factory is MISSING else field.default_factory
+        convert = field.metadata.get('convert')
+        if convert is None:
+            convert = converter(annotation, model)
+        elif _is_optional(annotation):
+            convert = _skip_none(convert)
+        specs.append(FieldSpec(field.name, convert, _is_optional(annotation), field.default, default_factory))
+    return specs
+
+
+_parsers: dict[type, Callable[[dict], Any]] = {}
+
+
+def compile_parser(cls: type[ModelType]) -> Callable[[dict], ModelType]:
+    '''
+    ``from_dict`` of the model ``cls`` generated from its field specs. Nested parsers and converters are bound as
+    globals of the generated function, so a call only does the dict lookups and conversions of the fields.
+    '''
+    parser = _parsers.get(cls)
+    if parser is not None:
+        return parser
+    hints = typing.get_type_hints(cls)
+    namespace = {'_cls': cls, '_MISSING': MISSING}
+    lines = []
+    specs = field_specs(cls, compile_parser)
+    for index, (spec, field) in enumerate(zip(specs, dataclasses.fields(cls))):
+        key, value = repr(spec.name), f'_{index}'
+        annotation = field.metadata.get('convert') or _unwrap_optional(hints[spec.name])
+        has_default = spec.default is not MISSING or spec.default_factory is not None
+        if not has_default and not spec.optional:  # required, a missing key raises KeyError
+            convert = _convert_source(annotation, f'data[{key}]', f'_convert{index}', namespace)
+            lines.append(f'{value} = {convert or f"data[{key}]"}')
+            continue
+        convert = _convert_source(annotation, value, f'_convert{index}', namespace)
+        if not has_default:
+            lines.append(f'{value} = data.get({key})')
+            if convert is not None:
+                lines.append(f'if {value} is not None: {value} = {convert}')
+        elif spec.default is not MISSING and convert is None:
+            namespace[f'_default{index}'] = spec.default
+            lines.append(f'{value} = data.get({key}, _default{index})')
+        else:
+            namespace[f'_default{index}'] = spec.default if spec.default is not MISSING else spec.default_factory
+            default = f'_default{index}' if spec.default is not MISSING else f'_default{index}()'
+            if spec.optional and convert is not None:
+                convert = f'None if {value} is None else {convert}'
+            lines.append(f'{value} = data.get({key}, _MISSING)')
+            lines.append(f'{value} = {default} if {value} is _MISSING else {convert or value}')
+    arguments = ', '.join(f'_{index}' for index in range(len(specs)))
+    body = ''.join(f'    {line}\n' for line in lines)
+    source = f'def from_dict(data):\n{body}    return _cls({arguments})\n'
+    exec(compile(source, f'<from_dict of {cls.__qualname__}>', 'exec'), namespace)
+    parser = namespace['from_dict']
+    parser.__qualname__ = f'{cls.__qualname__}.from_dict'
+    with _lock:
+        return _parsers.setdefault(cls, parser)
+
+
+def _convert_source(annotation, value: str, name: str, namespace: dict) -> str | None:
+    '''
+    Expression converting ``value`` to the non optional annotation, None when it is taken as it is. Lists are built
+    inline and enum members are looked up by value before falling back to the enum call. A plain function, converter
+    from the field metadata, is called.
+    '''
+    if isinstance(annotation, types.FunctionType):
+        namespace[name] = annotation
+        return f'{name}({value})'
+    if typing.get_origin(annotation) is list:
+        (item,) = typing.get_args(annotation) or (Any,)
+        convert = converter(item, compile_parser)
+        if convert is None:
+            return None
+        namespace[name] = convert
+        return f'[{name}(item) for item in {value}]'
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        namespace[name], namespace[f'{name}_members'] = annotation, annotation._value2member_map_
+        return f'({name}_members.get({value}) or {name}({value}))'
+    convert = converter(annotation, compile_parser)
+    if convert is None:
+        return None
+    namespace[name] = convert
+    return f'{name}({value})'
+
+
+class _FromDict:
+    "Class attribute giving the compiled parser of the class it is read from"
+
+    def __get__(self, instance, owner=None):
+        return compile_parser(owner if owner is not None else type(instance))
+
+
+class Model:
+    '''
+    Base of the result models, ``Model.from_dict(data)`` builds the model from a response dict according to its field
+    annotations.
+    '''
+
+    __slots__ = ()
+
+    from_dict = _FromDict()
+
+
+class _LazyField:
+    "Reads the field from the raw dict on first access and stores it into the slot of the model"
+
+    __slots__ = ('spec', 'slot', 'bit')
+
+    def __init__(self, spec: FieldSpec, slot, bit: int):
+        self.spec = spec
+        self.slot = slot
+        self.bit = bit
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if instance._parsed & self.bit:
+            return self.slot.__get__(instance, owner)
+        spec = self.spec
+        raw = instance._raw
+        if spec.name in raw:
+            value = raw[spec.name]
+            if spec.convert is not None:
+                value = spec.convert(value)
+        else:
+            value = spec.missing()
+        self.slot.__set__(instance, value)
+        instance._parsed |= self.bit
+        return value
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+        instance._parsed |= self.bit
+
+
+_lazy_classes: dict[type, type] = {}
+
+
+def _slot(cls: type, name: str):
+    for klass in cls.__mro__:
+        if isinstance(klass.__dict__.get(name), types.MemberDescriptorType):
+            return klass.__dict__[name]
+    raise TypeError(f'{cls.__qualname__} has no slot {name}, lazy models have to be slotted dataclasses')
+
+
+def _lazy_class(cls: type) -> type:
+    lazy_class = _lazy_classes.get(cls)
+    if lazy_class is not None:
+        return lazy_class
+    names = tuple(field.name for field in dataclasses.fields(cls))
+    parsed = (1 << len(names)) - 1
+
+    def __init__(self, *args, **kwargs):
+        # constructed directly, e.g. by dataclasses.replace, all fields are given
+        self._raw = {}
+        self._parsed = parsed
+        cls.__init__(self, *args, **kwargs)
+
+    def __eq__(self, other):
+        if type(other) is not cls and type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in names)
+
+    def __reduce__(self):
+        return cls, tuple(getattr(self, name) for name in names)  # pickled as the plain model
+
+    namespace = {
+        '__slots__': ('_raw', '_parsed'),  # the dict and a bit mask of parsed fields
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        '__init__': __init__,
+        '__eq__': __eq__,
+        '__reduce__': __reduce__,
+    }
+    for index, spec in enumerate(field_specs(cls, _lazy_parser)):
+        namespace[spec.name] = _LazyField(spec, _slot(cls, spec.name), 1 << index)
+    with _lock:
+        return _lazy_classes.setdefault(cls, type(cls.__name__, (cls,), namespace))
+
+
+def _lazy_parser(cls: type[ModelType]) -> Callable[[dict], ModelType]:
+    lazy_class = _lazy_class(cls)
+    new = object.__new__
+
+    def parse(data: dict) -> ModelType:
+        instance = new(lazy_class)
+        instance._raw = data
+        instance._parsed = 0
+        return instance
+
+    return parse
+
+
+def parse_lazy(cls: type[ModelType], data: dict) -> ModelType:
+    '''
+    Instance of the model ``cls`` which keeps the raw dict and parses each field, including nested models, on first
+    access. It is an instance of ``cls`` with the same attributes and types.
+    '''
+    return _lazy_parser(cls)(data)
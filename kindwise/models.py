@@ -1,10 +1,12 @@
 import enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
+from kindwise.model_parsing import Model, parse_naive_datetime
 
-@dataclass
-class SimilarImage:
+
+@dataclass(slots=True)
+class SimilarImage(Model):
     id: str
     url: str
     similarity: float
@@ -13,86 +15,35 @@ class SimilarImage:
     license_url: str | None = None
     citation: str | None = None
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'SimilarImage':
-        return cls(
-            id=data['id'],
-            url=data['url'],
-            similarity=data['similarity'],
-            url_small=data['url_small'],
-            license_name=data.get('license_name'),
-            license_url=data.get('license_url'),
-            citation=data.get('citation'),
-        )
-
-
-@dataclass
-class Suggestion:
+
+@dataclass(slots=True)
+class Suggestion(Model):
     id: str
     name: str
     probability: float
     similar_images: list[SimilarImage] | None = None
     details: dict | None = None
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Suggestion':
-        return cls(
-            id=data['id'],
-            name=data['name'],
-            probability=data['probability'],
-            similar_images=None
-            if data.get('similar_images') is None
-            else [SimilarImage.from_dict(similar_image) for similar_image in data['similar_images']],
-            details=data.get('details'),
-        )
-
 
-@dataclass
+@dataclass(slots=True)
 class SuggestionWithScientificName(Suggestion):
     scientific_name: str | None = None
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'SuggestionWithScientificName':
-        return cls(
-            id=data['id'],
-            name=data['name'],
-            probability=data['probability'],
-            similar_images=None
-            if data.get('similar_images') is None
-            else [SimilarImage.from_dict(similar_image) for similar_image in data['similar_images']],
-            details=data.get('details'),
-            scientific_name=data.get('scientific_name'),
-        )
-
-
-@dataclass
-class Classification:
-    suggestions: list[Suggestion]
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Classification':
-        return cls(suggestions=[Suggestion.from_dict(suggestion) for suggestion in data['suggestions']])
+@dataclass(slots=True)
+class Classification(Model):
+    suggestions: list[Suggestion]
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassificationWithScientificName(Classification):
     suggestions: list[SuggestionWithScientificName]
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'ClassificationWithScientificName':
-        return cls(
-            suggestions=[SuggestionWithScientificName.from_dict(suggestion) for suggestion in data['suggestions']]
-        )
 
-
-@dataclass
-class Result:
+@dataclass(slots=True)
+class Result(Model):
     classification: Classification
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Result':
-        return cls(classification=Classification.from_dict(data['classification']))
-
 
 class ClassificationLevel(str, enum.Enum):
     ALL = 'all'
@@ -100,36 +51,19 @@ class ClassificationLevel(str, enum.Enum):
     SPECIES = 'species'
 
 
-@dataclass
-class Input:
+@dataclass(slots=True)
+class Input(Model):
     images: list[str]
     datetime: datetime
     latitude: float | None
     longitude: float | None
     similar_images: bool
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Input':
-        return cls(
-            images=data['images'],
-            datetime=datetime.fromisoformat(data['datetime']),
-            latitude=data['latitude'],
-            longitude=data['longitude'],
-            similar_images=data['similar_images'],
-        )
-
-
-@dataclass
-class Feedback:
-    rating: int
-    comment: str
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Feedback':
-        return cls(
-            rating=data.get('rating'),
-            comment=data.get('comment'),
-        )
+@dataclass(slots=True)
+class Feedback(Model):
+    rating: int | None
+    comment: str | None
 
 
 class IdentificationStatus(str, enum.Enum):
@@ -139,8 +73,8 @@ class IdentificationStatus(str, enum.Enum):
     FAILED = 'FAILED'
 
 
-@dataclass
-class Identification:
+@dataclass(slots=True)
+class Identification(Model):
     access_token: str
     model_version: str
     custom_id: str | None
@@ -153,159 +87,85 @@ class Identification:
     completed: datetime | None
     feedback: Feedback | None
 
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Identification':
-        return cls(
-            access_token=data['access_token'],
-            model_version=data['model_version'],
-            custom_id=data['custom_id'],
-            input=Input.from_dict(data['input']),
-            result=None if 'result' not in data else cls.get_result_class().from_dict(data['result']),
-            status=IdentificationStatus(data['status']),
-            sla_compliant_client=data['sla_compliant_client'],
-            sla_compliant_system=data['sla_compliant_system'],
-            created=datetime.fromtimestamp(data['created']),
-            completed=None if data['completed'] is None else datetime.fromtimestamp(data['completed']),
-            feedback=Feedback.from_dict(data['feedback']) if 'feedback' in data else None,
-        )
-
-    @classmethod
-    def get_result_class(cls):
-        return Result
-
-
-@dataclass
-class ResultEvaluation:
+
+def strip_heavy_fields(data: dict) -> dict:
+    "Drops echoed input images and similar images of suggestions from an identification response, in place"
+    if isinstance(data.get('input'), dict):
+        data['input']['images'] = []
+    stack = [data.get('result')]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if 'similar_images' in value:
+                value['similar_images'] = None
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return data
+
+
+@dataclass(slots=True)
+class ResultEvaluation(Model):
     probability: float
     binary: bool
     threshold: float
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            probability=data['probability'],
-            binary=data['binary'],
-            threshold=data['threshold'],
-        )
-
 
-@dataclass
-class Limits:
+@dataclass(slots=True)
+class Limits(Model):
     day: int | None
     week: int | None
     month: int | None
     total: int | None
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            day=data['day'],
-            week=data['week'],
-            month=data['month'],
-            total=data['total'],
-        )
-
 
-@dataclass
-class CanUseCredits:
+@dataclass(slots=True)
+class CanUseCredits(Model):
     value: bool
     reason: str | None
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            value=data['value'],
-            reason=data['reason'],
-        )
 
-
-@dataclass
-class UsageInfo:
+@dataclass(slots=True)
+class UsageInfo(Model):
     active: bool
     credit_limits: Limits
     used: Limits
     can_use_credits: CanUseCredits
     remaining: Limits
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            active=data['active'],
-            credit_limits=Limits.from_dict(data['credit_limits']),
-            used=Limits.from_dict(data['used']),
-            can_use_credits=CanUseCredits.from_dict(data['can_use_credits']),
-            remaining=Limits.from_dict(data['remaining']),
-        )
-
 
-@dataclass
-class SearchEntity:
+@dataclass(slots=True)
+class SearchEntity(Model):
     matched_in: str
     matched_in_type: str
     access_token: str
     match_position: int
     match_length: int
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            matched_in=data['matched_in'],
-            matched_in_type=data['matched_in_type'],
-            access_token=data['access_token'],
-            match_position=data['match_position'],
-            match_length=data['match_length'],
-        )
 
-
-@dataclass
-class SearchResult:
+@dataclass(slots=True)
+class SearchResult(Model):
     entities: list[SearchEntity]
     entities_trimmed: bool
     limit: int
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        return cls(
-            entities=[SearchEntity.from_dict(entity) for entity in data['entities']],
-            entities_trimmed=data['entities_trimmed'],
-            limit=data['limit'],
-        )
-
 
 class MessageType(str, enum.Enum):
     ANSWER = 'answer'
     QUESTION = 'question'
 
 
-@dataclass
-class Message:
+@dataclass(slots=True)
+class Message(Model):
     content: str
     type: MessageType
-    created: datetime
-
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Message':
-        return cls(
-            content=data['content'],
-            type=MessageType(data['type']),
-            created=datetime.fromisoformat(data['created'].replace('Z', '')),
-        )
+    created: datetime = field(metadata={'convert': parse_naive_datetime})
 
 
-@dataclass
-class Conversation:
+@dataclass(slots=True)
+class Conversation(Model):
     messages: list[Message]
     identification: str
     remaining_calls: int
     model_parameters: dict
-    feedback: dict
-
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Conversation':
-        return cls(
-            messages=[Message.from_dict(message) for message in data['messages']],
-            identification=data['identification'],
-            remaining_calls=data['remaining_calls'],
-            model_parameters=data['model_parameters'],
-            feedback=data.get('feedback', {}),
-        )
+    feedback: dict = field(default_factory=dict)
@@ -0,0 +1,192 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from kindwise.models import UsageInfo
+
+REMAINING_HEADERS = ('RateLimit-Remaining', 'X-RateLimit-Remaining')
+RESET_HEADERS = ('RateLimit-Reset', 'X-RateLimit-Reset')
+# reset values above this are epoch timestamps rather than seconds from now (some servers send X-RateLimit-Reset so)
+EPOCH_RESET_THRESHOLD = 1e6
+
+
+def _period_ends(now: datetime) -> dict[str, datetime]:
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    week = day + timedelta(days=(7 - day.weekday()) % 7)
+    month = (now.replace(day=28, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=4)).replace(day=1)
+    return {'day': day, 'week': week, 'month': month}
+
+
+class RateLimiter:
+    '''
+    Token bucket pacing the credit consuming calls of one or more api instances.
+
+    The bucket holds up to ``capacity`` tokens and is refilled by ``rate`` tokens per second. A call reserves its
+    tokens under a short lock and sleeps outside of it, so many coroutines and threads can share one limiter.
+    Reservations can make the bucket negative, following calls then wait until the debt is refilled.
+
+    The limiter can be seeded from ``usage_info`` (remaining credits are spread over the rest of the day, week and
+    month, periods are assumed to end at UTC calendar boundaries) and from rate limit headers of responses. The rate
+    of each source is kept and the tighter one is applied, so headers do not speed up pacing set from usage info.
+    '''
+
+    def __init__(self, rate: float, capacity: float | None = None, budget: float | None = None):
+        '''
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximal burst, defaults to one second worth of tokens (at least 1).
+            budget: Total number of tokens which may be consumed, e.g. remaining credits, None for unlimited.
+        '''
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._usage_rate = float('inf')
+        self._header_rate = float('inf')
+        self._capacity = max(1.0, rate) if capacity is None else capacity
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.budget = budget
+        self.consumed = 0.0
+        self._started = self._updated
+
+    @classmethod
+    def from_usage_info(cls, usage_info: UsageInfo, capacity: float | None = None) -> 'RateLimiter':
+        limiter = cls(rate=float('inf'), capacity=capacity)
+        limiter.update_from_usage_info(usage_info)
+        return limiter
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    @property
+    def tokens(self) -> float:
+        "Currently available tokens, negative when the bucket is in debt"
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            if self._rate == float('inf'):
+                self._tokens = self._capacity
+            else:
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        '''
+        Takes ``tokens`` from the bucket and returns how many seconds the caller has to wait before using them.
+        '''
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            self.consumed += tokens
+            if self.budget is not None:
+                self.budget -= tokens
+            wait = 0.0 if self._tokens >= 0 or self._rate == float('inf') else -self._tokens / self._rate
+            return max(wait, self._blocked_until - now)
+
+    def update(
+        self,
+        rate: float | None = None,
+        capacity: float | None = None,
+        tokens: float | None = None,
+        blocked_for: float | None = None,
+    ):
+        '''
+        Changes the refill rate or burst capacity, caps available tokens or blocks the bucket for ``blocked_for`` s.
+        '''
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if rate is not None:
+                self._rate = rate
+            if capacity is not None:
+                self._capacity = capacity
+            if tokens is not None or capacity is not None:
+                self._tokens = min(self._tokens, self._capacity, float('inf') if tokens is None else tokens)
+            if blocked_for is not None:
+                self._blocked_until = max(self._blocked_until, now + blocked_for)
+
+    def update_from_usage_info(self, usage_info: UsageInfo, now: datetime | None = None):
+        now = datetime.now(timezone.utc) if now is None else now
+        rate = float('inf')
+        blocked_for = None
+        for period, end in _period_ends(now).items():
+            remaining = getattr(usage_info.remaining, period)
+            if remaining is None:
+                continue
+            seconds_left = (end - now).total_seconds()
+            if remaining <= 0:
+                blocked_for = max(blocked_for or 0.0, seconds_left)
+            else:
+                rate = min(rate, remaining / seconds_left)
+        totals = [
+            remaining
+            for remaining in (
+                usage_info.remaining.day,
+                usage_info.remaining.week,
+                usage_info.remaining.month,
+                usage_info.remaining.total,
+            )
+            if remaining is not None
+        ]
+        with self._lock:
+            self.budget = min(totals) if totals else None
+            self.consumed = 0.0
+            self._started = time.monotonic()
+            self._usage_rate = rate
+            rate = min(rate, self._header_rate)
+        # do not let a full bucket burst more than one second worth of the paced rate
+        capacity = None if rate == float('inf') else min(self._capacity, max(1.0, rate))
+        self.update(rate=rate, capacity=capacity, tokens=self.budget, blocked_for=blocked_for)
+
+    def update_from_headers(self, headers, status_code: int | None = None):
+        '''
+        Applies ``RateLimit-Remaining``/``RateLimit-Reset`` (or ``X-`` prefixed) headers and ``Retry-After`` of 429.
+        The reset is taken as seconds from now, or as an epoch timestamp when it is larger than a plausible delta.
+        '''
+
+        def get_number(names) -> float | None:
+            for name in names:
+                try:
+                    return float(headers[name])
+                except (KeyError, ValueError):
+                    continue
+            return None
+
+        remaining, reset = get_number(REMAINING_HEADERS), get_number(RESET_HEADERS)
+        if reset is not None and reset > EPOCH_RESET_THRESHOLD:
+            reset = max(0.0, reset - time.time())
+        rate = None if remaining is None or reset is None or reset <= 0 else remaining / reset
+        blocked_for = get_number(('Retry-After',)) if status_code == 429 else None
+        if remaining is not None and remaining <= 0 and reset is not None:
+            blocked_for = max(blocked_for or 0.0, reset)
+        if rate:
+            with self._lock:
+                self._header_rate = rate
+                rate = min(rate, self._usage_rate)
+        if rate is not None or remaining is not None or blocked_for is not None:
+            self.update(rate=rate or None, tokens=remaining, blocked_for=blocked_for)
+
+    def predicted_exhaustion(self) -> datetime | None:
+        '''
+        Time when the budget runs out at the observed consumption rate, None when budget is unknown.
+        '''
+        with self._lock:
+            if self.budget is None:
+                return None
+            elapsed = time.monotonic() - self._started
+            rate = self._rate
+            if elapsed > 0 and self.consumed > 0:
+                rate = min(rate, self.consumed / elapsed)
+            budget = max(0.0, self.budget)
+        if rate <= 0 or rate == float('inf'):
+            return None
+        return datetime.now(timezone.utc) + timedelta(seconds=budget / rate)
@@ -0,0 +1,106 @@
+'''
+JSON request bodies written in chunks, without serializing the images they carry into one string.
+'''
+
+import re
+from typing import Iterator
+
+from kindwise.json_backend import DEFAULT_JSON_BACKEND, JSONBackend
+
+# strings this long (the base64 images) are streamed in slices instead of being serialized
+CHUNK_SIZE = 64 * 1024
+# printable ASCII which JSON strings carry unescaped
+PLAIN_BYTES = bytes(c for c in range(0x20, 0x7F) if c not in b'"\\')
+
+
+class _JSONBody:
+    '''
+    JSON document which is written in chunks of about ``chunk_size`` bytes.
+
+    Long strings are replaced by placeholders and only the rest of the document is serialized, the strings are
+    encoded slice by slice while the body is sent. The output is byte for byte the same as ``json_backend.dumps``
+    gives and the body can be iterated repeatedly, e.g. by retries.
+    '''
+
+    def __init__(self, payload, chunk_size: int = CHUNK_SIZE, json_backend: JSONBackend = DEFAULT_JSON_BACKEND):
+        self.chunk_size = chunk_size
+        self._dumps = json_backend.dumps
+        self._strings: list[str | bytes] = []
+        self._token = f'\x00kindwise-body-{id(self)}-'
+        skeleton = self._dumps(self._extract(payload))
+        pattern = re.escape(self._dumps(self._token)[:-1]) + rb'(\d+)' + re.escape(self._dumps('\x00')[1:])
+        self._parts: list[bytes | int] = []
+        position = 0
+        for match in re.finditer(pattern, skeleton):
+            self._parts.append(skeleton[position : match.start()])
+            self._parts.append(int(match.group(1)))
+            position = match.end()
+        self._parts.append(skeleton[position:])
+        self.content_length = sum(
+            len(part) if isinstance(part, bytes) else self._string_length(self._strings[part]) for part in self._parts
+        )
+
+    def _extract(self, value):
+        "Copy of the containers with long strings replaced by numbered placeholders"
+        if isinstance(value, str) and len(value) > self.chunk_size:
+            if not self._is_plain(value):
+                value = self._dumps(value)  # rare, serialized up front
+            self._strings.append(value)
+            return f'{self._token}{len(self._strings) - 1}\x00'
+        if isinstance(value, dict):
+            return {key: self._extract(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._extract(item) for item in value]
+        return value
+
+    def _is_plain(self, value: str) -> bool:
+        "Checked slice by slice, bytes.translate is several times faster than a regular expression"
+        if not value.isascii():
+            return False
+        for start in range(0, len(value), self.chunk_size):
+            if value[start : start + self.chunk_size].encode('ascii').translate(None, PLAIN_BYTES):
+                return False
+        return True
+
+    @staticmethod
+    def _string_length(value: str | bytes) -> int:
+        return len(value) if isinstance(value, bytes) else len(value) + 2
+
+    def _string_chunks(self, value: str | bytes) -> Iterator[bytes]:
+        if isinstance(value, bytes):
+            yield value
+            return
+        yield b'"'
+        for start in range(0, len(value), self.chunk_size):
+            yield value[start : start + self.chunk_size].encode('ascii')
+        yield b'"'
+
+    def chunks(self) -> Iterator[bytes]:
+        for part in self._parts:
+            if isinstance(part, bytes):
+                if part:
+                    yield part
+            else:
+                yield from self._string_chunks(self._strings[part])
+
+    def getvalue(self) -> bytes:
+        return b''.join(self.chunks())
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {'Content-Type': 'application/json', 'Content-Length': str(self.content_length)}
+
+
+class JSONBody(_JSONBody):
+    "Body for ``httpx.Client`` requests"
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.chunks()
+
+
+class AsyncJSONBody(_JSONBody):
+    "Body for ``httpx.AsyncClient`` requests"
+
+    async def __aiter__(self):
+        for chunk in self.chunks():
+            yield chunk
@@ -0,0 +1,83 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+RETRY_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    '''
+    Configuration of retries of failed API calls.
+
+    Attributes:
+        max_attempts: Maximal number of attempts including the first one.
+        status_codes: Response status codes which are retried.
+        exceptions: Exceptions raised while sending a request which are retried.
+        backoff_factor: Delay before the second attempt, doubled with every following attempt.
+        backoff_max: Upper bound of a delay between two attempts.
+        jitter: Fraction of the delay which is randomized, 1.0 means "full jitter" (delay is drawn from [0, delay]).
+        respect_retry_after: Wait as long as the Retry-After header of the response says.
+        deadline: Total time in seconds after which no other attempt is started.
+    '''
+
+    max_attempts: int = 3
+    status_codes: frozenset[int] = RETRY_STATUS_CODES
+    exceptions: tuple[type[Exception], ...] = (httpx.TransportError,)
+    backoff_factor: float = 0.5
+    backoff_max: float = 30.0
+    jitter: float = 1.0
+    respect_retry_after: bool = True
+    deadline: float | None = None
+
+    def is_retryable(self, response: httpx.Response | None = None, exception: Exception | None = None) -> bool:
+        if exception is not None:
+            return isinstance(exception, self.exceptions)
+        return response.status_code in self.status_codes
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_factor * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    @staticmethod
+    def retry_after(response: httpx.Response | None) -> float | None:
+        value = None if response is None else response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+    def next_delay(
+        self,
+        attempt: int,
+        elapsed: float,
+        response: httpx.Response | None = None,
+        exception: Exception | None = None,
+    ) -> float | None:
+        '''
+        Returns how long to wait before the next attempt, None if the call should not be retried.
+
+        Args:
+            attempt: Number of the attempt which just finished, starting from 1.
+            elapsed: Seconds since the first attempt started.
+            response: Response of the attempt, None if it raised an exception.
+            exception: Exception raised by the attempt.
+        '''
+        if attempt >= self.max_attempts or not self.is_retryable(response, exception):
+            return None
+        delay = self.retry_after(response) if self.respect_retry_after else None
+        if delay is None:
+            delay = self.backoff(attempt)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
@@ -0,0 +1,120 @@
+import contextlib
+
+import anyio
+import httpx
+import pytest
+
+from kindwise.async_api.concurrency import AsyncAdaptiveConcurrencyLimiter
+from kindwise.tests.async_api.test_core import AsyncTestApi
+
+HOST = 'api.kindwise.com'
+
+
+class LatencyServer:
+    "Stand-in server whose latency grows once more than ``capacity`` requests are in flight"
+
+    def __init__(self, capacity: int, latency: float = 0.005, overload_status: int | None = None):
+        self.capacity = capacity
+        self.latency = latency
+        self.overload_status = overload_status
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.overloaded = 0
+
+    async def __call__(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            overload = max(0, self.in_flight - self.capacity)
+            if overload:
+                self.overloaded += 1
+                if self.overload_status is not None:
+                    return httpx.Response(self.overload_status)
+            await anyio.sleep(self.latency * (1 + overload))
+            return httpx.Response(200, json={})
+        finally:
+            self.in_flight -= 1
+
+
+async def run(api, requests: int, concurrency: int):
+    async def worker(count):
+        for _ in range(count):
+            try:
+                await api.get_kb_detail('token', details='gbif_id')
+            except ValueError:
+                pass
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(concurrency):
+            tg.start_soon(worker, requests // concurrency)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def simulate(limiter, clock, capacity: int, rounds: int, latency: float = 0.005):
+    "Admits as many requests as the limit allows each round, their latency grows with the overload of the server"
+    for _ in range(rounds):
+        async with contextlib.AsyncExitStack() as stack:
+            for _ in range(limiter.limit(HOST)):
+                await stack.enter_async_context(limiter.slot(HOST))
+            clock.now += latency * (1 + max(0, limiter.in_flight(HOST) - capacity))
+
+
+@pytest.mark.anyio
+async def test_limit_grows_while_latency_is_flat():
+    clock = FakeClock()
+    limiter = AsyncAdaptiveConcurrencyLimiter(initial_limit=2, clock=clock)
+    await simulate(limiter, clock, capacity=100, rounds=50)
+    assert limiter.limit(HOST) > 4
+    assert limiter.in_flight(HOST) == 0
+    assert limiter.latency_percentiles(HOST) == pytest.approx({50: 0.005, 90: 0.005, 99: 0.005})
+
+
+@pytest.mark.anyio
+async def test_limit_backs_off_on_latency_spikes():
+    clock = FakeClock()
+    limiter = AsyncAdaptiveConcurrencyLimiter(initial_limit=32, clock=clock)
+    await simulate(limiter, clock, capacity=100, rounds=5)  # baseline latency
+    await simulate(limiter, clock, capacity=4, rounds=20)
+    assert limiter.limit(HOST) < 16
+    assert limiter.stats()[HOST]['limit'] == limiter.limit(HOST)
+
+
+@pytest.mark.anyio
+async def test_api_requests_go_through_limiter(respx_mock):
+    limiter = AsyncAdaptiveConcurrencyLimiter(initial_limit=4)
+    api = AsyncTestApi(api_key='test_key', concurrency_limiter=limiter)
+    server = LatencyServer(capacity=100)
+    respx_mock.get(f'{api.kb_api_url}/test/token').mock(side_effect=server)
+    await run(api, 100, 16)
+    assert server.max_in_flight <= limiter.max_limit
+    assert limiter.in_flight(HOST) == 0
+    assert limiter.latency_percentiles(HOST)[50] >= 0.005
+
+
+@pytest.mark.anyio
+async def test_limit_backs_off_on_429(respx_mock):
+    limiter = AsyncAdaptiveConcurrencyLimiter(initial_limit=32)
+    api = AsyncTestApi(api_key='test_key', concurrency_limiter=limiter)
+    server = LatencyServer(capacity=4, overload_status=429)
+    respx_mock.get(f'{api.kb_api_url}/test/token').mock(side_effect=server)
+    await run(api, 400, 32)
+    assert limiter.limit(HOST) <= 8
+    # most of the requests were admitted within the capacity of the server
+    assert server.overloaded < 100
+
+
+@pytest.mark.anyio
+async def test_hosts_are_tracked_separately(respx_mock):
+    limiter = AsyncAdaptiveConcurrencyLimiter(initial_limit=16)
+    api = AsyncTestApi(api_key='test_key', concurrency_limiter=limiter)
+    respx_mock.get(f'{api.kb_api_url}/test/token').mock(return_value=httpx.Response(503))
+    await run(api, 20, 4)
+    assert limiter.limit(HOST) < 16
+    assert limiter.limit('insect.kindwise.com') == 16
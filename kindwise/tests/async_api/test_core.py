@@ -1,11 +1,20 @@
 import enum
+import io
+import time
 from pathlib import Path
 from unittest.mock import patch
 from kindwise.async_api.core import AsyncKindwiseApi
+from kindwise.hedging import HedgingPolicy
+from kindwise.image_encoding import EncodingExecutor
+from kindwise.mock_transport import KindwiseMockTransport
 from kindwise.models import Identification
+from kindwise.tests.conftest import IMAGE_DIR
+from kindwise.retry import RetryPolicy
 import pytest
 import base64
+import anyio
 import httpx
+from PIL import Image
 
 
 class TestKBType(str, enum.Enum):
@@ -200,3 +209,146 @@ async def test_conversation_flow(api, respx_mock):
     respx_mock.delete(f'{api.identification_url}/token/conversation').mock(return_value=httpx.Response(200, json=True))
     del_res = await api.delete_conversation('token')
     assert del_res is True
+
+
+@pytest.mark.anyio
+async def test_client_is_reused_between_calls(api, respx_mock, identification_data):
+    respx_mock.get(f'{api.identification_url}/token').mock(return_value=httpx.Response(200, json=identification_data))
+    respx_mock.get(f'{api.kb_api_url}/test/token').mock(return_value=httpx.Response(200, json={}))
+
+    await api.get_identification('token')
+    client = api.client
+    await api.get_kb_detail('token', details='gbif_id')
+    assert api.client is client
+    await api.aclose()
+    assert client.is_closed
+    # closed api lazily opens a new client
+    await api.get_identification('token')
+    assert api.client is not client
+    await api.aclose()
+
+
+@pytest.mark.anyio
+async def test_context_manager(respx_mock, identification_data):
+    limits = httpx.Limits(max_connections=5, max_keepalive_connections=2, keepalive_expiry=10.0)
+    async with AsyncTestApi(api_key='test_key', limits=limits) as api:
+        respx_mock.get(f'{api.identification_url}/token').mock(
+            return_value=httpx.Response(200, json=identification_data)
+        )
+        await api.get_identification('token')
+        client = api.client
+        assert api.limits == limits
+    assert client.is_closed
+
+
+@pytest.mark.anyio
+async def test_http2(respx_mock, identification_data):
+    api = AsyncTestApi(api_key='test_key', http2=True)
+    assert api.http2
+    assert api.max_concurrent_requests == 100
+    respx_mock.get(f'{api.identification_url}/token').mock(return_value=httpx.Response(200, json=identification_data))
+    result = await api.get_identification('token')
+    assert result.access_token == 'token'
+    await api.aclose()
+
+    api = AsyncTestApi(api_key='test_key', http2=True, max_concurrent_requests=10)
+    assert api.max_concurrent_requests == 10
+    assert AsyncTestApi(api_key='test_key').max_concurrent_requests is None
+
+    with patch('kindwise.async_api.core.h2', None):
+        with pytest.warns(UserWarning, match='falling back to HTTP/1.1'):
+            api = AsyncTestApi(api_key='test_key', http2=True)
+    assert not api.http2
+    assert api.max_concurrent_requests is None
+
+
+@pytest.mark.anyio
+async def test_retry(respx_mock, identification_data):
+    api = AsyncTestApi(api_key='test_key', retry=RetryPolicy(max_attempts=2, backoff_factor=0.0))
+    route = respx_mock.get(f'{api.identification_url}/token')
+    route.side_effect = [httpx.ReadTimeout('timeout'), httpx.Response(200, json=identification_data)]
+    result = await api.get_identification('token')
+    assert result.access_token == 'token'
+    assert route.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_hedged_get(respx_mock, identification_data):
+    hedging = HedgingPolicy(percentile=50, max_hedge_ratio=1.0, min_samples=3)
+    api = AsyncTestApi(api_key='test_key', hedging=hedging)
+    calls = []
+
+    async def server(request):
+        calls.append(request)
+        # the 4th request hangs, its hedge answers immediately
+        if len(calls) == 4:
+            await anyio.sleep(5)
+        return httpx.Response(200, json=identification_data)
+
+    respx_mock.get(f'{api.identification_url}/token').mock(side_effect=server)
+    for _ in range(4):
+        with anyio.fail_after(2):
+            assert (await api.get_identification('token')).access_token == 'token'
+    assert len(calls) == 5
+    assert hedging.stats() == {'requests': 4, 'hedges_sent': 1, 'hedges_won': 1}
+
+    # identification is never hedged
+    respx_mock.post(api.identification_url).mock(return_value=httpx.Response(200, json=identification_data))
+    await api.identify(b'R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7')
+    assert hedging.requests == 4
+
+
+@pytest.mark.anyio
+async def test_mock_transport():
+    transport = KindwiseMockTransport(latency=0.01)
+    async with AsyncTestApi(api_key='test_key', transport=transport) as api:
+        identifications = []
+
+        async def identify():
+            identifications.append(await api.identify(IMAGE_DIR / 'aloe-vera.jpg'))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(20):
+                tg.start_soon(identify)
+        await api.identify('https://example.com/photo.jpg')
+    assert len({identification.access_token for identification in identifications}) == 20
+    assert transport.requests == 22
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('encoding_executor', [None, EncodingExecutor(max_workers=2)])
+async def test_encoding_does_not_block_event_loop(encoding_executor):
+    buffer = io.BytesIO()
+    Image.effect_noise((3000, 2000), 64).convert('RGB').save(buffer, format='JPEG')
+    api = AsyncTestApi(api_key='test_key', encoding_executor=encoding_executor)
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await anyio.sleep(0.005)
+            gaps.append(time.perf_counter() - last)
+            last = time.perf_counter()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(ticker)
+        started = time.perf_counter()
+        images = [await api._encode_image(buffer.getvalue(), 1500) for _ in range(3)]
+        elapsed = time.perf_counter() - started
+        tg.cancel_scope.cancel()
+    assert len(set(images)) == 1
+    # the loop kept ticking while images were encoded
+    assert max(gaps) < elapsed / 3
+
+
+@pytest.mark.anyio
+async def test_images_are_encoded_concurrently():
+    transport = KindwiseMockTransport(latency=0.2)
+    api = AsyncTestApi(api_key='test_key', transport=transport)
+    images = [f'https://example.com/{i}.jpg' for i in range(5)] + [IMAGE_DIR / 'bee.jpeg']
+    started = time.perf_counter()
+    payload = await api._build_payload(images, max_image_size=None)
+    # downloads overlap, sequentially they would take 5 * 0.2 s
+    assert time.perf_counter() - started < 0.6
+    assert payload['images'][:5] == [base64.b64encode(transport.image).decode('ascii')] * 5
+    assert payload['images'][5] == base64.b64encode((IMAGE_DIR / 'bee.jpeg').read_bytes()).decode('ascii')
@@ -0,0 +1,99 @@
+import time
+
+import httpx
+import pytest
+
+from kindwise.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from . import test_core
+
+
+def test_state_transitions():
+    changes = []
+    breaker = CircuitBreaker(
+        window=4,
+        min_calls=4,
+        failure_rate_threshold=0.5,
+        open_duration=0.05,
+        on_state_change=lambda *c: changes.append(c),
+    )
+    for failed in [False, True, False]:
+        breaker.before_call('plant.id')
+        breaker.after_call('plant.id', failed)
+    assert breaker.state('plant.id') == CircuitState.CLOSED
+    breaker.before_call('plant.id')
+    breaker.after_call('plant.id', True)
+    assert breaker.state('plant.id') == CircuitState.OPEN
+    assert changes == [('plant.id', CircuitState.CLOSED, CircuitState.OPEN)]
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call('plant.id')
+    # other hosts are not affected
+    breaker.before_call('insect.kindwise.com')
+    breaker.after_call('insect.kindwise.com', False)
+
+    time.sleep(0.06)
+    assert breaker.state('plant.id') == CircuitState.HALF_OPEN
+    breaker.before_call('plant.id')
+    with pytest.raises(CircuitOpenError):  # only one probe at a time
+        breaker.before_call('plant.id')
+    breaker.after_call('plant.id', True)
+    assert breaker.state('plant.id') == CircuitState.OPEN
+
+    time.sleep(0.06)
+    breaker.before_call('plant.id')
+    breaker.after_call('plant.id', False)
+    assert breaker.state('plant.id') == CircuitState.CLOSED
+    assert [new for _, _, new in changes] == [
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.CLOSED,
+    ]
+
+
+def test_cancelled_probe_is_released():
+    breaker = CircuitBreaker(window=1, min_calls=1, open_duration=0.0)
+    breaker.before_call('plant.id')
+    breaker.after_call('plant.id', True)
+    breaker.before_call('plant.id')
+    breaker.after_call('plant.id', None)
+    breaker.before_call('plant.id')
+
+
+def test_calls_admitted_while_closed_are_not_probes():
+    changes = []
+    breaker = CircuitBreaker(window=2, min_calls=2, open_duration=0.0, on_state_change=lambda *c: changes.append(c[2]))
+    late_success, late_cancel = breaker.before_call('plant.id'), breaker.before_call('plant.id')
+    for _ in range(2):
+        breaker.after_call('plant.id', True, breaker.before_call('plant.id'))
+    probe = breaker.before_call('plant.id')
+    assert breaker.state('plant.id') == CircuitState.HALF_OPEN
+    breaker.after_call('plant.id', False, late_success)
+    breaker.after_call('plant.id', None, late_cancel)
+    assert breaker.state('plant.id') == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):  # the late calls did not release probe slots
+        breaker.before_call('plant.id')
+    breaker.after_call('plant.id', True, probe)
+    assert changes == [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.OPEN]
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker(window=2, min_calls=2, slow_call_duration=0.01)
+    for _ in range(2):
+        with breaker.call('plant.id') as call:
+            time.sleep(0.02)
+            call.response = httpx.Response(200)
+    assert breaker.state('plant.id') == CircuitState.OPEN
+
+
+def test_api_fails_fast(api_key, requests_mock, usage_info_dict):
+    breaker = CircuitBreaker(window=3, min_calls=3, open_duration=60)
+    api = test_core.TestApi(api_key=api_key, circuit_breaker=breaker)
+    requests_mock.get(api.usage_info_url, status_code=503)
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            api.usage_info()
+    assert breaker.failure_rate('test.id') == 1.0
+    with pytest.raises(CircuitOpenError):
+        api.usage_info()
+    assert len(requests_mock.request_history) == 3
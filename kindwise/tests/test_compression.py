@@ -0,0 +1,110 @@
+import gzip
+import json
+import threading
+
+import httpx
+import pytest
+
+from kindwise.compression import OFFLOAD_SIZE, RequestCompression
+from .async_api.test_core import AsyncTestApi
+from .conftest import IMAGE_DIR
+from . import test_core
+
+
+@pytest.fixture
+def identification_dict():
+    return {
+        'access_token': 'token',
+        'model_version': 'test:1.0',
+        'custom_id': None,
+        'input': {
+            'images': ['img'],
+            'datetime': '2023-01-01T00:00:00',
+            'latitude': None,
+            'longitude': None,
+            'similar_images': True,
+        },
+        'result': {'classification': {'suggestions': []}},
+        'status': 'COMPLETED',
+        'sla_compliant_client': True,
+        'sla_compliant_system': True,
+        'created': 1700000000.0,
+        'completed': 1700000001.0,
+    }
+
+
+def test_compress():
+    compression = RequestCompression(min_size=100)
+    body = json.dumps({'images': ['QUFB' * 1000]}).encode()
+    compressed, encoding = compression.compress('plant.id', body)
+    assert encoding == 'gzip'
+    assert gzip.decompress(compressed) == body
+    assert compression.compress('plant.id', b'{}') == (b'{}', None)
+    assert compression.stats() == {
+        'requests': 2,
+        'compressed': 1,
+        'bytes_in': len(body),
+        'bytes_out': len(compressed),
+        'ratio': len(compressed) / len(body),
+    }
+    with pytest.raises(ValueError):
+        RequestCompression(encoding='br')
+
+
+def test_reject():
+    compression = RequestCompression()
+    assert compression.reject('plant.id', 'gzip', 'br, identity') is None
+    assert compression.encoding_for('plant.id') is None
+    assert compression.encoding_for('insect.kindwise.com') == 'gzip'
+
+
+def test_identify_sends_compressed_body(api_key, identification_dict, respx_mock):
+    compression = RequestCompression(min_size=1024)
+    api = test_core.TestApi(api_key=api_key, compression=compression)
+    route = respx_mock.post(api.identification_url).respond(json=identification_dict)
+    api.identify(IMAGE_DIR / 'aloe-vera.jpg')
+    request = route.calls.last.request
+    assert request.headers['Content-Encoding'] == 'gzip'
+    assert int(request.headers['Content-Length']) == len(request.content)
+    payload = json.loads(gzip.decompress(request.content))
+    assert len(payload['images']) == 1
+    assert compression.compressed == 1 and compression.ratio < 1
+
+    respx_mock.post(api.feedback_url('token')).respond(json=True)
+    api.feedback('token', rating=5)  # small bodies are sent as they are
+    assert 'Content-Encoding' not in respx_mock.calls.last.request.headers
+
+
+def test_unsupported_encoding_falls_back_to_identity(api_key, identification_dict, respx_mock):
+    api = test_core.TestApi(api_key=api_key, compression=RequestCompression(min_size=1024))
+    sent = []
+
+    def server(request):
+        sent.append(request.headers.get('Content-Encoding'))
+        if 'Content-Encoding' in request.headers:
+            return httpx.Response(415, headers={'Accept-Encoding': 'identity'})
+        return httpx.Response(200, json=identification_dict)
+
+    respx_mock.post(api.identification_url).mock(side_effect=server)
+    api.identify(IMAGE_DIR / 'aloe-vera.jpg')
+    api.identify(IMAGE_DIR / 'aloe-vera.jpg')
+    assert sent == ['gzip', None, None]
+
+
+@pytest.mark.anyio
+async def test_async_api_compresses_large_bodies_off_the_event_loop(api_key, identification_dict, respx_mock):
+    threads = []
+
+    class RecordingCompression(RequestCompression):
+        def compress(self, host: str, body: bytes):
+            threads.append((len(body) >= OFFLOAD_SIZE, threading.get_ident()))
+            return super().compress(host, body)
+
+    api = AsyncTestApi(api_key=api_key, compression=RecordingCompression(min_size=0))
+    route = respx_mock.post(api.identification_url).respond(json=identification_dict)
+    respx_mock.post(api.feedback_url('token')).respond(json={})
+    await api.identify(IMAGE_DIR / 'aloe-vera.jpg', max_image_size=None)
+    await api.feedback('token', comment='correct')
+    assert gzip.decompress(route.calls.last.request.content)
+    loop_thread = threading.get_ident()
+    assert [(large, thread == loop_thread) for large, thread in threads] == [(True, False), (False, True)]
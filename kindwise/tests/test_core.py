@@ -1,10 +1,15 @@
 import base64
 import enum
 import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import PurePath, Path
 
 import pytest
+from httpx import Response
 from PIL import Image
 
 from kindwise.models import (
@@ -13,6 +18,7 @@ from kindwise.models import (
     Input,
     Classification,
     Suggestion,
+    SuggestionWithScientificName,
     SimilarImage,
     IdentificationStatus,
     SearchResult,
@@ -23,7 +29,11 @@ from kindwise.models import (
 )
 from .conftest import IMAGE_DIR
 from .. import settings
+from ..concurrency import AdaptiveConcurrencyLimiter
 from ..core import KindwiseApi
+from ..hedging import HedgingPolicy
+from ..mock_transport import KindwiseMockTransport
+from ..plant import PlantApi
 
 
 class TestKBType(str, enum.Enum):
@@ -672,3 +682,128 @@ def test_conversation_feedback(api, api_key, identification, requests_mock):
     assert request_record.headers['Content-Type'] == 'application/json'
     assert request_record.headers['Api-Key'] == api_key
     assert request_record.json() == {'feedback': {'rating': 5}}
+
+
+def test_client_is_shared_between_threads(api, usage_info, usage_info_dict, requests_mock):
+    requests_mock.get(api.usage_info_url, json=usage_info_dict)
+    clients = set()
+
+    def call():
+        assert api.usage_info() == usage_info
+        clients.add(id(api.client))
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        for future in [executor.submit(call) for _ in range(128)]:
+            future.result()
+    assert len(clients) == 1
+    assert len(requests_mock.request_history) == 128
+    client = api.client
+    api.close()
+    assert client.is_closed
+
+
+def test_context_manager(api_key, usage_info_dict, requests_mock):
+    with TestApi(api_key=api_key) as api:
+        requests_mock.get(api.usage_info_url, json=usage_info_dict)
+        api.usage_info()
+        client = api.client
+    assert client.is_closed
+
+
+def test_adaptive_concurrency_limiter(api_key, usage_info_dict, requests_mock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_latency_increase=1.0)  # only errors back off
+    api = TestApi(api_key=api_key, concurrency_limiter=limiter)
+    requests_mock.get(api.usage_info_url, json=usage_info_dict)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for future in [executor.submit(api.usage_info) for _ in range(64)]:
+            future.result()
+    assert limiter.in_flight('test.id') == 0
+    limit = limiter.limit('test.id')
+    assert limit >= 4
+    requests_mock.get(api.usage_info_url, status_code=503)
+    with pytest.raises(ValueError):
+        api.usage_info()
+    assert limiter.limit('test.id') < limit
+
+
+def test_hedged_get(api_key, usage_info_dict, respx_mock):
+    hedging = HedgingPolicy(percentile=50, max_hedge_ratio=0.5, min_samples=2)
+    api = TestApi(api_key=api_key, hedging=hedging)
+    calls = []
+
+    def server(request):
+        calls.append(request)
+        if len(calls) == 3:
+            time.sleep(1)
+        return Response(200, json=usage_info_dict)
+
+    respx_mock.get(api.usage_info_url).mock(side_effect=server)
+    for _ in range(3):
+        started = time.monotonic()
+        api.usage_info()
+        assert time.monotonic() - started < 0.9
+    assert len(calls) == 4
+    assert hedging.stats() == {'requests': 3, 'hedges_sent': 1, 'hedges_won': 1}
+
+
+def test_hedging_does_not_limit_caller_threads(api_key, usage_info_dict, respx_mock):
+    threads = 16
+    hedging = HedgingPolicy(max_hedge_ratio=0.0, min_samples=1)
+    api = TestApi(api_key=api_key, hedging=hedging)
+    barrier = threading.Barrier(threads, timeout=5)
+
+    def server(request):
+        barrier.wait()  # all caller threads are in flight at once, more than the gather pool has workers
+        return Response(200, json=usage_info_dict)
+
+    respx_mock.get(api.usage_info_url).respond(json=usage_info_dict)
+    api.usage_info()  # latency sample, the following requests are hedgeable
+    respx_mock.get(api.usage_info_url).mock(side_effect=server)
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(lambda _: api.usage_info(), range(threads)))
+    assert len(results) == threads
+    assert hedging.stats() == {'requests': threads + 1, 'hedges_sent': 0, 'hedges_won': 0}
+
+
+def test_identify_multiple_images_keeps_order(api, identification_dict, respx_mock):
+    route = respx_mock.post(api.identification_url).respond(json=identification_dict)
+    images = [IMAGE_DIR / name for name in ('aloe-vera.jpg', 'bee.jpeg', 'wheat.jpg', 'padli.png')]
+    api.identify(images, max_image_size=None)
+    payload = json.loads(route.calls.last.request.content)
+    assert payload['images'] == [base64.b64encode(path.read_bytes()).decode('ascii') for path in images]
+    with open(images[1], 'r') as text_file, pytest.raises(ValueError):
+        api.identify([images[0], text_file, images[2]])
+
+
+def test_models_are_slotted(api_key):
+    for lean in (False, True):
+        api = PlantApi(api_key=api_key, transport=KindwiseMockTransport(similar_images=2), lean=lean)
+        identification = api.identify(IMAGE_DIR / 'aloe-vera.jpg')
+        suggestion = identification.result.classification.suggestions[0]
+        for model in (identification, identification.input, suggestion):
+            assert not hasattr(model, '__dict__')
+        assert identification.input.images == ([] if lean else ['https://plant.id/media/imgs/0.jpg'])
+        assert (suggestion.similar_images is None) if lean else (len(suggestion.similar_images) == 2)
+        assert api.get_identification(identification.access_token).input.similar_images
+
+
+def test_compiled_from_dict():
+    data = {'id': '1', 'url': 'https://a', 'similarity': 0.5, 'url_small': 'https://b', 'citation': None}
+    assert SimilarImage.from_dict(data) == SimilarImage('1', 'https://a', 0.5, 'https://b')
+    assert SimilarImage.from_dict is SimilarImage.from_dict
+    assert Suggestion.from_dict is not SuggestionWithScientificName.from_dict
+    with pytest.raises(KeyError):
+        SimilarImage.from_dict({'id': '1'})
+    conversation = Conversation.from_dict(
+        {
+            'messages': [{'content': 'hi', 'type': 'answer', 'created': '2023-12-18T16:35:50.781Z'}],
+            'identification': 'token',
+            'remaining_calls': 1,
+            'model_parameters': {},
+        }
+    )
+    assert conversation.feedback == {}
+    assert conversation.messages[0].type is MessageType.ANSWER
+    assert conversation.messages[0].created == datetime(2023, 12, 18, 16, 35, 50, 781000)
+    with pytest.raises(ValueError):
+        Message.from_dict({'content': 'hi', 'type': 'unknown', 'created': '2023-12-18T16:35:50'})
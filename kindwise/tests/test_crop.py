@@ -1,6 +1,8 @@
 from .conftest import run_test_requests_to_server, IMAGE_DIR, run_test_available_details
 from .. import CropHealthApi
-from ..crop_health import CropIdentification
+from ..crop_health import CropIdentification, CropResult
+from ..mock_transport import KindwiseMockTransport
+from ..models import SuggestionWithScientificName
 
 
 def test_requests_to_crop_server(api_key):
@@ -13,6 +15,14 @@ def test_requests_to_crop_server(api_key):
     )
 
 
+def test_result_class_follows_annotation(api_key):
+    api = CropHealthApi(api_key=api_key, transport=KindwiseMockTransport())
+    identification = api.identify(IMAGE_DIR / 'potato.late_blight.jpg')
+    assert isinstance(identification, CropIdentification)
+    assert isinstance(identification.result, CropResult)
+    assert isinstance(identification.result.crop.suggestions[0], SuggestionWithScientificName)
+
+
 def test_available_details(api_key):
     expected_view_names = {
         'common_names',
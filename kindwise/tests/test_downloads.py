@@ -0,0 +1,67 @@
+import base64
+
+import anyio
+import httpx
+import pytest
+
+from kindwise.downloads import DownloadPolicy, ImageDownloadError
+from kindwise.mock_transport import jpeg_image
+from .async_api.test_core import AsyncTestApi
+from . import test_core
+
+IMAGE_URL = 'https://images.test/image.jpg'
+
+
+def test_download(api_key, respx_mock):
+    image = jpeg_image((200, 100))
+    respx_mock.get(IMAGE_URL).respond(200, content=image)
+    api = test_core.TestApi(api_key=api_key)
+    assert base64.b64decode(api._encode_image(IMAGE_URL, None)) == image
+    assert api.downloads.stats() == {'downloads': 1, 'failures': 0, 'bytes_downloaded': len(image)}
+
+
+@pytest.mark.parametrize(
+    'response',
+    [
+        httpx.Response(404),
+        httpx.Response(200, content=b'x' * 1001),
+        httpx.Response(200, content=iter([b'x' * 600, b'x' * 600])),  # chunked, no Content-Length
+    ],
+)
+def test_failed_download_raises(api_key, respx_mock, response):
+    respx_mock.get(IMAGE_URL).mock(return_value=response)
+    api = test_core.TestApi(api_key=api_key, downloads=DownloadPolicy(max_bytes=1000))
+    with pytest.raises(ImageDownloadError):
+        api._encode_image(IMAGE_URL, None)
+    assert api.downloads.failures == 1
+
+
+def test_download_timeout(api_key, respx_mock):
+    respx_mock.get(IMAGE_URL).mock(side_effect=httpx.ReadTimeout('timed out'))
+    api = test_core.TestApi(api_key=api_key)
+    with pytest.raises(ImageDownloadError, match='ReadTimeout'):
+        api._encode_image(IMAGE_URL, None)
+
+
+@pytest.mark.anyio
+async def test_downloads_are_limited_per_host(api_key):
+    image = jpeg_image((20, 20))
+    running = {'a.test': 0, 'b.test': 0}
+    most = dict(running)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        running[request.url.host] += 1
+        most[request.url.host] = max(most[request.url.host], running[request.url.host])
+        await anyio.sleep(0.01)
+        running[request.url.host] -= 1
+        return httpx.Response(200, content=image)
+
+    api = AsyncTestApi(
+        api_key=api_key, transport=httpx.MockTransport(handler), downloads=DownloadPolicy(max_per_host=2)
+    )
+    async with anyio.create_task_group() as tg:
+        for i in range(6):
+            for host in running:
+                tg.start_soon(api._encode_image, f'https://{host}/{i}.jpg', None)
+    assert most == {'a.test': 2, 'b.test': 2}
+    assert api.downloads.downloads == 12
@@ -0,0 +1,89 @@
+import base64
+import os
+
+from kindwise.image_cache import EncodedImageCache
+from kindwise.image_encoding import EncoderSettings, encode_image
+from .conftest import IMAGE_DIR
+from . import test_core
+
+
+def test_key_depends_on_data_and_parameters():
+    key = EncodedImageCache.key(b'image', 1500)
+    assert key == EncodedImageCache.key(b'image', 1500, EncoderSettings())
+    assert key == EncodedImageCache.key(b'image', 1500, EncoderSettings(on_encoded=print))
+    assert key != EncodedImageCache.key(b'image!', 1500)
+    assert key != EncodedImageCache.key(b'image', 1000)
+    assert key != EncodedImageCache.key(b'image', 1500, EncoderSettings(quality=90))
+
+
+def test_memory_tier_is_lru_by_size():
+    cache = EncodedImageCache(max_bytes=10)
+    assert cache.get('a') is None
+    cache.put('a', 'aaaa')
+    cache.put('b', 'bbbb')
+    assert cache.get('a') == 'aaaa'
+    cache.put('c', 'cccc')  # evicts b, a was used more recently
+    assert cache.get('b') is None
+    cache.put('d', 'd' * 11)  # larger than the whole cache
+    assert cache.get('d') is None
+    assert cache.stats() == {
+        'hits': 1,
+        'disk_hits': 0,
+        'misses': 3,
+        'evictions': 1,
+        'size_bytes': 8,
+        'entries': 2,
+    }
+    cache.clear()
+    assert cache.get('a') is None
+    assert cache.size_bytes == 0
+
+
+def test_disk_tier(tmp_path):
+    cache = EncodedImageCache(max_bytes=4, directory=tmp_path)
+    cache.put('aa', 'aaaa')
+    cache.put('bb', 'bbbb')
+    restarted = EncodedImageCache(directory=tmp_path)
+    assert restarted.get('aa') == 'aaaa'
+    assert restarted.get('aa') == 'aaaa'
+    assert (restarted.disk_hits, restarted.hits) == (1, 1)
+    assert cache.get('aa') == 'aaaa'
+    assert cache.disk_hits == 1
+    restarted.clear()
+    assert cache.get('bb') is None
+
+
+def test_disk_tier_is_trimmed(tmp_path):
+    cache = EncodedImageCache(directory=tmp_path, max_disk_bytes=8)
+    for mtime, key in enumerate(('aa', 'bb', 'cc'), start=1):
+        cache.put(key, key * 2)
+        os.utime(cache._path(key), (mtime, mtime))  # timestamps are too coarse to order quick writes
+    assert sorted(path.stem for path in tmp_path.glob('*/*.b64')) == ['bb', 'cc']
+    assert cache.disk_size_bytes == 8
+
+
+def test_disk_tier_is_only_scanned_over_budget(tmp_path, monkeypatch):
+    EncodedImageCache(directory=tmp_path).put('aa', 'aaaa')
+    cache = EncodedImageCache(directory=tmp_path, max_disk_bytes=12)
+    assert cache.disk_size_bytes == 4  # existing files are counted once on start
+    scans = []
+    monkeypatch.setattr(cache, '_trim_disk', lambda: scans.append(cache.disk_size_bytes))
+    cache.put('aa', 'aaaaaa')  # replaced files are not counted twice
+    cache.put('bb', 'bbbbbb')
+    assert scans == []
+    cache.put('cc', 'cc')
+    assert scans == [14]
+
+
+def test_api_uses_cache(api_key):
+    cache = EncodedImageCache()
+    api = test_core.TestApi(api_key=api_key, image_cache=cache)
+    image = IMAGE_DIR / 'aloe-vera.jpg'
+    for _ in range(2):
+        assert api._encode_image(image, 500) == encode_image(image.read_bytes(), 500)
+    assert (cache.hits, cache.misses) == (1, 1)
+    reports = []
+    api._encode_image(image, 500, EncoderSettings(on_encoded=reports.append))
+    assert reports == []  # served from the cache
+    assert base64.b64decode(api._encode_image(image, None)) == image.read_bytes()
+    assert cache.misses == 2
@@ -0,0 +1,151 @@
+import base64
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from PIL import Image, PngImagePlugin
+
+from kindwise.image_encoding import (
+    EXIF_ORIENTATION,
+    EncoderSettings,
+    EncodingExecutor,
+    EncodingQueueFull,
+    EncodingReport,
+    ImageHeader,
+    base64_passthrough,
+    encode_image,
+    encode_image_with_report,
+    map_file,
+)
+from .conftest import IMAGE_DIR
+from . import test_core
+
+
+@pytest.fixture
+def image_bytes():
+    return (IMAGE_DIR / 'aloe-vera.jpg').read_bytes()
+
+
+def test_encode_image(image_bytes):
+    assert encode_image(image_bytes, None) == base64.b64encode(image_bytes).decode('ascii')
+    resized = Image.open(io.BytesIO(base64.b64decode(encode_image(image_bytes, 500))))
+    assert resized.size == (500, 500)
+    assert resized.format == 'JPEG'
+
+
+def test_compliant_image_is_sent_untouched(image_bytes):
+    assert encode_image(image_bytes, 1500) == base64.b64encode(image_bytes).decode('ascii')
+    png = (IMAGE_DIR / 'padli.png').read_bytes()
+    assert Image.open(io.BytesIO(base64.b64decode(encode_image(png, 1500)))).format == 'JPEG'
+
+
+def test_rotated_image_is_encoded_upright():
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = 6  # rotated 90 degrees clockwise
+    Image.new('RGB', (400, 300)).save(buffer, format='JPEG', exif=exif)
+    header = ImageHeader.from_image(Image.open(buffer))
+    assert header == ImageHeader(format='JPEG', mode='RGB', width=400, height=300, orientation=6)
+    encoded = Image.open(io.BytesIO(base64.b64decode(encode_image(buffer.getvalue(), 1500))))
+    assert encoded.size == (300, 400)
+
+
+def test_too_large_image_is_rejected_before_decode():
+    buffer = io.BytesIO()
+    Image.new('1', (6000, 5000)).save(buffer, format='PNG')
+    with patch.object(PngImagePlugin.PngImageFile, 'load', side_effect=AssertionError('decoded')):
+        with pytest.raises(ValueError):
+            encode_image(buffer.getvalue(), None)
+        with pytest.raises(ValueError):
+            encode_image(buffer.getvalue(), 6000)
+    assert Image.open(io.BytesIO(base64.b64decode(encode_image(buffer.getvalue(), 1500)))).size == (1500, 1250)
+
+
+def test_encoder_settings(image_bytes):
+    settings = EncoderSettings(quality=90, progressive=True, optimize=True, subsampling=0)
+    encoded, report = encode_image_with_report(image_bytes, 500, settings)
+    img = Image.open(io.BytesIO(base64.b64decode(encoded)))
+    assert img.info['progressive']
+    assert report == EncodingReport(1, 90, 500, 500, len(image_bytes), len(encoded))
+    encoded, report = encode_image_with_report(image_bytes, 1500)
+    assert report.passthrough
+
+
+def test_encoder_settings_reencode_compliant_images():
+    buffer = io.BytesIO()
+    Image.effect_noise((1200, 900), 64).convert('RGB').save(buffer, format='JPEG', quality=95)
+    data = buffer.getvalue()
+    encoded = base64.b64encode(data).decode('ascii')
+    for settings in (None, EncoderSettings(), EncoderSettings(max_payload_bytes=len(encoded), min_quality=50)):
+        assert encode_image_with_report(data, 1500, settings)[1].passthrough
+        assert base64_passthrough(encoded, 1500, settings) is not None
+    for settings in (EncoderSettings(quality=30), EncoderSettings(subsampling=2, progressive=True)):
+        reencoded, report = encode_image_with_report(data, 1500, settings)
+        assert (report.attempts, report.quality) == (1, settings.quality)
+        assert len(reencoded) < len(encoded)
+        assert base64_passthrough(encoded, 1500, settings) is None
+
+
+@pytest.mark.parametrize('budget', [100_000, 60_000, 20_000, 4_000])
+def test_payload_budget(image_bytes, budget):
+    encoded, report = encode_image_with_report(image_bytes, 1500, EncoderSettings(max_payload_bytes=budget))
+    assert len(encoded) == report.payload_bytes <= budget
+    assert report.attempts <= 8
+    assert EncoderSettings.min_quality <= report.quality < EncoderSettings.quality
+    if report.width < 1000:  # did not fit with min_quality in full size
+        assert report.quality == EncoderSettings.min_quality
+    with pytest.raises(ValueError):
+        encode_image(image_bytes, 1500, EncoderSettings(max_payload_bytes=100))
+
+
+def test_identify_reports_encoding(api_key, respx_mock):
+    reports = []
+    api = test_core.TestApi(api_key=api_key)
+    route = respx_mock.post(api.identification_url).respond(status_code=500)
+    settings = EncoderSettings(max_payload_bytes=20_000, on_encoded=reports.append)
+    with pytest.raises(ValueError):
+        api.identify([IMAGE_DIR / 'aloe-vera.jpg', IMAGE_DIR / 'bee.jpeg'], encoder_settings=settings)
+    assert sorted(report.passthrough for report in reports) == [False, True]
+    assert all(len(image) <= 20_000 for image in json.loads(route.calls.last.request.content)['images'])
+
+
+def test_queue_is_bounded():
+    executor = EncodingExecutor(max_workers=1, max_queued=1)
+    with executor.admit(), executor.admit():
+        assert executor.pending == 2
+        with pytest.raises(EncodingQueueFull):
+            with executor.admit():
+                pass
+    assert executor.pending == 0
+    assert executor.encoded == 2
+    assert executor.rejected == 1
+    with pytest.raises(ValueError):
+        EncodingExecutor(kind='fiber')
+
+
+@pytest.mark.parametrize('kind', ['thread', 'process'])
+def test_executor_encodes_same_image(api_key, image_bytes, kind):
+    executor = EncodingExecutor(kind=kind, max_workers=2)
+    api = test_core.TestApi(api_key=api_key, encoding_executor=executor)
+    try:
+        assert api._encode_image(image_bytes, 500) == encode_image(image_bytes, 500)
+    finally:
+        executor.shutdown()
+    assert executor.encoded == 1
+
+
+@pytest.mark.parametrize('kind', [None, 'process'])
+@pytest.mark.parametrize('name', ['aloe-vera.jpg', 'padli.png'])
+def test_memory_mapped_files(api_key, tmp_path, kind, name):
+    executor = None if kind is None else EncodingExecutor(kind=kind, max_workers=1)
+    api = test_core.TestApi(api_key=api_key, memory_map=True, encoding_executor=executor)
+    try:
+        for max_image_size in (None, 500):
+            expected = encode_image((IMAGE_DIR / name).read_bytes(), max_image_size)
+            assert api._encode_image(IMAGE_DIR / name, max_image_size) == expected
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    (tmp_path / 'empty').touch()
+    assert map_file(tmp_path / 'empty').getvalue() == b''
@@ -0,0 +1,45 @@
+import base64
+import io
+
+from PIL import Image
+
+from kindwise.image_encoding import EncoderSettings, encode_image
+from kindwise.image_input import ImageBase64, ImageBytes, ImagePath, ImageUrl
+from .conftest import IMAGE_DIR
+from . import test_core
+
+IMAGE_URL = 'https://images.test/aloe-vera.jpg'
+
+
+def test_typed_inputs(api_key, respx_mock):
+    path = IMAGE_DIR / 'aloe-vera.jpg'
+    data = path.read_bytes()
+    respx_mock.get(IMAGE_URL).respond(200, content=data)
+    api = test_core.TestApi(api_key=api_key)
+    expected = encode_image(data, 500)
+    for image in (ImagePath(path), ImagePath(str(path)), ImageBytes(data), ImageUrl(IMAGE_URL)):
+        assert api._encode_image(image, 500) == expected
+    assert api._encode_image(ImageBase64(base64.b64encode(data).decode('ascii')), 500) == expected
+
+
+def test_base64_is_sent_without_decoding(api_key):
+    encoded = base64.b64encode((IMAGE_DIR / 'aloe-vera.jpg').read_bytes()).decode('ascii')
+    reports = []
+    api = test_core.TestApi(api_key=api_key)
+    assert api._encode_image(ImageBase64(encoded), 1500, EncoderSettings(on_encoded=reports.append)) is encoded
+    assert api._encode_image(ImageBase64(encoded), None) is encoded
+    assert reports[0].passthrough and reports[0].payload_bytes == len(encoded)
+    resized = api._encode_image(ImageBase64(encoded), 1500, EncoderSettings(max_payload_bytes=50_000))
+    assert len(resized) <= 50_000
+    png = base64.b64encode((IMAGE_DIR / 'padli.png').read_bytes()).decode('ascii')
+    assert Image.open(io.BytesIO(base64.b64decode(api._encode_image(ImageBase64(png), 1500)))).format == 'JPEG'
+
+
+def test_guessed_inputs(api_key):
+    data = (IMAGE_DIR / 'aloe-vera.jpg').read_bytes()
+    encoded = base64.b64encode(data)
+    api = test_core.TestApi(api_key=api_key)
+    assert api._load_image_buffer(encoded).getvalue() == data
+    assert api._load_image_buffer(encoded.decode('ascii')).getvalue() == data
+    assert api._load_image_buffer(data).getvalue() == data
+    assert api._load_image_buffer(data[:-1]).getvalue() == data[:-1]
@@ -0,0 +1,55 @@
+import json
+
+from kindwise.interning import StringTable
+from kindwise.mock_transport import KindwiseMockTransport
+from kindwise.plant import PlantApi
+from .conftest import IMAGE_DIR
+
+
+def response(access_token: str) -> dict:
+    return json.loads(
+        json.dumps(
+            {
+                'access_token': access_token,
+                'model_version': 'plant_id:4.0.0',
+                'suggestions': [{'id': 'a1', 'name': 'Aloe vera', 'description': 'x' * 300}],
+            }
+        )
+    )
+
+
+def test_intern_tree_shares_equal_strings():
+    strings = StringTable(max_length=256)
+    first, second = strings.intern_tree(response('token-1')), strings.intern_tree(response('token-2'))
+    assert first['model_version'] is second['model_version']
+    assert first['suggestions'][0]['name'] is second['suggestions'][0]['name']
+    assert first['suggestions'][0]['description'] is not second['suggestions'][0]['description']  # too long
+    assert strings.intern('token-1') == 'token-1'
+    assert strings.stats() == {'hits': 3, 'misses': 4, 'strings': 4}  # tokens are skipped
+
+
+def test_table_is_bounded_and_clearable():
+    strings = StringTable(max_size=2)
+    for value in ('a', 'b', 'c'):
+        strings.intern(''.join([value, value]))
+    assert len(strings) == 2
+    assert strings.intern(''.join(['c', 'c'])) is not strings.intern(''.join(['c', 'c']))
+    strings.clear()
+    assert len(strings) == 0
+    assert strings.intern(''.join(['c', 'c'])) is strings.intern(''.join(['c', 'c']))
+
+
+def test_api_interns_identifications(api_key):
+    strings = StringTable()
+    api = PlantApi(api_key=api_key, transport=KindwiseMockTransport(similar_images=2), string_table=strings)
+    first, second = api.identify(IMAGE_DIR / 'aloe-vera.jpg'), api.identify(IMAGE_DIR / 'aloe-vera.jpg')
+    assert first.access_token != second.access_token
+    assert first.model_version is second.model_version
+    first_suggestion, second_suggestion = (
+        first.result.classification.suggestions[0],
+        second.result.classification.suggestions[0],
+    )
+    assert first_suggestion.name is second_suggestion.name
+    assert first_suggestion.similar_images[0].url is second_suggestion.similar_images[0].url
+    assert first.status is second.status
+    assert strings.stats()['hits'] > 0
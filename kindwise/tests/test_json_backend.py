@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from kindwise.json_backend import JSONBackend
+from kindwise.mock_transport import KindwiseMockTransport, identification_response
+from kindwise.request_body import JSONBody
+from .conftest import IMAGE_DIR
+from . import test_core
+
+BACKENDS = [
+    'json',
+    pytest.param('orjson', marks=pytest.mark.skipif(not JSONBackend.available('orjson'), reason='orjson missing')),
+    pytest.param('msgspec', marks=pytest.mark.skipif(not JSONBackend.available('msgspec'), reason='msgspec missing')),
+]
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_backend(name):
+    backend = JSONBackend(name)
+    response = identification_response()
+    encoded = backend.dumps(response)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == response
+    assert backend.loads(json.dumps(response).encode()) == response
+    payload = {'images': ['QUJD' * 50_000], 'similar_images': True, 'latitude': 49.2}
+    assert JSONBody(payload, json_backend=backend).getvalue() == backend.dumps(payload)
+
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_api_uses_backend(api_key, name):
+    api = test_core.TestApi(api_key=api_key, transport=KindwiseMockTransport(), json_backend=JSONBackend(name))
+    identification = api.identify(IMAGE_DIR / 'aloe-vera.jpg')
+    assert identification.access_token == 'mock-1'
+    assert api.usage_info(as_dict=True)['active']
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        JSONBackend('simplejson')
@@ -0,0 +1,65 @@
+import time
+
+import httpx
+import pytest
+
+from kindwise import CropHealthApi, InsectApi, PlantApi
+from kindwise.mock_transport import KindwiseMockTransport
+from kindwise.models import IdentificationStatus
+from .conftest import IMAGE_DIR
+
+
+@pytest.fixture
+def transport():
+    return KindwiseMockTransport(suggestions=3)
+
+
+@pytest.mark.parametrize('api_class', [PlantApi, InsectApi, CropHealthApi])
+def test_identification_round_trip(api_class, transport):
+    api = api_class(api_key='mock', transport=transport)
+    identification = api.identify(IMAGE_DIR / 'aloe-vera.jpg')
+    assert identification.status == IdentificationStatus.COMPLETED
+    assert identification.access_token == 'mock-1'
+    assert api.get_identification(identification.access_token).access_token == identification.access_token
+    assert api.feedback(identification, rating=5)
+    assert api.delete_identification(identification)
+    assert api.usage_info().active
+    assert transport.requests == 5
+
+
+def test_health_assessment(transport):
+    api = PlantApi(api_key='mock', transport=transport)
+    health_assessment = api.health_assessment(IMAGE_DIR / 'aloe-vera.jpg')
+    assert len(health_assessment.result.disease.suggestions) == 3
+    assert len(api.search('aloe', limit=2).entities) == 2
+    assert api.ask_question(health_assessment, 'Is it edible?').identification == health_assessment.access_token
+
+
+def test_image_url_is_downloaded_through_transport(transport):
+    api = PlantApi(api_key='mock', transport=transport)
+    api.identify('https://example.com/photo.jpg')
+    assert transport.requests == 2
+
+
+def test_client_factory():
+    clients = []
+
+    def client_factory():
+        clients.append(httpx.Client(transport=KindwiseMockTransport(), headers={'X-Sidecar': '1'}))
+        return clients[-1]
+
+    with PlantApi(api_key='mock', client_factory=client_factory) as api:
+        api.usage_info()
+        api.usage_info()
+    assert len(clients) == 1
+    assert clients[0].is_closed
+    with pytest.raises(ValueError):
+        PlantApi(api_key='mock', transport=KindwiseMockTransport(), client_factory=client_factory)
+
+
+def test_latency(transport):
+    transport.latency = lambda: 0.05
+    started = time.monotonic()
+    with httpx.Client(transport=transport) as client:
+        assert client.get('https://plant.id/api/v3/usage_info').is_success
+    assert time.monotonic() - started >= 0.05
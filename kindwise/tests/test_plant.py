@@ -1,11 +1,15 @@
 import base64
+import dataclasses
+import pickle
 import random
-from datetime import datetime
+from datetime import datetime, timezone
 
 import pytest
 
+from kindwise.model_parsing import parse_lazy
 from kindwise.models import (
     Input,
+    Message,
     Classification,
     Suggestion,
     SimilarImage,
@@ -811,6 +815,52 @@ def test_get_health_assessment(api, api_key, health_assessment_dict, health_asse
     )
 
 
+def test_lazy_parsing(
+    identification_dict,
+    identification,
+    raw_identification_dict,
+    raw_identification,
+    health_assessment_dict,
+    health_assessment,
+):
+    for data, expected in (
+        (identification_dict, identification),
+        (raw_identification_dict, raw_identification),
+        (health_assessment_dict, health_assessment),
+    ):
+        lazy = parse_lazy(type(expected), data)
+        assert isinstance(lazy, type(expected))
+        assert lazy == expected and expected == lazy
+        assert repr(lazy) == repr(type(expected).from_dict(data))
+        assert pickle.loads(pickle.dumps(lazy)) == expected
+    lazy = parse_lazy(PlantIdentification, identification_dict)
+    suggestion = lazy.result.classification.suggestions[0]
+    assert (suggestion.name, suggestion.probability) == ('Aloe vera', 0.9653021963116768)
+    assert isinstance(suggestion, Suggestion) and isinstance(suggestion.similar_images[0], SimilarImage)
+    assert isinstance(lazy.created, datetime) and lazy.status == IdentificationStatus.COMPLETED
+    replaced = dataclasses.replace(lazy, custom_id='x')
+    assert replaced.custom_id == 'x' and lazy.custom_id is None
+    assert replaced == dataclasses.replace(identification, custom_id='x')
+    assert type(lazy)(**{field.name: getattr(lazy, field.name) for field in dataclasses.fields(lazy)}) == lazy
+
+
+def test_datetime_parsing_keeps_timezones():
+    data = {'content': 'hi', 'type': 'question', 'created': '2023-12-18T16:35:50.781000Z'}
+    for parse in (Message.from_dict, lambda data: parse_lazy(Message, data)):
+        # messages stay naive as before, input datetimes keep the utc designator
+        assert parse(data).created == datetime(2023, 12, 18, 16, 35, 50, 781000)
+    data = {
+        'images': [],
+        'datetime': '2024-03-19T10:57:40.035562Z',
+        'latitude': None,
+        'longitude': None,
+        'similar_images': True,
+    }
+    expected = datetime(2024, 3, 19, 10, 57, 40, 35562, tzinfo=timezone.utc)
+    assert Input.from_dict(data).datetime == expected
+    assert parse_lazy(Input, data).datetime == expected
+
+
 def test_delete_health_assessment(api, api_key, health_assessment, requests_mock):
     requests_mock.delete(f'{api.identification_url}/{health_assessment.access_token}', json=True)
     response = api.delete_health_assessment(health_assessment.access_token)
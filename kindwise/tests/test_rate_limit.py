@@ -0,0 +1,125 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from kindwise.models import UsageInfo
+from kindwise.rate_limit import RateLimiter
+from .conftest import IMAGE_DIR
+from . import test_core
+
+
+def usage(day=None, week=None, month=None, total=None):
+    limits = {'day': day, 'week': week, 'month': month, 'total': total}
+    return UsageInfo.from_dict(
+        {
+            'active': True,
+            'credit_limits': limits,
+            'used': {'day': 0, 'week': 0, 'month': 0, 'total': 0},
+            'can_use_credits': {'value': True, 'reason': None},
+            'remaining': limits,
+        }
+    )
+
+
+def test_reserve():
+    limiter = RateLimiter(rate=10.0, capacity=2)
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    # bucket is empty, next reservations are spread by 1/rate
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+    assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+    assert limiter.tokens == pytest.approx(-2.0, abs=0.1)
+    assert limiter.consumed == 4
+
+
+def test_shared_between_threads():
+    limiter = RateLimiter(rate=100.0, capacity=1)
+    waits = []
+
+    def worker():
+        for _ in range(100):
+            waits.append(limiter.reserve())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter.consumed == 800
+    # every reservation gets its own slot, the last one waits for the whole schedule
+    assert max(waits) == pytest.approx(7.99, abs=0.1)
+    assert len({round(wait, 4) for wait in waits}) > 790
+
+
+def test_from_usage_info():
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    limiter = RateLimiter(rate=float('inf'))
+    limiter.update_from_usage_info(usage(day=432, total=1000), now=now)
+    # 432 credits over the remaining 12 hours
+    assert limiter.rate == pytest.approx(0.01)
+    assert limiter.budget == 432
+    assert limiter.tokens <= 1.0
+
+    limiter.update_from_usage_info(usage(day=0, month=100), now=now)
+    assert limiter.reserve() == pytest.approx(12 * 3600, abs=1)
+
+    unlimited = RateLimiter.from_usage_info(usage(total=50))
+    assert unlimited.rate == float('inf')
+    assert unlimited.reserve() == 0.0
+    assert unlimited.budget == 49
+
+
+def test_update_from_headers():
+    limiter = RateLimiter(rate=100.0)
+    limiter.update_from_headers({'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': '20'})
+    assert limiter.rate == 0.5
+    assert limiter.tokens == pytest.approx(10, abs=0.1)
+    limiter.update_from_headers({'Retry-After': '30'}, status_code=429)
+    assert limiter.reserve() == pytest.approx(30, abs=0.5)
+
+
+def test_update_from_epoch_reset_header():
+    limiter = RateLimiter(rate=100.0)
+    reset = time.time() + 60
+    limiter.update_from_headers({'X-RateLimit-Remaining': '30', 'X-RateLimit-Reset': str(reset)})
+    assert limiter.rate == pytest.approx(0.5, rel=0.01)
+    limiter.update_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)})
+    assert limiter.reserve() == pytest.approx(60, abs=1)
+
+
+def test_headers_do_not_speed_up_usage_info_pacing():
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    limiter = RateLimiter(rate=float('inf'))
+    limiter.update_from_usage_info(usage(day=432), now=now)
+    limiter.update_from_headers({'X-RateLimit-Remaining': '100', 'X-RateLimit-Reset': '10'})
+    assert limiter.rate == pytest.approx(0.01)
+    limiter.update_from_headers({'X-RateLimit-Remaining': '1', 'X-RateLimit-Reset': '1000'})
+    assert limiter.rate == pytest.approx(0.001)
+    # usage info refreshed later keeps the tighter header rate too
+    limiter.update_from_usage_info(usage(day=432), now=now)
+    assert limiter.rate == pytest.approx(0.001)
+
+
+def test_predicted_exhaustion():
+    limiter = RateLimiter(rate=1.0, budget=3600)
+    assert limiter.predicted_exhaustion() == pytest.approx(
+        datetime.now(timezone.utc) + timedelta(hours=1), abs=timedelta(seconds=5)
+    )
+    assert RateLimiter(rate=1.0).predicted_exhaustion() is None
+
+
+def test_api_paces_identifications(api_key, requests_mock, usage_info_dict):
+    limiter = RateLimiter(rate=float('inf'))
+    api = test_core.TestApi(api_key=api_key, rate_limiter=limiter)
+    requests_mock.get(api.usage_info_url, json=usage_info_dict)
+    api.usage_info()
+    assert limiter.budget == 98
+    requests_mock.post(api.identification_url, json={})
+    with patch('kindwise.core.SyncBackend.sleep') as sleep:
+        limiter.update(rate=1.0, tokens=0)
+        api.identify(IMAGE_DIR / 'bee.jpeg', as_dict=True)
+    assert sleep.call_count == 1
+    assert limiter.budget == 97
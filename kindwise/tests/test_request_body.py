@@ -0,0 +1,52 @@
+import base64
+
+import httpx
+import pytest
+
+from kindwise.json_backend import JSONBackend
+from kindwise.request_body import AsyncJSONBody, JSONBody
+from .conftest import IMAGE_DIR
+from . import test_core
+
+dumps = JSONBackend().dumps
+
+
+@pytest.fixture
+def payload():
+    image = base64.b64encode((IMAGE_DIR / 'aloe-vera.jpg').read_bytes()).decode('ascii')
+    return {
+        'images': [image, 'short', 'ü"\n' * 50_000],
+        'similar_images': True,
+        'latitude': 49.2,
+        'custom_id': None,
+        'suggestion_filter': {'classification': 'plant'},
+    }
+
+
+def test_body_is_serialized_in_chunks(payload):
+    body = JSONBody(payload, chunk_size=1024)
+    chunks = list(body)
+    assert b''.join(chunks) == dumps(payload)
+    assert body.content_length == len(dumps(payload))
+    assert max(len(chunk) for chunk in chunks[:-2]) <= 1024
+    assert list(body) == chunks  # sent again by retries
+
+
+@pytest.mark.anyio
+async def test_async_body(payload):
+    body = AsyncJSONBody(payload)
+    assert b''.join([chunk async for chunk in body]) == dumps(payload)
+    assert not hasattr(body, '__iter__')
+
+
+def test_request_is_streamed_with_content_length(api_key, payload, respx_mock):
+    api = test_core.TestApi(api_key=api_key)
+    request, encoding = api._build_request('POST', api.identification_url, JSONBody(payload), {}, 60.0)
+    with pytest.raises(httpx.RequestNotRead):  # not serialized up front
+        request.content
+    assert request.headers['Content-Length'] == str(len(dumps(payload)))
+    assert 'Transfer-Encoding' not in request.headers
+    route = respx_mock.post(api.identification_url).respond(status_code=500)
+    with pytest.raises(ValueError):
+        api.identify(IMAGE_DIR / 'aloe-vera.jpg')
+    assert route.calls.last.request.headers['Content-Type'] == 'application/json'
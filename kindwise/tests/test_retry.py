@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from kindwise.retry import RetryPolicy
+from .conftest import IMAGE_DIR
+from . import test_core
+
+
+def test_next_delay():
+    policy = RetryPolicy(max_attempts=3, backoff_factor=1.0, jitter=0.0)
+    assert policy.next_delay(1, 0.0, httpx.Response(503)) == 1.0
+    assert policy.next_delay(2, 0.0, httpx.Response(503)) == 2.0
+    assert policy.next_delay(3, 0.0, httpx.Response(503)) is None
+    assert policy.next_delay(1, 0.0, httpx.Response(400)) is None
+    assert policy.next_delay(1, 0.0, exception=httpx.ConnectError('refused')) == 1.0
+    assert policy.next_delay(1, 0.0, exception=KeyError('key')) is None
+    # total deadline
+    assert RetryPolicy(backoff_factor=1.0, jitter=0.0, deadline=5.0).next_delay(1, 4.5, httpx.Response(503)) is None
+
+
+def test_backoff_jitter_and_cap():
+    policy = RetryPolicy(max_attempts=10, backoff_factor=1.0, backoff_max=4.0, jitter=1.0)
+    for attempt in range(1, 10):
+        assert 0.0 <= policy.backoff(attempt) <= min(4.0, 2 ** (attempt - 1))
+    assert RetryPolicy(backoff_factor=1.0, backoff_max=4.0, jitter=0.0).backoff(8) == 4.0
+
+
+def test_retry_after():
+    policy = RetryPolicy(backoff_factor=1.0, jitter=0.0)
+    assert policy.next_delay(1, 0.0, httpx.Response(429, headers={'Retry-After': '7'})) == 7.0
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25.0 < policy.next_delay(1, 0.0, httpx.Response(503, headers={'Retry-After': date})) <= 30.0
+    assert policy.next_delay(1, 0.0, httpx.Response(503, headers={'Retry-After': 'soon'})) == 1.0
+    ignoring = RetryPolicy(backoff_factor=1.0, jitter=0.0, respect_retry_after=False)
+    assert ignoring.next_delay(1, 0.0, httpx.Response(429, headers={'Retry-After': '7'})) == 1.0
+
+
+def test_api_retries(api_key, respx_mock, usage_info_dict):
+    api = test_core.TestApi(api_key=api_key, retry=RetryPolicy(max_attempts=3, backoff_factor=0.0))
+    route = respx_mock.get(api.usage_info_url)
+    route.side_effect = [httpx.Response(503), httpx.ConnectError('refused'), httpx.Response(200, json=usage_info_dict)]
+    assert api.usage_info(as_dict=True) == usage_info_dict
+    assert route.call_count == 3
+
+    route.side_effect = [httpx.Response(503)] * 3
+    with pytest.raises(ValueError):
+        api.usage_info()
+    assert route.call_count == 6
+
+    route.side_effect = [httpx.Response(404)]
+    with pytest.raises(ValueError):
+        api.usage_info()
+    assert route.call_count == 7
+
+
+def test_api_retries_reuse_serialized_body(api_key, respx_mock):
+    api = test_core.TestApi(api_key=api_key, retry=RetryPolicy(max_attempts=2, backoff_factor=0.0))
+    route = respx_mock.post(api.identification_url)
+    route.side_effect = [httpx.Response(429, headers={'Retry-After': '0'}), httpx.Response(200, json={})]
+    with patch.object(api.client, 'build_request', wraps=api.client.build_request) as build_request:
+        api.identify(IMAGE_DIR / 'bee.jpeg', as_dict=True)
+    assert build_request.call_count == 1
+    first, second = route.calls
+    assert first.request.content == second.request.content